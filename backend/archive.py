@@ -0,0 +1,192 @@
+"""
+Export and import the whole MongoDB portfolio as one gzip-compressed NDJSON archive.
+
+    python archive.py export portfolio.ndjson.gz
+    python archive.py import portfolio.ndjson.gz
+
+Documents are written as MongoDB Extended JSON (so dates and ObjectIds
+survive the round trip), streamed straight from cursors and read back line
+by line, so memory use does not grow with the size of the archive.
+
+An import loads every collection into a staging collection with chunked
+insert_many calls, checks the counts against the archive trailer, and only
+then renames each staging collection over the live one. A failed or
+truncated import leaves the live data untouched, and the API keeps serving
+throughout. Collections missing from the archive are left as they are;
+writes to an imported collection made during the import are replaced.
+
+Archive layout, one JSON value per line:
+
+    {"format": "portfolio-archive", "version": 1, "exported_at": ..., "database": ...}
+    {"$collection": "projects"}
+    <one document per line>
+    {"$collection": "contacts"}
+    ...
+    {"$end": {"counts": {"projects": 12, "contacts": 40213, ...}}}
+"""
+import argparse
+import asyncio
+import gzip
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from bson import json_util
+from dotenv import load_dotenv
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+# Load environment variables
+load_dotenv(backend_dir / '.env')
+
+import logging
+
+from database import Database
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMAT = "portfolio-archive"
+ARCHIVE_VERSION = 1
+DEFAULT_CHUNK_SIZE = 1000
+GZIP_LEVEL = 6
+
+JSON_OPTIONS = json_util.RELAXED_JSON_OPTIONS
+
+
+class ArchiveError(Exception):
+    """The archive is not a complete portfolio archive"""
+
+
+def _line(value: Any) -> str:
+    return json_util.dumps(value, json_options=JSON_OPTIONS) + "\n"
+
+
+async def export_archive(path: Path, collections: Optional[List[str]] = None) -> Dict[str, int]:
+    """Stream every collection into a compressed archive, written atomically"""
+    db = Database()
+    tmp_path = path.with_name(path.name + ".tmp")
+    counts: Dict[str, int] = {}
+    start = time.perf_counter()
+    try:
+        names = collections or await db.archive_collections()
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=GZIP_LEVEL) as archive:
+            archive.write(_line({
+                "format": ARCHIVE_FORMAT,
+                "version": ARCHIVE_VERSION,
+                "exported_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "database": db.db_name,
+            }))
+            for collection in names:
+                archive.write(_line({"$collection": collection}))
+                count = 0
+                async for document in db.iter_documents(collection):
+                    archive.write(_line(document))
+                    count += 1
+                counts[collection] = count
+                logger.info(f"Exported {count} documents from {collection}")
+            archive.write(_line({"$end": {"counts": counts}}))
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        await db.close()
+
+    logger.info(
+        f"Exported {sum(counts.values())} documents in {len(counts)} collections to {path} "
+        f"({path.stat().st_size / 1e6:.1f} MB) in {time.perf_counter() - start:.1f}s"
+    )
+    return counts
+
+
+async def import_archive(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, int]:
+    """Load an archive into staging collections, verify it, then swap them in"""
+    db = Database()
+    counts: Dict[str, int] = {}
+    # Collection -> staging collection it is loaded into
+    staging: Dict[str, str] = {}
+    start = time.perf_counter()
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as archive:
+            header = json_util.loads(next(archive, "{}"))
+            if header.get("format") != ARCHIVE_FORMAT or header.get("version") != ARCHIVE_VERSION:
+                raise ArchiveError(f"{path} is not a version {ARCHIVE_VERSION} {ARCHIVE_FORMAT}")
+
+            collection = None
+            chunk: List[Dict[str, Any]] = []
+            trailer = None
+            for line in archive:
+                value = json_util.loads(line, json_options=JSON_OPTIONS)
+                if "$collection" in value or "$end" in value:
+                    if collection is not None:
+                        counts[collection] += await db.insert_documents(staging[collection], chunk)
+                        chunk = []
+                    if "$end" in value:
+                        trailer = value["$end"]
+                        break
+                    collection = value["$collection"]
+                    staging[collection] = await db.create_staging_collection(collection)
+                    counts[collection] = 0
+                    continue
+                if collection is None:
+                    raise ArchiveError("Document before the first collection marker")
+                chunk.append(value)
+                if len(chunk) >= chunk_size:
+                    counts[collection] += await db.insert_documents(staging[collection], chunk)
+                    chunk = []
+
+        if trailer is None:
+            raise ArchiveError(f"{path} is truncated: no end marker")
+        if trailer["counts"] != counts:
+            raise ArchiveError(f"Imported counts {counts} do not match the archive's {trailer['counts']}")
+
+        # Everything is loaded and verified; each rename swaps one collection atomically
+        for collection in list(staging):
+            await db.swap_staging_collection(collection)
+            del staging[collection]
+        logger.info(
+            f"Imported {sum(counts.values())} documents in {len(counts)} collections "
+            f"from {path} in {time.perf_counter() - start:.1f}s"
+        )
+        return counts
+    finally:
+        for collection in staging:
+            await db.drop_staging_collection(collection)
+        await db.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Export or import the portfolio database as an archive")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="Write every collection to an archive")
+    export_parser.add_argument("path", type=Path, help="Archive to write (.ndjson.gz)")
+    export_parser.add_argument(
+        "--collection",
+        action="append",
+        dest="collections",
+        help="Export only this collection (repeatable)"
+    )
+
+    import_parser = commands.add_parser("import", help="Replace the archived collections from an archive")
+    import_parser.add_argument("path", type=Path, help="Archive to read")
+    import_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Documents per insert_many call"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "export":
+        asyncio.run(export_archive(args.path, args.collections))
+    else:
+        asyncio.run(import_archive(args.path, args.chunk_size))
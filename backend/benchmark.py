@@ -0,0 +1,351 @@
+"""
+Benchmark suite for the API hot paths.
+
+Drives the FastAPI app in-process through an ASGI client, seeds synthetic
+data at several dataset sizes, records throughput and latency percentiles
+per route, and compares them with a stored JSON baseline.
+
+    python benchmark.py --sizes 10,1000 --save-baseline
+    python benchmark.py --sizes 10,1000 --threshold 0.25   # exits 1 on regression
+
+Set STORAGE_BACKEND=memory to benchmark without a running MongoDB.
+
+    python benchmark.py --serialization --sizes 100,1000
+
+compares the CPU cost of encoding a list response through per-record
+Pydantic models and response_model revalidation against the validate-once
+encoder path the read routes use.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+# Load environment variables
+load_dotenv(backend_dir / '.env')
+
+# Never benchmark against the real database or overwrite an in-memory snapshot
+os.environ['DB_NAME'] = os.environ.get('BENCH_DB_NAME', os.environ.get('DB_NAME', 'portfolio') + '_bench')
+os.environ.pop('MEMORY_SNAPSHOT_PATH', None)
+# Keep per-request logging out of the measurements
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+# Every benchmark request comes from one client; measure the write path, not the limiter
+os.environ.setdefault('CONTACT_RATE_LIMIT_BURST', '1000000000')
+
+import httpx
+import logging
+
+from data_seeder import PORTFOLIO_DATA
+from synthetic_data import SyntheticGenerator, COLLECTION_MODELS
+
+# Keep per-request logging out of the measurements
+logging.getLogger().setLevel(logging.WARNING)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logger = logging.getLogger("benchmark")
+logger.setLevel(logging.INFO)
+
+DEFAULT_BASELINE = backend_dir / "benchmarks" / "baseline.json"
+
+GET_ROUTES = [
+    "/api/profile",
+    "/api/education",
+    "/api/experience",
+    "/api/projects",
+    "/api/skills",
+    "/api/certifications",
+    "/api/awards",
+    "/api/patents",
+    "/api/portfolio",
+    "/api/contact/submissions",
+]
+
+PROJECT_BODY = {
+    "title": "Benchmark project",
+    "duration": "Jan 2024 – Jun 2024",
+    "technologies": ["Python", "FastAPI"],
+    "description": "Created by the benchmark suite",
+    "achievements": ["Measured latency"],
+    "category": "benchmark",
+}
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    make_request: Callable[[int], Any],
+    requests: int,
+    concurrency: int
+) -> Dict[str, float]:
+    """Issue requests with bounded concurrency and summarize their latencies"""
+    latencies: List[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal errors, next_index
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            start = time.perf_counter()
+            response = await make_request(index)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": requests / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def seed(db, size: int, seed_value: int) -> List[str]:
+    """Replace the benchmark data with size synthetic records per collection"""
+    await db.drop_database()
+    await db.update_personal_info(dict(PORTFOLIO_DATA["personal"]))
+    await db.update_skills(dict(PORTFOLIO_DATA["skills"]))
+
+    generator = SyntheticGenerator(seed_value)
+    project_ids = []
+    for collection in COLLECTION_MODELS:
+        for batch in generator.batches(collection, size, 1000):
+            await db.bulk_upsert(collection, batch)
+            if collection == "projects":
+                project_ids.extend(record["id"] for record in batch)
+    return project_ids
+
+
+async def benchmark_size(
+    app,
+    size: int,
+    requests: int,
+    concurrency: int,
+    seed_value: int
+) -> Dict[str, Dict[str, float]]:
+    """Benchmark every scenario against a dataset of the given size"""
+    import routes
+
+    results: Dict[str, Dict[str, float]] = {}
+    project_ids = await seed(routes.get_db(), size, seed_value)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in GET_ROUTES:
+            results[f"GET {path}"] = await run_scenario(
+                client, lambda i, path=path: client.get(path), requests, concurrency
+            )
+
+        # Unique per run and size, so no submission is rejected as a duplicate
+        nonce = f"{uuid.uuid4().hex[:8]}-{size}"
+        results["POST /api/contact"] = await run_scenario(
+            client,
+            lambda i: client.post("/api/contact", json={
+                "name": f"Bench {i}",
+                "email": f"bench{i}@example.com",
+                "subject": "Benchmark",
+                "message": f"Benchmark message {i} ({nonce})",
+            }),
+            requests, concurrency
+        )
+        results["POST /api/projects"] = await run_scenario(
+            client, lambda i: client.post("/api/projects", json=PROJECT_BODY), requests, concurrency
+        )
+        results["PUT /api/projects/{id}"] = await run_scenario(
+            client,
+            lambda i: client.put(
+                f"/api/projects/{project_ids[i % len(project_ids)]}",
+                json={"description": f"Updated by benchmark run {i}"}
+            ),
+            requests, concurrency
+        )
+        # Each delete needs its own existing record
+        deletes = min(requests, len(project_ids))
+        if deletes:
+            results["DELETE /api/projects/{id}"] = await run_scenario(
+                client,
+                lambda i: client.delete(f"/api/projects/{project_ids[i]}"),
+                deletes, min(concurrency, deletes)
+            )
+    return results
+
+
+async def run_benchmarks(sizes: List[int], requests: int, concurrency: int, seed_value: int) -> Dict[str, Any]:
+    """Start the app, benchmark each dataset size and drop the benchmark database"""
+    import routes
+    from server import app
+
+    results: Dict[str, Any] = {
+        "meta": {
+            "requests": requests,
+            "concurrency": concurrency,
+            "python": sys.version.split()[0],
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "sizes": {},
+    }
+    async with app.router.lifespan_context(app):
+        try:
+            for size in sizes:
+                logger.info(f"Benchmarking dataset size {size}...")
+                results["sizes"][str(size)] = await benchmark_size(
+                    app, size, requests, concurrency, seed_value
+                )
+        finally:
+            db = routes.get_db()
+            await db.drop_database()
+    return results
+
+
+def serialization_benchmark(sizes: List[int], iterations: int, seed_value: int) -> Dict[str, Any]:
+    """Measure CPU time per response for the model-based and fast JSON encode paths"""
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    from models import ProjectRecord
+    from responses import model_encoder
+
+    adapter = TypeAdapter(List[ProjectRecord])
+    encoder = model_encoder(List[ProjectRecord])
+
+    def model_path(records):
+        # What the routes used to do: build models, then FastAPI revalidates
+        # them against response_model and encodes with the stdlib encoder
+        models = [ProjectRecord(**record) for record in records]
+        validated = adapter.validate_python(models)
+        return json.dumps(jsonable_encoder(validated)).encode()
+
+    def fast_path(records):
+        return encoder(records)
+
+    results = {}
+    for size in sizes:
+        records = list(SyntheticGenerator(seed_value).records("projects", size))
+        timings = {}
+        for name, encode in (("models", model_path), ("fast", fast_path)):
+            start = time.process_time()
+            for _ in range(iterations):
+                encode(records)
+            timings[f"{name}_cpu_ms"] = (time.process_time() - start) * 1000 / iterations
+        timings["cpu_saved_ms"] = timings["models_cpu_ms"] - timings["fast_cpu_ms"]
+        timings["speedup"] = timings["models_cpu_ms"] / timings["fast_cpu_ms"] if timings["fast_cpu_ms"] else 0.0
+        results[str(size)] = timings
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """List scenarios whose p95 latency or throughput regressed past the threshold"""
+    regressions = []
+    for size, scenarios in results["sizes"].items():
+        for name, current in scenarios.items():
+            previous = baseline.get("sizes", {}).get(size, {}).get(name)
+            if not previous:
+                continue
+            if current["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+                regressions.append(
+                    f"[{size}] {name}: p95 {current['p95_ms']:.2f} ms "
+                    f"vs baseline {previous['p95_ms']:.2f} ms"
+                )
+            if current["throughput_rps"] < previous["throughput_rps"] * (1 - threshold):
+                regressions.append(
+                    f"[{size}] {name}: {current['throughput_rps']:.0f} req/s "
+                    f"vs baseline {previous['throughput_rps']:.0f} req/s"
+                )
+    return regressions
+
+
+def print_results(results: Dict[str, Any]):
+    for size, scenarios in results["sizes"].items():
+        print(f"\nDataset size {size}")
+        print(f"{'scenario':<34} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for name, stats in scenarios.items():
+            print(
+                f"{name:<34} {stats['throughput_rps']:>9.0f} {stats['p50_ms']:>8.2f} "
+                f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['errors']:>7}"
+            )
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark the portfolio API")
+    parser.add_argument("--sizes", default="10,1000", help="Comma-separated records per collection")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent in-flight requests")
+    parser.add_argument("--seed", type=int, default=42, help="Synthetic data seed")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--output", type=Path, help="Also write this run's results to a JSON file")
+    parser.add_argument(
+        "--serialization",
+        action="store_true",
+        help="Only compare CPU per response of the model and fast JSON encode paths"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=float(os.environ.get('BENCH_REGRESSION_THRESHOLD', '0.2')),
+        help="Allowed relative regression before failing (0.2 = 20%%)"
+    )
+    args = parser.parse_args(argv)
+    args.sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.serialization:
+        results = serialization_benchmark(args.sizes, args.requests, args.seed)
+        print(f"{'records':>8} {'models ms':>10} {'fast ms':>9} {'saved ms':>9} {'speedup':>8}")
+        for size, stats in results.items():
+            print(
+                f"{size:>8} {stats['models_cpu_ms']:>10.3f} {stats['fast_cpu_ms']:>9.3f} "
+                f"{stats['cpu_saved_ms']:>9.3f} {stats['speedup']:>7.1f}x"
+            )
+        return 0
+
+    results = asyncio.run(run_benchmarks(args.sizes, args.requests, args.concurrency, args.seed))
+    print_results(results)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2))
+        logger.info(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        logger.warning(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+    for regression in regressions:
+        logger.error(f"Regression: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+In-process read-through cache sitting between the API routes and the database
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+CACHE_TTL_SECONDS = float(os.environ.get('CACHE_TTL_SECONDS', '300'))
+CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', '32'))
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire after a fixed TTL"""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value or _MISSING when absent or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PortfolioCache:
+    """Per-collection read-through caches with explicit invalidation"""
+
+    def __init__(self, ttl: float = CACHE_TTL_SECONDS, max_entries: int = CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._caches: Dict[str, TTLCache] = {}
+        # Bumped on invalidation so loads that started before a write are not stored
+        self._generations: Dict[str, int] = {}
+        self._inflight: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _cache_for(self, collection: str) -> TTLCache:
+        cache = self._caches.get(collection)
+        if cache is None:
+            cache = self._caches[collection] = TTLCache(self.ttl, self.max_entries)
+        return cache
+
+    async def get_or_load(
+        self,
+        collection: str,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached value for key, calling loader on a miss.
+
+        Concurrent misses for the same key share a single load. Empty results
+        are not stored because the database layer also returns them on errors.
+        """
+        cache = self._cache_for(collection)
+        value = cache.get(key)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        inflight_key = (collection, key)
+        future = self._inflight.get(inflight_key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        generation = self._generations.get(collection, 0)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[inflight_key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if value and self._generations.get(collection, 0) == generation:
+                cache.set(key, value)
+            return value
+        finally:
+            self._inflight.pop(inflight_key, None)
+
+    def invalidate(self, collection: Optional[str] = None) -> None:
+        """Drop cached entries for one collection, or for all collections"""
+        collections = [collection] if collection else list(self._caches)
+        for name in collections:
+            self._generations[name] = self._generations.get(name, 0) + 1
+            cache = self._caches.get(name)
+            if cache is not None:
+                cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and per-collection entry counts"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": {name: len(cache) for name, cache in self._caches.items()},
+        }
@@ -0,0 +1,200 @@
+"""
+Keeps caches, indexes and ETags of every worker in step with writes made by other workers
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# "auto" watches a change stream when the deployment supports one and polls otherwise;
+# "change_stream" and "poll" force one mechanism and "off" disables syncing
+CHANGE_SYNC_MODE = os.environ.get('CHANGE_SYNC_MODE', 'auto').lower()
+CHANGE_SYNC_POLL_INTERVAL = float(os.environ.get('CHANGE_SYNC_POLL_INTERVAL', '2'))
+
+# Collections whose writes other workers need to hear about
+SYNCED_COLLECTIONS = [
+    "profiles", "skills", "education", "experience", "projects",
+    "certifications", "awards", "patents", "contacts",
+]
+
+# Resume token no longer in the oplog
+CHANGE_STREAM_HISTORY_LOST = 286
+# $changeStream on a server without an oplog (a standalone)
+CHANGE_STREAM_UNSUPPORTED = 40573
+
+# Events that carry the written document
+DOCUMENT_OPERATIONS = {"insert", "update", "replace", "delete"}
+
+# Delay before reopening a failed change stream, doubled up to the maximum
+RETRY_DELAY = 0.5
+MAX_RETRY_DELAY = 30.0
+
+
+class ChangeSync:
+    """Applies other workers' writes to the local storage backend.
+
+    Each remote write goes through db.apply_remote_change, which bumps the
+    local revision and runs the same change listeners as a local write, so
+    the read cache, search index, facets and ETags all follow. Change stream
+    events name the written record, so indexes refresh only that record;
+    drops, renames and events without a document reload the collection.
+    Events for this worker's own writes are skipped (see Database.is_own_write).
+
+    Change streams need a replica set; without one the worker polls the
+    revision document every write bumps (see Database.poll_shared_revisions).
+    Only polling needs that document, so workers on a change stream stop
+    bumping it.
+    """
+
+    def __init__(
+        self,
+        db,
+        mode: str = CHANGE_SYNC_MODE,
+        poll_interval: float = CHANGE_SYNC_POLL_INTERVAL,
+        collections: List[str] = SYNCED_COLLECTIONS
+    ):
+        self.db = db
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.collections = collections
+        self.active_mode: Optional[str] = None
+        self.remote_changes = 0
+        self.errors = 0
+        self._resume_token: Optional[Dict[str, Any]] = None
+        # After an invalidate the stream has to start after its token rather than resume
+        self._start_after = False
+        self._pre_images = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background sync task"""
+        if self.mode == "off":
+            logger.info("Cross-worker change sync disabled")
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.active_mode or "off",
+            "remote_changes": self.remote_changes,
+            "errors": self.errors,
+        }
+
+    def _apply(self, collection: str, ids: Optional[List[str]] = None):
+        self.remote_changes += 1
+        self.db.apply_remote_change(collection, ids)
+
+    def _handle(self, change: Dict[str, Any]) -> bool:
+        """Apply one change stream event; returns False when it ended the stream"""
+        operation = change.get("operationType")
+        if operation in ("invalidate", "dropDatabase"):
+            for collection in self.collections:
+                self._apply(collection)
+            if operation == "invalidate":
+                self._start_after = True
+                return False
+            return True
+
+        # Renames name the source in "ns" and the target in "to"
+        collections = [
+            namespace["coll"] for namespace in (change.get("ns"), change.get("to"))
+            if namespace and namespace.get("coll") in self.collections
+        ]
+        document = change.get("fullDocument") or change.get("fullDocumentBeforeChange") or {}
+        record_id = document.get("id")
+        for collection in collections:
+            if operation in DOCUMENT_OPERATIONS and record_id is not None:
+                if not self.db.is_own_write(collection, record_id):
+                    self._apply(collection, [record_id])
+            else:
+                # Drops and renames, and deletes without a pre-image
+                self._apply(collection)
+        return True
+
+    async def _run(self):
+        # Record the current shared revisions so polling only reports later writes
+        await self._poll_once()
+        if self.mode in ("auto", "change_stream"):
+            self._pre_images = await self.db.enable_change_pre_images(self.collections)
+            await self._watch()
+        await self._poll()
+
+    async def _watch(self):
+        """Follow the change stream, reopening it from the last token after errors.
+
+        Returns when change streams are unsupported and polling may take over.
+        """
+        delay = RETRY_DELAY
+        while True:
+            try:
+                async with self.db.watch_changes(
+                    self.collections, self._resume_token, self._start_after, self._pre_images
+                ) as stream:
+                    self._start_after = False
+                    if self.active_mode != "change_stream":
+                        self.active_mode = "change_stream"
+                        self.db.track_shared_revisions = False
+                        self.db.track_own_writes = True
+                        logger.info("Following the change stream for cross-worker invalidation")
+                    delay = RETRY_DELAY
+                    async for change in stream:
+                        self._resume_token = stream.resume_token
+                        if not self._handle(change):
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Only a standalone server without an oplog falls back to polling;
+                # other errors are retried, since workers on a stream stop bumping
+                # the revisions a polling worker relies on
+                if (
+                    self.mode == "auto" and self.active_mode is None
+                    and isinstance(e, OperationFailure) and e.code == CHANGE_STREAM_UNSUPPORTED
+                ):
+                    logger.info(f"Change streams unavailable ({e}); polling shared revisions instead")
+                    return
+                self.errors += 1
+                if isinstance(e, OperationFailure) and e.code == CHANGE_STREAM_HISTORY_LOST:
+                    # The resume token fell off the oplog; events were lost, so refresh everything
+                    self._resume_token = None
+                    self._start_after = False
+                    for collection in self.collections:
+                        self._apply(collection)
+                logger.error(f"Change stream failed, reopening in {delay}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+
+    async def _poll(self):
+        self.active_mode = "poll"
+        self.db.track_shared_revisions = True
+        self.db.track_own_writes = False
+        logger.info(f"Polling shared revisions every {self.poll_interval}s for cross-worker invalidation")
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            await self._poll_once()
+
+    async def _poll_once(self):
+        try:
+            for collection in await self.db.poll_shared_revisions():
+                self.remote_changes += 1
+                logger.debug(f"Applied remote change to {collection}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Error polling shared revisions: {e}")
@@ -0,0 +1,198 @@
+"""
+gzip/brotli response compression negotiated on Accept-Encoding
+"""
+import gzip
+import os
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from cache import CACHE_TTL_SECONDS, TTLCache, _MISSING
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+# Responses smaller than this are sent uncompressed
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '500'))
+COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', '6'))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '5'))
+# Compressed bodies kept per (path, ETag, encoding)
+COMPRESSION_CACHE_ENTRIES = int(os.environ.get('COMPRESSION_CACHE_ENTRIES', '64'))
+
+
+def supported_encodings() -> List[str]:
+    """Content codings this install can produce, most preferred first"""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported coding from an Accept-Encoding header, or None"""
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in supported_encodings():
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a complete body with the given content coding"""
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class _StreamCompressor:
+    """Incremental compressor for streamed responses, flushed after every chunk"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """Compress responses with the best coding the client accepts.
+
+    Responses that carry an ETag identify a content version, so their
+    compressed bytes are cached and reused until the ETag changes. Streamed
+    responses are compressed incrementally, and the ETag of a compressed
+    response is made weak, as it no longer matches the identity bytes.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = TTLCache(CACHE_TTL_SECONDS, COMPRESSION_CACHE_ENTRIES)
+        self.hits = 0
+        self.misses = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressedResponder(self, scope, encoding, send).run(receive)
+
+    def compressed_body(self, key: Optional[Tuple[str, str, str]], body: bytes, encoding: str) -> bytes:
+        """Compress a body, reusing the cached bytes of the same content version"""
+        if key is None:
+            return compress(body, encoding)
+        cached = self.cache.get(key)
+        if cached is not _MISSING:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        compressed = compress(body, encoding)
+        self.cache.set(key, compressed)
+        return compressed
+
+
+class _CompressedResponder:
+    """Per-request send wrapper that buffers, compresses or streams the body"""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, encoding: str, send: Send):
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self.send = send
+        self.app = middleware.app
+        self.start: Optional[Message] = None
+        self.mode: Optional[str] = None
+        self.chunks: List[bytes] = []
+        self.stream: Optional[_StreamCompressor] = None
+
+    async def run(self, receive: Receive):
+        await self.app(self.scope, receive, self.send_wrapper)
+
+    def _choose_mode(self, headers: MutableHeaders) -> str:
+        if self.start["status"] != 200 or "content-encoding" in headers:
+            return "identity"
+        content_type = headers.get("content-type", "")
+        if not (content_type.startswith("application/") or content_type.startswith("text/")):
+            return "identity"
+        if "content-length" not in headers:
+            return "stream"
+        if int(headers["content-length"]) < self.middleware.minimum_size:
+            return "identity"
+        return "buffer"
+
+    def _compressed_headers(self) -> MutableHeaders:
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+        return headers
+
+    async def send_wrapper(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            self.mode = self._choose_mode(MutableHeaders(raw=message["headers"]))
+            if self.mode == "identity":
+                await self.send(message)
+            elif self.mode == "stream":
+                self.stream = _StreamCompressor(self.encoding)
+                self._compressed_headers()
+                await self.send(self.start)
+            return
+
+        if message["type"] != "http.response.body" or self.mode == "identity":
+            await self.send(message)
+            return
+
+        more_body = message.get("more_body", False)
+        if self.mode == "stream":
+            data = self.stream.chunk(message.get("body", b""))
+            if not more_body:
+                data += self.stream.finish()
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        self.chunks.append(message.get("body", b""))
+        if more_body:
+            return
+        body = b"".join(self.chunks)
+        headers = MutableHeaders(raw=self.start["headers"])
+        etag = headers.get("etag")
+        key = (self.scope["path"], etag, self.encoding) if etag else None
+        compressed = self.middleware.compressed_body(key, body, self.encoding)
+        headers = self._compressed_headers()
+        headers["Content-Length"] = str(len(compressed))
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": compressed})
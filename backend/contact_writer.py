@@ -0,0 +1,128 @@
+"""
+Write-behind buffer that batches contact form submissions into insert_many calls
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+CONTACT_BATCH_SIZE = int(os.environ.get('CONTACT_BATCH_SIZE', '100'))
+CONTACT_FLUSH_INTERVAL = float(os.environ.get('CONTACT_FLUSH_INTERVAL', '0.5'))
+# Submissions buffered in memory before new ones are rejected with a 503
+CONTACT_QUEUE_SIZE = int(os.environ.get('CONTACT_QUEUE_SIZE', '10000'))
+CONTACT_DRAIN_TIMEOUT = float(os.environ.get('CONTACT_DRAIN_TIMEOUT', '30'))
+
+# Delay before retrying a failed batch, doubled up to the maximum
+RETRY_DELAY = 0.5
+MAX_RETRY_DELAY = 10.0
+
+
+class ContactWriter:
+    """Buffers accepted submissions in a bounded queue and writes them in batches.
+
+    A batch is flushed when it reaches batch_size records or flush_interval
+    seconds after its first record. Failed batches are retried until they are
+    written, so a full queue (and a 503 for new submissions) is the only sign
+    of a database outage to clients.
+    """
+
+    def __init__(
+        self,
+        db: StorageBackend,
+        batch_size: int = CONTACT_BATCH_SIZE,
+        flush_interval: float = CONTACT_FLUSH_INTERVAL,
+        max_queue: int = CONTACT_QUEUE_SIZE
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_queue)
+        self._batch: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.rejected = 0
+        self.failed_flushes = 0
+
+    def start(self):
+        """Start the background flush task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def submit(self, record: Dict[str, Any]):
+        """Queue a submission, raising asyncio.QueueFull when the buffer is full"""
+        try:
+            self.queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self.queue.qsize(),
+            "in_flight": len(self._batch),
+            "capacity": self.queue.maxsize,
+            "written": self.written,
+            "rejected": self.rejected,
+            "failed_flushes": self.failed_flushes,
+        }
+
+    async def stop(self, timeout: float = CONTACT_DRAIN_TIMEOUT):
+        """Write every queued submission, waiting at most timeout seconds"""
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        lost = len(self._batch) + self.queue.qsize()
+        if lost:
+            logger.error(f"Contact writer stopped with {lost} unwritten submissions")
+        else:
+            logger.info(f"Contact writer drained; {self.written} submissions written")
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = [await self.queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                try:
+                    self._batch.append(self.queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._flush(self._batch)
+            for _ in self._batch:
+                self.queue.task_done()
+            self._batch = []
+
+    async def _flush(self, batch: List[Dict[str, Any]]):
+        delay = RETRY_DELAY
+        while True:
+            try:
+                self.written += await self.db.create_contact_submissions(batch)
+                return
+            except Exception as e:
+                self.failed_flushes += 1
+                logger.error(f"Error writing {len(batch)} contact submissions, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
@@ -1,9 +1,11 @@
 """
 Data seeder to populate the database with portfolio data
 """
+import argparse
 import asyncio
 import os
 import sys
+import time
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -14,7 +16,7 @@ sys.path.append(str(backend_dir))
 # Load environment variables
 load_dotenv(backend_dir / '.env')
 
-from database import Database
+from storage import create_database
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -195,7 +197,7 @@ PORTFOLIO_DATA = {
 
 async def seed_database():
     """Seed the database with portfolio data"""
-    db = Database()
+    db = create_database()
     
     try:
         # Seed personal information
@@ -243,5 +245,88 @@ async def seed_database():
     finally:
         await db.close()
 
+# Maps PORTFOLIO_DATA list sections to their collections for bulk seeding
+RECORD_COLLECTIONS = {
+    "education": "education",
+    "patents": "patents",
+    "experience": "experience",
+    "projects": "projects",
+    "certifications": "certifications",
+    "awards": "awards",
+}
+
+async def _timed(name, coroutine):
+    """Await a seeding step and return its name, result and duration"""
+    start = time.perf_counter()
+    result = await coroutine
+    return name, result, time.perf_counter() - start
+
+class SeedError(Exception):
+    """Some sections could not be seeded"""
+
+async def seed_database_bulk(data=None, chunk_size=1000):
+    """Seed every collection concurrently with idempotent bulk upserts keyed on id.
+
+    Raises SeedError when any section failed to write, after the others finished.
+    """
+    data = data or PORTFOLIO_DATA
+    db = create_database()
+    
+    try:
+        steps = [
+            _timed("profiles", db.update_personal_info(dict(data["personal"]))),
+            _timed("skills", db.update_skills(dict(data["skills"]))),
+        ]
+        for section, collection in RECORD_COLLECTIONS.items():
+            if data.get(section):
+                steps.append(_timed(
+                    collection,
+                    db.bulk_upsert(collection, data[section], chunk_size)
+                ))
+        
+        start = time.perf_counter()
+        results = await asyncio.gather(*steps)
+        
+        for name, result, duration in results:
+            logger.info(f"Seeded {name} in {duration * 1000:.1f} ms: {result}")
+        # Singletons report success as a bool, record collections count failed records
+        failed = [
+            name for name, result, _ in results
+            if result is False or (isinstance(result, dict) and result["failed"])
+        ]
+        if failed:
+            raise SeedError(f"Failed to seed {', '.join(failed)}")
+        logger.info(f"Bulk seeding completed in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return {name: {"result": result, "seconds": duration} for name, result, duration in results}
+        
+    except Exception as e:
+        logger.error(f"Error bulk seeding database: {e}")
+        raise
+    finally:
+        await db.close()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Seed the portfolio database")
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Upsert all collections concurrently; safe to rerun"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help="Records per bulk_write call in bulk mode"
+    )
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    asyncio.run(seed_database())
\ No newline at end of file
+    args = parse_args()
+    if args.bulk:
+        try:
+            asyncio.run(seed_database_bulk(chunk_size=args.chunk_size))
+        except Exception:
+            # Already logged
+            sys.exit(1)
+    else:
+        asyncio.run(seed_database())
\ No newline at end of file
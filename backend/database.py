@@ -1,27 +1,629 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import List, Optional, Dict, Any
+from pymongo import monitoring, ReturnDocument, DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from typing import List, Optional, Dict, Any, Tuple, AsyncIterator, Set
+import asyncio
 import os
+import uuid
 import logging
-from datetime import datetime
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from storage import StorageBackend, PAGE_SORT, MAX_LIST_RECORDS, SINGLETON_COLLECTIONS, APPLIED_STATUSES
+from indexes import ensure_indexes, INDEX_SPECS
 
 logger = logging.getLogger(__name__)
 
-class Database:
-    def __init__(self):
+# Connection pool settings, read from the environment
+POOL_SETTINGS = {
+    "maxPoolSize": ("MONGO_MAX_POOL_SIZE", 100),
+    "minPoolSize": ("MONGO_MIN_POOL_SIZE", 0),
+    "maxIdleTimeMS": ("MONGO_MAX_IDLE_TIME_MS", None),
+    "waitQueueTimeoutMS": ("MONGO_WAIT_QUEUE_TIMEOUT_MS", None),
+    "serverSelectionTimeoutMS": ("MONGO_SERVER_SELECTION_TIMEOUT_MS", 30000),
+}
+
+# Bump a shared revision document on every write so other workers can poll for changes;
+# ChangeSync stops bumping it once a change stream delivers every write
+TRACK_SHARED_REVISIONS = os.environ.get('CHANGE_SYNC_MODE', 'auto').lower() != 'off'
+REVISIONS_COLLECTION = "revisions"
+REVISIONS_DOCUMENT_ID = "portfolio"
+# How long a local write waits for its own change stream event before it is forgotten
+OWN_WRITE_TTL = 5.0
+# Error code collMod returns for collections that do not exist yet
+NAMESPACE_NOT_FOUND = 26
+
+# Per-process state that is never archived or imported
+UNARCHIVED_COLLECTIONS = {"rate_limits", "contact_hashes", REVISIONS_COLLECTION}
+# Suffix of the collections an import loads before swapping them in
+STAGING_SUFFIX = "__import"
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Tracks connection pool usage so saturation can be reported"""
+
+    def __init__(self, max_pool_size: int):
+        self.max_pool_size = max_pool_size
+        self._lock = threading.Lock()
+        self.open = 0
+        self.checked_out = 0
+        self.waiting = 0
+        self.checkout_failures = 0
+        self.pool_clears = 0
+
+    def _add(self, field: str, delta: int):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + delta)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get a snapshot of pool usage"""
+        with self._lock:
+            return {
+                "max_pool_size": self.max_pool_size,
+                "open": self.open,
+                "checked_out": self.checked_out,
+                "available": max(self.open - self.checked_out, 0),
+                "waiting": self.waiting,
+                "saturation": self.checked_out / self.max_pool_size if self.max_pool_size else 0.0,
+                "checkout_failures": self.checkout_failures,
+                "pool_clears": self.pool_clears,
+            }
+
+    def connection_created(self, event):
+        self._add("open", 1)
+
+    def connection_closed(self, event):
+        self._add("open", -1)
+
+    def connection_check_out_started(self, event):
+        self._add("waiting", 1)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.waiting -= 1
+            self.checked_out += 1
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.waiting -= 1
+            self.checkout_failures += 1
+        logger.warning(f"MongoDB connection check out failed: {event.reason}")
+
+    def connection_checked_in(self, event):
+        self._add("checked_out", -1)
+
+    def pool_cleared(self, event):
+        self._add("pool_clears", 1)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+def pool_options() -> Dict[str, int]:
+    """Read connection pool options from the environment"""
+    options = {}
+    for option, (env_var, default) in POOL_SETTINGS.items():
+        value = os.environ.get(env_var)
+        if value:
+            options[option] = int(value)
+        elif default is not None:
+            options[option] = default
+    return options
+
+def create_client(mongo_url: Optional[str] = None) -> Tuple[AsyncIOMotorClient, PoolMonitor]:
+    """Create the Motor client with the configured pool and its pool monitor"""
+    options = pool_options()
+    monitor = PoolMonitor(options["maxPoolSize"])
+    client = AsyncIOMotorClient(
+        mongo_url or os.environ['MONGO_URL'],
+        event_listeners=[monitor],
+        **options
+    )
+    return client, monitor
+
+class Database(StorageBackend):
+    """MongoDB storage backend"""
+
+    shared_across_processes = True
+
+    def __init__(
+        self,
+        client: Optional[AsyncIOMotorClient] = None,
+        pool_monitor: Optional[PoolMonitor] = None
+    ):
+        super().__init__()
         self.mongo_url = os.environ['MONGO_URL']
         self.db_name = os.environ.get('DB_NAME', 'portfolio')
-        self.client = AsyncIOMotorClient(self.mongo_url)
+        # Reuse an application-scoped client when given one, otherwise own a new one
+        self._owns_client = client is None
+        if client is None:
+            client, pool_monitor = create_client(self.mongo_url)
+        self.client = client
+        self.pool_monitor = pool_monitor
         self.db = self.client[self.db_name]
-        
+        self.track_shared_revisions = TRACK_SHARED_REVISIONS
+        # Last shared revision seen per collection, from our own bumps or polling
+        self._shared_revisions: Dict[str, int] = {}
+        self._shared_revisions_polled = False
+        self._pending_bumps: Set[asyncio.Task] = set()
+        # Set while a change stream delivers every write: remembers this
+        # process's writes so their events can be told apart from remote ones
+        self.track_own_writes = False
+        self._own_writes: Dict[Tuple[str, str], deque] = {}
+
     async def close(self):
-        """Close database connection"""
-        self.client.close()
+        """Close database connection if this instance owns the client"""
+        if self._pending_bumps:
+            await asyncio.gather(*self._pending_bumps, return_exceptions=True)
+        if self._owns_client:
+            self.client.close()
+
+    # Cross-process change tracking
+    def _notify_change(self, collection: str, ids: Optional[List[str]] = None):
+        super()._notify_change(collection, ids)
+        if self.track_own_writes and ids:
+            deadline = time.monotonic() + OWN_WRITE_TTL
+            for record_id in ids:
+                self._own_writes.setdefault((collection, record_id), deque()).append(deadline)
+        if self.track_shared_revisions:
+            task = asyncio.get_running_loop().create_task(self._bump_shared_revision(collection))
+            self._pending_bumps.add(task)
+            task.add_done_callback(self._pending_bumps.discard)
+
+    async def _bump_shared_revision(self, collection: str):
+        try:
+            document = await self.db[REVISIONS_COLLECTION].find_one_and_update(
+                {"_id": REVISIONS_DOCUMENT_ID},
+                {"$inc": {collection: 1}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except Exception as e:
+            logger.error(f"Error bumping shared revision of {collection}: {e}")
+            return
+        previous = self._shared_revisions.get(collection)
+        self._shared_revisions[collection] = max(document[collection], previous or 0)
+        if previous is not None and document[collection] > previous + 1:
+            # Another process wrote to the collection since we last looked
+            self.apply_remote_change(collection)
+
+    async def poll_shared_revisions(self) -> List[str]:
+        """Apply changes other processes recorded in the revision document.
+
+        The first call only records the current revisions.
+        """
+        document = await self.db[REVISIONS_COLLECTION].find_one({"_id": REVISIONS_DOCUMENT_ID}) or {}
+        changed = []
+        first_poll = not self._shared_revisions_polled
+        self._shared_revisions_polled = True
+        for collection, revision in document.items():
+            if collection == "_id":
+                continue
+            previous = self._shared_revisions.get(collection)
+            self._shared_revisions[collection] = max(revision, previous or 0)
+            if not first_poll and (previous is None or revision > previous):
+                changed.append(collection)
+                self.apply_remote_change(collection)
+        return changed
+
+    def is_own_write(self, collection: str, record_id: str) -> bool:
+        """Whether a change event for the record matches a write this process made.
+
+        Each local write is matched by at most one event, and only within
+        OWN_WRITE_TTL of being made.
+        """
+        now = time.monotonic()
+        key = (collection, record_id)
+        deadlines = self._own_writes.get(key)
+        if deadlines is None:
+            return False
+        while deadlines and deadlines[0] <= now:
+            deadlines.popleft()
+        matched = bool(deadlines)
+        if matched:
+            deadlines.popleft()
+        if not deadlines:
+            del self._own_writes[key]
+        if len(self._own_writes) > 1024:
+            # Forget writes whose events never came, e.g. while the stream was down
+            self._own_writes = {
+                key: deadlines for key, deadlines in self._own_writes.items() if deadlines[-1] > now
+            }
+        return matched
+
+    async def enable_change_pre_images(self, collections: List[str]) -> bool:
+        """Record pre-images so delete events name the deleted record (MongoDB 6.0+).
+
+        Returns False when the server or our role does not allow it.
+        """
+        for collection in collections:
+            try:
+                await self.db.command("collMod", collection, changeStreamPreAndPostImages={"enabled": True})
+            except OperationFailure as e:
+                if e.code == NAMESPACE_NOT_FOUND:
+                    continue
+                logger.info(f"Change stream pre-images unavailable: {e}")
+                return False
+        return True
+
+    def watch_changes(
+        self,
+        collections: List[str],
+        resume_token: Optional[Dict[str, Any]] = None,
+        start_after: bool = False,
+        pre_images: bool = False
+    ):
+        """Open a change stream over the given collections (requires a replica set).
+
+        Inserts, updates and replaces carry the current document, and deletes
+        carry the pre-image when pre_images are enabled. start_after resumes
+        from the token of an invalidate event.
+        """
+        # Imports swap collections in by renaming over them, which only names the target in "to";
+        # dropping the database has no collection and ends the stream with an invalidate
+        pipeline = [{"$match": {"$or": [
+            {"ns.coll": {"$in": collections}},
+            {"to.coll": {"$in": collections}},
+            {"operationType": {"$in": ["dropDatabase", "invalidate"]}},
+        ]}}]
+        options: Dict[str, Any] = {"full_document": "updateLookup"}
+        if pre_images:
+            options["full_document_before_change"] = "whenAvailable"
+        if start_after:
+            options["start_after"] = resume_token
+        else:
+            options["resume_after"] = resume_token
+        return self.db.watch(pipeline, **options)
+
+    async def ping(self) -> float:
+        """Run the ping command, returning the round trip in seconds"""
+        start = time.perf_counter()
+        await self.client.admin.command("ping")
+        return time.perf_counter() - start
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool usage for the underlying client"""
+        return self.pool_monitor.stats() if self.pool_monitor else {}
+
+    async def ensure_indexes(self) -> Dict[str, List[str]]:
+        """Create any missing MongoDB indexes"""
+        return await ensure_indexes(self.db)
+
+    async def drop_database(self):
+        """Drop the whole MongoDB database"""
+        await self.client.drop_database(self.db_name)
+
+    # Archives
+    async def archive_collections(self) -> List[str]:
+        """Names of the collections an archive export covers"""
+        names = await self.db.list_collection_names()
+        return sorted(
+            name for name in names
+            if not name.startswith("system.")
+            and not name.endswith(STAGING_SUFFIX)
+            and name not in UNARCHIVED_COLLECTIONS
+        )
+
+    async def iter_documents(self, collection: str, batch_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every stored document unchanged, _id included, in natural order"""
+        async for document in self.db[collection].find({}).batch_size(batch_size):
+            yield document
+
+    async def create_staging_collection(self, collection: str) -> str:
+        """Create an empty collection to import into, replacing leftovers of an earlier import"""
+        staging = collection + STAGING_SUFFIX
+        await self.db.drop_collection(staging)
+        await self.db.create_collection(staging)
+        return staging
+
+    async def insert_documents(self, collection: str, documents: List[Dict[str, Any]]) -> int:
+        """Insert documents as they are; raises on any failure"""
+        if not documents:
+            return 0
+        result = await self.db[collection].insert_many(documents, ordered=False)
+        return len(result.inserted_ids)
+
+    async def swap_staging_collection(self, collection: str):
+        """Index a loaded staging collection and rename it over the live one.
+
+        The rename replaces the target atomically, so readers see either the
+        old or the new collection, never a partial one.
+        """
+        staging = collection + STAGING_SUFFIX
+        if collection in INDEX_SPECS:
+            await self.db[staging].create_indexes(INDEX_SPECS[collection])
+        await self.db[staging].rename(collection, dropTarget=True)
+        self._notify_change(collection)
+
+    async def drop_staging_collection(self, collection: str):
+        await self.db.drop_collection(collection + STAGING_SUFFIX)
+
+    # Pagination and streaming
+    async def get_page(
+        self,
+        collection: str,
+        limit: int,
+        after: Optional[Tuple[datetime, str]] = None,
+        filter_query: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, str]]]:
+        """Get one page of records and the keyset position of the next page"""
+        try:
+            query = dict(filter_query or {})
+            if after:
+                created_at, record_id = after
+                query["$or"] = [
+                    {"created_at": {"$lt": created_at}},
+                    {"created_at": created_at, "id": {"$lt": record_id}}
+                ]
+            cursor = self.db[collection].find(query, {"_id": 0}).sort(PAGE_SORT).limit(limit + 1)
+            records = await cursor.to_list(limit + 1)
+
+            next_after = None
+            if len(records) > limit:
+                records = records[:limit]
+                next_after = (records[-1]["created_at"], records[-1].get("id"))
+            return records, next_after
+        except Exception as e:
+            logger.error(f"Error getting page of {collection}: {e}")
+            return [], None
+
+    async def get_records(self, collection: str, ids: List[str]) -> List[Dict[str, Any]]:
+        """Get the records with the given ids in one query"""
+        cursor = self.db[collection].find({"id": {"$in": ids}}, {"_id": 0})
+        return await cursor.to_list(len(ids))
+
+    async def iter_records(
+        self,
+        collection: str,
+        filter_query: Optional[Dict[str, Any]] = None,
+        batch_size: int = 100
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield records newest first as the cursor produces them"""
+        cursor = self.db[collection].find(filter_query or {}, {"_id": 0}).sort(PAGE_SORT).batch_size(batch_size)
+        async for record in cursor:
+            yield record
+
+    # Bulk operations
+    async def bulk_upsert(
+        self,
+        collection: str,
+        records: List[Dict[str, Any]],
+        chunk_size: int = 1000
+    ) -> Dict[str, int]:
+        """Upsert records keyed on their application id in unordered bulk writes.
+
+        Existing documents keep their original created_at, so rerunning an
+        upsert with the same records is idempotent. Records that could not be
+        written are counted as failed; a chunk's write errors do not stop the
+        other chunks, but a failed connection leaves the rest unwritten.
+        """
+        counts = {"inserted": 0, "modified": 0, "matched": 0, "failed": 0}
+        written = 0
+        try:
+            now = datetime.utcnow()
+            for start in range(0, len(records), chunk_size):
+                operations = []
+                for record in records[start:start + chunk_size]:
+                    fields = {k: v for k, v in record.items() if k not in ('_id', 'created_at')}
+                    if 'id' not in fields:
+                        fields['id'] = str(uuid.uuid4())
+                    operations.append(UpdateOne(
+                        {"id": fields['id']},
+                        {
+                            "$set": fields,
+                            "$setOnInsert": {"created_at": record.get('created_at', now)}
+                        },
+                        upsert=True
+                    ))
+                try:
+                    result = await self.db[collection].bulk_write(operations, ordered=False)
+                    counts["inserted"] += result.upserted_count
+                    counts["modified"] += result.modified_count
+                    counts["matched"] += result.matched_count
+                except BulkWriteError as e:
+                    details = e.details
+                    counts["inserted"] += details.get("nUpserted", 0)
+                    counts["modified"] += details.get("nModified", 0)
+                    counts["matched"] += details.get("nMatched", 0)
+                    counts["failed"] += len(details.get("writeErrors", []))
+                    logger.error(f"Error bulk upserting {collection}: {len(details.get('writeErrors', []))} records failed")
+                written += len(operations)
+            return counts
+        except Exception as e:
+            logger.error(f"Error bulk upserting {collection}: {e}")
+            counts["failed"] += len(records) - written
+            return counts
+        finally:
+            if counts["inserted"] or counts["modified"]:
+                self._notify_change(collection)
+
+    async def apply_batch(
+        self,
+        operations: List[Dict[str, Any]],
+        transaction: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Apply operations as one ordered bulk write per collection.
+
+        Without a transaction a failed write skips the rest of its collection's
+        operations but not other collections'. With one, any failure rolls back
+        the whole batch; transactions need a replica set.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(operations)
+        groups: Dict[str, List[int]] = {}
+        for index, operation in enumerate(operations):
+            groups.setdefault(operation["collection"], []).append(index)
+
+        if not transaction:
+            for collection, indexes in groups.items():
+                try:
+                    await self._bulk_write_group(collection, operations, indexes, results)
+                except Exception as e:
+                    logger.error(f"Error in batch write to {collection}: {e}")
+                written = self._written_ids(collection, operations, indexes, results)
+                if written is None or written:
+                    self._notify_change(collection, written)
+            return results
+
+        try:
+            async with await self.client.start_session() as session:
+                async with session.start_transaction():
+                    for collection, indexes in groups.items():
+                        await self._bulk_write_group(collection, operations, indexes, results, session)
+        except Exception as e:
+            if isinstance(e, OperationFailure) and e.code == 20:
+                raise ValueError("Transactions require a MongoDB replica set") from e
+            logger.error(f"Batch transaction aborted: {e}")
+            for index, result in enumerate(results):
+                if result is None:
+                    result = results[index] = {"status": "skipped", "id": operations[index].get("id")}
+                elif result["status"] in APPLIED_STATUSES:
+                    result["status"] = "rolled_back"
+                result.setdefault("error", f"Transaction aborted: {e}")
+            return results
+        for collection, indexes in groups.items():
+            self._notify_change(collection, self._written_ids(collection, operations, indexes, results))
+        return results
+
+    @staticmethod
+    def _written_ids(
+        collection: str,
+        operations: List[Dict[str, Any]],
+        indexes: List[int],
+        results: List[Optional[Dict[str, Any]]]
+    ) -> Optional[List[str]]:
+        """Ids of one collection's applied operations; None for singletons, which have no ids"""
+        applied = [index for index in indexes if results[index]["status"] in APPLIED_STATUSES]
+        if collection in SINGLETON_COLLECTIONS:
+            return None if applied else []
+        return [results[index]["id"] for index in applied]
+
+    async def _bulk_write_group(
+        self,
+        collection: str,
+        operations: List[Dict[str, Any]],
+        indexes: List[int],
+        results: List[Optional[Dict[str, Any]]],
+        session=None
+    ):
+        """Write one collection's operations, recording a result for each before raising"""
+        written: List[int] = []
+        try:
+            singleton = collection in SINGLETON_COLLECTIONS
+            # One read tells which updates and deletes have a record to act on
+            targets = [operations[index]["id"] for index in indexes if operations[index]["op"] != "create"]
+            existing = set()
+            if targets and not singleton:
+                cursor = self.db[collection].find({"id": {"$in": targets}}, {"_id": 0, "id": 1}, session=session)
+                existing = {document["id"] async for document in cursor}
+
+            requests = []
+            now = datetime.utcnow()
+            for index in indexes:
+                operation = operations[index]
+                record_id = operation.get("id")
+                if operation["op"] == "create":
+                    record = {**operation["data"], "created_at": now}
+                    record_id = record["id"]
+                    requests.append(InsertOne(record))
+                    existing.add(record_id)
+                    status = "created"
+                elif singleton:
+                    requests.append(UpdateOne({}, {"$set": operation["data"]}, upsert=True))
+                    status = "updated"
+                elif record_id not in existing:
+                    results[index] = {"status": "not_found", "id": record_id}
+                    continue
+                elif operation["op"] == "update":
+                    requests.append(UpdateOne({"id": record_id}, {"$set": operation["data"]}))
+                    status = "updated"
+                else:
+                    requests.append(DeleteOne({"id": record_id}))
+                    existing.discard(record_id)
+                    status = "deleted"
+                results[index] = {"status": status, "id": record_id}
+                written.append(index)
+
+            if requests:
+                await self.db[collection].bulk_write(requests, ordered=True, session=session)
+        except BulkWriteError as e:
+            # Ordered writes stop at the first error; later operations never ran
+            error = e.details["writeErrors"][0]
+            for position, index in enumerate(written[error["index"]:]):
+                results[index]["status"] = "error" if position == 0 else "skipped"
+                if position == 0:
+                    results[index]["error"] = error.get("errmsg", "Write failed")
+            raise
+        except Exception as e:
+            for index in indexes:
+                if results[index] is None or index in written:
+                    record_id = (results[index] or operations[index]).get("id")
+                    results[index] = {"status": "error", "id": record_id, "error": str(e)}
+            raise
+
+    # Rate limiting
+    async def take_rate_limit_token(self, key: str, rate: float, burst: int) -> float:
+        """Refill and take from a token bucket in one atomic pipeline update"""
+        now = datetime.utcnow()
+        elapsed = {"$divide": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, 1000]}
+        bucket = await self.db.rate_limits.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {
+                    "tokens": {"$min": [
+                        burst,
+                        {"$add": [{"$ifNull": ["$tokens", burst]}, {"$multiply": [elapsed, rate]}]}
+                    ]},
+                    "updated_at": now,
+                    # A bucket idle this long is full again, so it can be dropped
+                    "expires_at": now + timedelta(seconds=burst / rate),
+                }},
+                {"$set": {"allowed": {"$gte": ["$tokens", 1]}}},
+                {"$set": {"tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", 1]}, "$tokens"]}}},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if bucket["allowed"]:
+            return 0.0
+        return (1 - bucket["tokens"]) / rate
+
+    async def refund_rate_limit_token(self, key: str, burst: int):
+        """Give back a token taken for a request that was not served"""
+        await self.db.rate_limits.update_one(
+            {"_id": key},
+            [{"$set": {"tokens": {"$min": [burst, {"$add": ["$tokens", 1]}]}}}]
+        )
+
+    async def register_content_hash(self, digest: str, window: float) -> bool:
+        """Insert or revive a hash document; a live one raises a duplicate key error"""
+        now = datetime.utcnow()
+        try:
+            await self.db.contact_hashes.update_one(
+                {"_id": digest, "expires_at": {"$lte": now}},
+                {"$set": {"expires_at": now + timedelta(seconds=window)}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def release_content_hash(self, digest: str):
+        await self.db.contact_hashes.delete_one({"_id": digest})
 
     # Personal Info operations
     async def get_personal_info(self) -> Optional[Dict[str, Any]]:
         """Get personal information"""
         try:
-            result = await self.db.profiles.find_one()
+            result = await self.db.profiles.find_one({}, {"_id": 0})
             return result
         except Exception as e:
             logger.error(f"Error getting personal info: {e}")
@@ -35,6 +637,8 @@ class Database:
                 data,
                 upsert=True  # Create if doesn't exist
             )
+            if result.modified_count > 0 or result.upserted_id is not None:
+                self._notify_change("profiles")
             return result.acknowledged
         except Exception as e:
             logger.error(f"Error updating personal info: {e}")
@@ -44,8 +648,8 @@ class Database:
     async def get_all_education(self) -> List[Dict[str, Any]]:
         """Get all education records"""
         try:
-            cursor = self.db.education.find().sort("created_at", -1)
-            return await cursor.to_list(100)
+            cursor = self.db.education.find({}, {"_id": 0}).sort(PAGE_SORT).limit(MAX_LIST_RECORDS + 1)
+            return await cursor.to_list(MAX_LIST_RECORDS + 1)
         except Exception as e:
             logger.error(f"Error getting education records: {e}")
             return []
@@ -54,7 +658,9 @@ class Database:
         """Create new education record"""
         try:
             data['created_at'] = datetime.utcnow()
+            data.setdefault('id', str(uuid.uuid4()))
             result = await self.db.education.insert_one(data)
+            self._notify_change("education", [data['id']])
             return str(result.inserted_id) if result.inserted_id else None
         except Exception as e:
             logger.error(f"Error creating education record: {e}")
@@ -67,6 +673,8 @@ class Database:
                 {"id": education_id},
                 {"$set": data}
             )
+            if result.modified_count > 0:
+                self._notify_change("education", [education_id])
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating education record: {e}")
@@ -76,6 +684,8 @@ class Database:
         """Delete education record"""
         try:
             result = await self.db.education.delete_one({"id": education_id})
+            if result.deleted_count > 0:
+                self._notify_change("education", [education_id])
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting education record: {e}")
@@ -85,8 +695,8 @@ class Database:
     async def get_all_experience(self) -> List[Dict[str, Any]]:
         """Get all experience records"""
         try:
-            cursor = self.db.experience.find().sort("created_at", -1)
-            return await cursor.to_list(100)
+            cursor = self.db.experience.find({}, {"_id": 0}).sort(PAGE_SORT).limit(MAX_LIST_RECORDS + 1)
+            return await cursor.to_list(MAX_LIST_RECORDS + 1)
         except Exception as e:
             logger.error(f"Error getting experience records: {e}")
             return []
@@ -95,7 +705,9 @@ class Database:
         """Create new experience record"""
         try:
             data['created_at'] = datetime.utcnow()
+            data.setdefault('id', str(uuid.uuid4()))
             result = await self.db.experience.insert_one(data)
+            self._notify_change("experience", [data['id']])
             return str(result.inserted_id) if result.inserted_id else None
         except Exception as e:
             logger.error(f"Error creating experience record: {e}")
@@ -108,6 +720,8 @@ class Database:
                 {"id": experience_id},
                 {"$set": data}
             )
+            if result.modified_count > 0:
+                self._notify_change("experience", [experience_id])
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating experience record: {e}")
@@ -117,6 +731,8 @@ class Database:
         """Delete experience record"""
         try:
             result = await self.db.experience.delete_one({"id": experience_id})
+            if result.deleted_count > 0:
+                self._notify_change("experience", [experience_id])
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting experience record: {e}")
@@ -127,8 +743,8 @@ class Database:
         """Get all projects, optionally filtered by category"""
         try:
             filter_query = {"category": category} if category else {}
-            cursor = self.db.projects.find(filter_query).sort("created_at", -1)
-            return await cursor.to_list(100)
+            cursor = self.db.projects.find(filter_query, {"_id": 0}).sort(PAGE_SORT).limit(MAX_LIST_RECORDS + 1)
+            return await cursor.to_list(MAX_LIST_RECORDS + 1)
         except Exception as e:
             logger.error(f"Error getting projects: {e}")
             return []
@@ -137,7 +753,9 @@ class Database:
         """Create new project record"""
         try:
             data['created_at'] = datetime.utcnow()
+            data.setdefault('id', str(uuid.uuid4()))
             result = await self.db.projects.insert_one(data)
+            self._notify_change("projects", [data['id']])
             return str(result.inserted_id) if result.inserted_id else None
         except Exception as e:
             logger.error(f"Error creating project record: {e}")
@@ -150,6 +768,8 @@ class Database:
                 {"id": project_id},
                 {"$set": data}
             )
+            if result.modified_count > 0:
+                self._notify_change("projects", [project_id])
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating project record: {e}")
@@ -159,6 +779,8 @@ class Database:
         """Delete project record"""
         try:
             result = await self.db.projects.delete_one({"id": project_id})
+            if result.deleted_count > 0:
+                self._notify_change("projects", [project_id])
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting project record: {e}")
@@ -168,7 +790,7 @@ class Database:
     async def get_skills(self) -> Optional[Dict[str, Any]]:
         """Get skills data"""
         try:
-            result = await self.db.skills.find_one()
+            result = await self.db.skills.find_one({}, {"_id": 0})
             return result
         except Exception as e:
             logger.error(f"Error getting skills: {e}")
@@ -182,6 +804,8 @@ class Database:
                 data,
                 upsert=True
             )
+            if result.modified_count > 0 or result.upserted_id is not None:
+                self._notify_change("skills")
             return result.acknowledged
         except Exception as e:
             logger.error(f"Error updating skills: {e}")
@@ -191,8 +815,8 @@ class Database:
     async def get_all_certifications(self) -> List[Dict[str, Any]]:
         """Get all certifications"""
         try:
-            cursor = self.db.certifications.find().sort("created_at", -1)
-            return await cursor.to_list(100)
+            cursor = self.db.certifications.find({}, {"_id": 0}).sort(PAGE_SORT).limit(MAX_LIST_RECORDS + 1)
+            return await cursor.to_list(MAX_LIST_RECORDS + 1)
         except Exception as e:
             logger.error(f"Error getting certifications: {e}")
             return []
@@ -201,7 +825,9 @@ class Database:
         """Create new certification record"""
         try:
             data['created_at'] = datetime.utcnow()
+            data.setdefault('id', str(uuid.uuid4()))
             result = await self.db.certifications.insert_one(data)
+            self._notify_change("certifications", [data['id']])
             return str(result.inserted_id) if result.inserted_id else None
         except Exception as e:
             logger.error(f"Error creating certification record: {e}")
@@ -214,6 +840,8 @@ class Database:
                 {"id": certification_id},
                 {"$set": data}
             )
+            if result.modified_count > 0:
+                self._notify_change("certifications", [certification_id])
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating certification record: {e}")
@@ -223,6 +851,8 @@ class Database:
         """Delete certification record"""
         try:
             result = await self.db.certifications.delete_one({"id": certification_id})
+            if result.deleted_count > 0:
+                self._notify_change("certifications", [certification_id])
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting certification record: {e}")
@@ -232,8 +862,8 @@ class Database:
     async def get_all_awards(self) -> List[Dict[str, Any]]:
         """Get all awards"""
         try:
-            cursor = self.db.awards.find().sort("created_at", -1)
-            return await cursor.to_list(100)
+            cursor = self.db.awards.find({}, {"_id": 0}).sort(PAGE_SORT).limit(MAX_LIST_RECORDS + 1)
+            return await cursor.to_list(MAX_LIST_RECORDS + 1)
         except Exception as e:
             logger.error(f"Error getting awards: {e}")
             return []
@@ -242,7 +872,9 @@ class Database:
         """Create new award record"""
         try:
             data['created_at'] = datetime.utcnow()
+            data.setdefault('id', str(uuid.uuid4()))
             result = await self.db.awards.insert_one(data)
+            self._notify_change("awards", [data['id']])
             return str(result.inserted_id) if result.inserted_id else None
         except Exception as e:
             logger.error(f"Error creating award record: {e}")
@@ -255,6 +887,8 @@ class Database:
                 {"id": award_id},
                 {"$set": data}
             )
+            if result.modified_count > 0:
+                self._notify_change("awards", [award_id])
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating award record: {e}")
@@ -264,6 +898,8 @@ class Database:
         """Delete award record"""
         try:
             result = await self.db.awards.delete_one({"id": award_id})
+            if result.deleted_count > 0:
+                self._notify_change("awards", [award_id])
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting award record: {e}")
@@ -273,8 +909,8 @@ class Database:
     async def get_all_patents(self) -> List[Dict[str, Any]]:
         """Get all patents"""
         try:
-            cursor = self.db.patents.find().sort("created_at", -1)
-            return await cursor.to_list(100)
+            cursor = self.db.patents.find({}, {"_id": 0}).sort(PAGE_SORT).limit(MAX_LIST_RECORDS + 1)
+            return await cursor.to_list(MAX_LIST_RECORDS + 1)
         except Exception as e:
             logger.error(f"Error getting patents: {e}")
             return []
@@ -283,7 +919,9 @@ class Database:
         """Create new patent record"""
         try:
             data['created_at'] = datetime.utcnow()
+            data.setdefault('id', str(uuid.uuid4()))
             result = await self.db.patents.insert_one(data)
+            self._notify_change("patents", [data['id']])
             return str(result.inserted_id) if result.inserted_id else None
         except Exception as e:
             logger.error(f"Error creating patent record: {e}")
@@ -296,6 +934,8 @@ class Database:
                 {"id": patent_id},
                 {"$set": data}
             )
+            if result.modified_count > 0:
+                self._notify_change("patents", [patent_id])
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating patent record: {e}")
@@ -305,6 +945,8 @@ class Database:
         """Delete patent record"""
         try:
             result = await self.db.patents.delete_one({"id": patent_id})
+            if result.deleted_count > 0:
+                self._notify_change("patents", [patent_id])
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting patent record: {e}")
@@ -315,18 +957,39 @@ class Database:
         """Create new contact submission"""
         try:
             data['created_at'] = datetime.utcnow()
+            data.setdefault('id', str(uuid.uuid4()))
             data['read'] = False
             result = await self.db.contacts.insert_one(data)
+            self._notify_change("contacts", [data['id']])
             return str(result.inserted_id) if result.inserted_id else None
         except Exception as e:
             logger.error(f"Error creating contact submission: {e}")
             return None
 
+    async def create_contact_submissions(self, records: List[Dict[str, Any]]) -> int:
+        """Insert a batch of contact submissions in one unordered insert_many"""
+        if not records:
+            return 0
+        for record in records:
+            record.setdefault('created_at', datetime.utcnow())
+            record.setdefault('id', str(uuid.uuid4()))
+            record.setdefault('read', False)
+        try:
+            result = await self.db.contacts.insert_many(records, ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            # Duplicate ids come from retrying a partially written batch
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                raise
+            return e.details.get("nInserted", 0)
+        finally:
+            self._notify_change("contacts", [record['id'] for record in records])
+
     async def get_contact_submissions(self) -> List[Dict[str, Any]]:
         """Get all contact submissions"""
         try:
-            cursor = self.db.contacts.find().sort("created_at", -1)
-            return await cursor.to_list(100)
+            cursor = self.db.contacts.find({}, {"_id": 0}).sort(PAGE_SORT).limit(MAX_LIST_RECORDS + 1)
+            return await cursor.to_list(MAX_LIST_RECORDS + 1)
         except Exception as e:
             logger.error(f"Error getting contact submissions: {e}")
             return []
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+Category and technology facets over projects, kept in memory
+"""
+import logging
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from pagination import page_position
+from record_index import DocKey, RecordIndex
+from storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+
+def technology_key(name: str) -> str:
+    """Normalize a technology name so "PyTorch" and "pytorch " facet together"""
+    return " ".join(name.split()).lower()
+
+
+class ProjectFacets(RecordIndex):
+    """Project ids grouped by category and by technology.
+
+    Facet counts are the sizes of those groups, so they are always current
+    without aggregating per request; filters intersect the groups.
+    """
+
+    def __init__(self):
+        super().__init__(["projects"])
+        self._categories: Dict[str, Set[str]] = {}
+        self._technologies: Dict[str, Set[str]] = {}
+        # Spellings seen for each normalized technology, to label its facet
+        self._labels: Dict[str, Counter] = {}
+
+    def _index(self, key: DocKey, record: Dict[str, Any]):
+        record_id = key[1]
+        self._categories.setdefault(record.get("category"), set()).add(record_id)
+        for name in set(record.get("technologies") or []):
+            tech = technology_key(name)
+            self._technologies.setdefault(tech, set()).add(record_id)
+            self._labels.setdefault(tech, Counter())[name.strip()] += 1
+
+    def _unindex(self, key: DocKey, record: Dict[str, Any]):
+        record_id = key[1]
+        category = record.get("category")
+        self._categories[category].discard(record_id)
+        if not self._categories[category]:
+            del self._categories[category]
+        for name in set(record.get("technologies") or []):
+            tech = technology_key(name)
+            self._technologies[tech].discard(record_id)
+            self._labels[tech][name.strip()] -= 1
+            if not self._technologies[tech]:
+                del self._technologies[tech]
+                del self._labels[tech]
+
+    async def build(self, db: StorageBackend):
+        await super().build(db)
+        logger.info(
+            f"Project facets built: {len(self._records)} projects, "
+            f"{len(self._categories)} categories, {len(self._technologies)} technologies"
+        )
+
+    def _label(self, tech: str) -> str:
+        return self._labels[tech].most_common(1)[0][0]
+
+    def counts(self) -> Dict[str, Any]:
+        """Project counts per category and per technology, largest first"""
+        def ranked(groups: Dict[Any, Set[str]], label) -> List[Dict[str, Any]]:
+            items = sorted(groups.items(), key=lambda item: (-len(item[1]), str(item[0])))
+            return [{"value": label(value), "count": len(ids)} for value, ids in items]
+
+        return {
+            "total": len(self._records),
+            "categories": ranked(self._categories, lambda value: value),
+            "technologies": ranked(self._technologies, self._label),
+        }
+
+    def filter(self, technologies: Iterable[str], category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Projects using every given technology, newest first"""
+        groups = [self._technologies.get(technology_key(name), set()) for name in technologies]
+        if category is not None:
+            groups.append(self._categories.get(category, set()))
+        if not groups:
+            ids = {record_id for _, record_id in self._records}
+        else:
+            groups.sort(key=len)
+            ids = set(groups[0]).intersection(*groups[1:])
+        records = [self._records[("projects", record_id)] for record_id in ids]
+        records.sort(key=page_position, reverse=True)
+        return records
@@ -0,0 +1,190 @@
+"""
+Background dependency probes behind /health, so health checks never wait on MongoDB
+"""
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+HEALTH_PROBE_INTERVAL = float(os.environ.get('HEALTH_PROBE_INTERVAL', '5'))
+# A ping slower than the timeout counts as a failure
+HEALTH_PING_TIMEOUT = float(os.environ.get('HEALTH_PING_TIMEOUT', '2'))
+HEALTH_PING_DEGRADED_MS = float(os.environ.get('HEALTH_PING_DEGRADED_MS', '100'))
+HEALTH_LOOP_LAG_DEGRADED_MS = float(os.environ.get('HEALTH_LOOP_LAG_DEGRADED_MS', '100'))
+HEALTH_LOOP_LAG_UNHEALTHY_MS = float(os.environ.get('HEALTH_LOOP_LAG_UNHEALTHY_MS', '1000'))
+# Fraction of the connection pool checked out
+HEALTH_POOL_DEGRADED_SATURATION = float(os.environ.get('HEALTH_POOL_DEGRADED_SATURATION', '0.8'))
+# Fraction of a write buffer's capacity in use
+HEALTH_QUEUE_DEGRADED_RATIO = float(os.environ.get('HEALTH_QUEUE_DEGRADED_RATIO', '0.5'))
+HEALTH_QUEUE_UNHEALTHY_RATIO = float(os.environ.get('HEALTH_QUEUE_UNHEALTHY_RATIO', '0.9'))
+
+# How often the event loop lag is sampled; a blocking call is measured from the
+# first sample due after it starts, so it can be underestimated by up to this much
+LOOP_LAG_SAMPLE_INTERVAL = 0.1
+
+HEALTHY = "healthy"
+DEGRADED = "degraded"
+UNHEALTHY = "unhealthy"
+_SEVERITY = {HEALTHY: 0, DEGRADED: 1, UNHEALTHY: 2}
+
+
+def worst(*statuses: str) -> str:
+    return max(statuses, key=_SEVERITY.__getitem__, default=HEALTHY)
+
+
+def status_value(status: str) -> int:
+    """0 for healthy, 1 for degraded, 2 for unhealthy"""
+    return _SEVERITY[status]
+
+
+class HealthMonitor:
+    """Probes storage, the connection pool, the event loop and write buffers in the background.
+
+    /health serves the latest result, so probe frequency is independent of
+    how often load balancers ask. A result older than three probe intervals
+    means the probe task itself is stuck and is reported as unhealthy.
+    """
+
+    def __init__(self, db, writers: Optional[Dict[str, Any]] = None, interval: float = HEALTH_PROBE_INTERVAL):
+        self.db = db
+        # name -> buffered writer with stats() reporting queued, in_flight, capacity and failed_flushes
+        self.writers = writers or {}
+        self.interval = interval
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._max_lag = 0.0
+        self._last_counters: Dict[str, int] = {}
+        self._tasks = []
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._probe_loop()),
+                asyncio.create_task(self._lag_loop()),
+            ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def result(self) -> Dict[str, Any]:
+        """The latest probe result, without waiting for a new one"""
+        if self._result is None:
+            return {"status": UNHEALTHY, "checks": {}, "message": "No health probe has completed yet"}
+        age = time.monotonic() - self._checked_at
+        if age > self.interval * 3:
+            return {**self._result, "status": UNHEALTHY, "message": f"Health probe stalled for {age:.0f}s"}
+        return self._result
+
+    async def _lag_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LOOP_LAG_SAMPLE_INTERVAL)
+            self._max_lag = max(self._max_lag, loop.time() - start - LOOP_LAG_SAMPLE_INTERVAL)
+
+    async def _probe_loop(self):
+        while True:
+            try:
+                await self.probe()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error running health probes: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def probe(self) -> Dict[str, Any]:
+        """Run every probe once and cache the combined result"""
+        checks = {
+            "storage": await self._check_storage(),
+            "pool": self._check_pool(),
+            "event_loop": self._check_event_loop(),
+        }
+        for name, writer in self.writers.items():
+            checks[name] = self._check_writer(name, writer)
+
+        status = worst(*(check["status"] for check in checks.values()))
+        previous = self._result["status"] if self._result else None
+        if status != previous:
+            log = logger.info if status == HEALTHY else logger.warning
+            log(f"Health is {status}", extra={
+                "health": {name: check["status"] for name, check in checks.items()}
+            })
+        self._result = {
+            "status": status,
+            "checked_at": datetime.utcnow().isoformat(),
+            "checks": checks,
+        }
+        self._checked_at = time.monotonic()
+        return self._result
+
+    def _increase(self, key: str, value: int) -> int:
+        """How much a monotonic counter grew since the previous probe"""
+        previous = self._last_counters.get(key, value)
+        self._last_counters[key] = value
+        return value - previous
+
+    async def _check_storage(self) -> Dict[str, Any]:
+        try:
+            latency_ms = await asyncio.wait_for(self.db.ping(), HEALTH_PING_TIMEOUT) * 1000
+        except asyncio.TimeoutError:
+            return {"status": UNHEALTHY, "error": f"Ping timed out after {HEALTH_PING_TIMEOUT}s"}
+        except Exception as e:
+            return {"status": UNHEALTHY, "error": str(e)}
+        return {
+            "status": DEGRADED if latency_ms >= HEALTH_PING_DEGRADED_MS else HEALTHY,
+            "latency_ms": round(latency_ms, 3),
+        }
+
+    def _check_pool(self) -> Dict[str, Any]:
+        stats = self.db.pool_stats()
+        if not stats:
+            return {"status": HEALTHY}
+        failures = self._increase("pool.checkout_failures", stats["checkout_failures"])
+        status = HEALTHY
+        if stats["saturation"] >= HEALTH_POOL_DEGRADED_SATURATION or failures:
+            status = DEGRADED
+        if stats["available"] == 0 and stats["waiting"] > 0 and failures:
+            # Requests are queueing for connections and timing out
+            status = UNHEALTHY
+        return {
+            "status": status,
+            "open": stats["open"],
+            "available": stats["available"],
+            "waiting": stats["waiting"],
+            "saturation": round(stats["saturation"], 3),
+            "checkout_failures": failures,
+        }
+
+    def _check_event_loop(self) -> Dict[str, Any]:
+        lag_ms = self._max_lag * 1000
+        self._max_lag = 0.0
+        status = HEALTHY
+        if lag_ms >= HEALTH_LOOP_LAG_UNHEALTHY_MS:
+            status = UNHEALTHY
+        elif lag_ms >= HEALTH_LOOP_LAG_DEGRADED_MS:
+            status = DEGRADED
+        return {"status": status, "max_lag_ms": round(lag_ms, 3)}
+
+    def _check_writer(self, name: str, writer) -> Dict[str, Any]:
+        stats = writer.stats()
+        depth = stats["queued"] + stats["in_flight"]
+        ratio = depth / stats["capacity"] if stats["capacity"] else 0.0
+        failed_flushes = self._increase(f"{name}.failed_flushes", stats["failed_flushes"])
+        status = HEALTHY
+        if ratio >= HEALTH_QUEUE_UNHEALTHY_RATIO:
+            status = UNHEALTHY
+        elif ratio >= HEALTH_QUEUE_DEGRADED_RATIO or failed_flushes:
+            status = DEGRADED
+        return {
+            "status": status,
+            "depth": depth,
+            "capacity": stats["capacity"],
+            "failed_flushes": failed_flushes,
+        }
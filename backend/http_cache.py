@@ -0,0 +1,159 @@
+"""
+HTTP validator helpers (ETag / Last-Modified) for the read routes
+"""
+import hashlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from responses import inherited_headers, json_body_response
+
+CACHE_CONTROL = "no-cache"
+# URLs whose last served ETag is remembered for If-None-Match revalidation
+ETAG_MEMO_MAX_ENTRIES = 256
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag of an encoded body.
+
+    It depends only on the content, so every worker and every restart
+    agrees on it, and it matches the ETags of the static export.
+    """
+    return f'"{hashlib.sha256(body).hexdigest()[:20]}"'
+
+
+class ETagMemo:
+    """ETags of the bodies last served per URL, keyed by the collections' revisions.
+
+    Lets If-None-Match be answered without loading or encoding the body
+    after the read cache dropped it, until one of the collections changes.
+    """
+
+    def __init__(self, max_entries: int = ETAG_MEMO_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Tuple[int, ...], str]]" = OrderedDict()
+
+    def get(self, key: Tuple[str, str], revisions: Tuple[int, ...]) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != revisions:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Tuple[str, str], revisions: Tuple[int, ...], etag: str) -> None:
+        self._entries[key] = (revisions, etag)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+etag_memo = ETagMemo()
+
+
+def build_validators(db, collections: Iterable[str]) -> Dict[str, str]:
+    """Build the Cache-Control and Last-Modified headers from the collections' last writes.
+
+    Last-Modified has one-second resolution, so it is left out while the
+    last write is in the current second: a second write in the same second
+    would otherwise leave If-Modified-Since answering 304 for a stale copy.
+    """
+    last_modified = None
+    for collection in collections:
+        _, modified = db.get_revision(collection)
+        if last_modified is None or modified > last_modified:
+            last_modified = modified
+
+    headers = {"Cache-Control": CACHE_CONTROL}
+    if last_modified is not None and last_modified < datetime.utcnow().replace(microsecond=0):
+        headers["Last-Modified"] = format_datetime(
+            last_modified.replace(tzinfo=timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def is_not_modified(request: Request, validators: Dict[str, str]) -> bool:
+    """Check the request's If-Modified-Since header against the current validators.
+
+    If-None-Match takes precedence and is answered from ETags instead (see
+    conditional_response and body_response).
+    """
+    if request.headers.get("if-none-match") is not None:
+        return False
+
+    if_modified_since = request.headers.get("if-modified-since")
+    last_modified = validators.get("Last-Modified")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        return parsedate_to_datetime(last_modified) <= since
+    return False
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    db,
+    collections: Iterable[str]
+) -> Optional[Response]:
+    """Return a 304 response when the validators show the client copy is current.
+
+    If-None-Match is answered here only from the ETag this URL was last
+    served with at the current revisions (see ETagMemo), and otherwise once
+    the body is known (see body_response). When the copy may be stale the
+    validators are attached to the outgoing response and None is returned
+    so the route can build the full body.
+    """
+    collections = list(collections)
+    validators = build_validators(db, collections)
+    revisions = tuple(db.get_revision(collection)[0] for collection in collections)
+    key = (request.url.path, request.url.query)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etag = etag_memo.get(key, revisions)
+        if etag is not None and _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={**validators, "ETag": etag})
+    elif is_not_modified(request, validators):
+        return Response(status_code=304, headers=validators)
+
+    # Taken before the body is loaded, so a write racing the load never pairs
+    # its revision with the older body
+    request.state.etag_memo_key = (key, revisions)
+    response.headers.update(validators)
+    return None
+
+
+def body_response(request: Request, response: Response, body: bytes) -> Response:
+    """Return pre-encoded JSON with its ETag, or a 304 when If-None-Match matches it"""
+    etag = body_etag(body)
+    response.headers["ETag"] = etag
+    memo_key = getattr(request.state, "etag_memo_key", None)
+    if memo_key is not None:
+        etag_memo.set(*memo_key, etag)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=inherited_headers(response))
+    return json_body_response(body, response)
@@ -0,0 +1,77 @@
+"""
+Idempotent MongoDB index bootstrap for the portfolio collections
+"""
+import logging
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+logger = logging.getLogger(__name__)
+
+# Collections holding application records with an "id" and a "created_at"
+RECORD_COLLECTIONS = [
+    "education", "experience", "projects",
+    "certifications", "awards", "patents", "contacts"
+]
+
+
+def _record_indexes() -> List[IndexModel]:
+    return [
+        # Legacy documents may lack an application id, so only index those that have one
+        IndexModel(
+            [("id", ASCENDING)],
+            name="id_unique",
+            unique=True,
+            partialFilterExpression={"id": {"$exists": True}}
+        ),
+        # Matches the newest-first keyset sort used by list and page queries
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+    ]
+
+
+INDEX_SPECS: Dict[str, List[IndexModel]] = {
+    collection: _record_indexes() for collection in RECORD_COLLECTIONS
+}
+INDEX_SPECS["projects"].append(
+    IndexModel([("category", ASCENDING), ("created_at", DESCENDING)], name="category_created_at")
+)
+# Shared rate limit buckets and contact hashes expire on their own
+for _collection in ("rate_limits", "contact_hashes"):
+    INDEX_SPECS[_collection] = [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0)
+    ]
+
+
+async def ensure_indexes(db) -> Dict[str, List[str]]:
+    """Create any missing indexes and report what was created, existed or failed.
+
+    Takes the Motor database handle. Safe to run on every startup: indexes
+    that already exist are left untouched.
+    """
+    report: Dict[str, List[str]] = {"created": [], "existing": [], "failed": []}
+
+    for collection, indexes in INDEX_SPECS.items():
+        try:
+            existing = await db[collection].index_information()
+        except Exception as e:
+            logger.error(f"Error reading indexes for {collection}: {e}")
+            existing = {}
+
+        for index in indexes:
+            name = index.document["name"]
+            label = f"{collection}.{name}"
+            if name in existing:
+                report["existing"].append(label)
+                continue
+            try:
+                await db[collection].create_indexes([index])
+                report["created"].append(label)
+            except Exception as e:
+                logger.error(f"Error creating index {label}: {e}")
+                report["failed"].append(label)
+
+    logger.info(
+        f"Index bootstrap: {len(report['created'])} created, "
+        f"{len(report['existing'])} existing, {len(report['failed'])} failed"
+    )
+    return report
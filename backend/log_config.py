@@ -0,0 +1,194 @@
+"""
+Non-blocking JSON logging with per-request context and sampled access logs
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from metrics import add_storage_observer
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+# "json" for machine-parseable lines, "text" for the classic format
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json').lower()
+# Fraction of fast, successful requests that get an access log line
+ACCESS_LOG_SAMPLE_RATE = float(os.environ.get('ACCESS_LOG_SAMPLE_RATE', '0.1'))
+# Requests slower than this are always logged
+ACCESS_LOG_SLOW_MS = float(os.environ.get('ACCESS_LOG_SLOW_MS', '500'))
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Attributes every LogRecord has; anything else was passed through extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_request_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar("request_context", default=None)
+
+
+def _count_storage_call(method: str, collection: str, start: float, duration: float):
+    context = _request_context.get()
+    if context is not None:
+        context["mongo_calls"] += 1
+        context["mongo_ms"] += duration * 1000
+
+
+add_storage_observer(_count_storage_call)
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamps records with the request they were logged from.
+
+    Runs in the logging thread of the caller, where the request's context
+    variables are visible.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _request_context.get()
+        if context is not None:
+            record.request_id = context["request_id"]
+            # The router has stored the matched route in the scope by now
+            route = getattr(context["scope"].get("route"), "path", None)
+            if route:
+                record.route = route
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the message, context and extra fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _PreparingQueueHandler(QueueHandler):
+    """Queues records without formatting them; the listener thread does that.
+
+    Only the message arguments and any traceback are rendered here, since
+    neither can safely be read later from another thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: str = LOG_LEVEL, log_format: str = LOG_FORMAT):
+    """Route all logging through a queue drained by a background thread"""
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = _PreparingQueueHandler(log_queue)
+    handler.addFilter(RequestContextFilter())
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level)
+    # Send uvicorn's logs through the same queue; access lines come from AccessLogMiddleware
+    for name in ("uvicorn", "uvicorn.error"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+    logging.getLogger("uvicorn.access").disabled = True
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flush queued records and stop the background thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+access_logger = logging.getLogger("access")
+
+
+class AccessLogMiddleware:
+    """Assigns request ids and logs sampled access lines with timings.
+
+    Errors and slow requests are always logged; other requests are logged
+    with probability ACCESS_LOG_SAMPLE_RATE.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = ACCESS_LOG_SAMPLE_RATE, slow_ms: float = ACCESS_LOG_SLOW_MS):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get("x-request-id") or uuid.uuid4().hex
+        context = {"request_id": request_id, "scope": scope, "mongo_calls": 0, "mongo_ms": 0.0}
+        token = _request_context.set(context)
+        status = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            route = getattr(scope.get("route"), "path", None)
+            _request_context.reset(token)
+            if status >= 400 or duration_ms >= self.slow_ms or random.random() < self.sample_rate:
+                # Logged with the request context reset, so it is passed explicitly
+                access_logger.info(
+                    f"{scope['method']} {scope['path']} {status} {duration_ms:.1f}ms",
+                    extra={
+                        "request_id": request_id,
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "route": route or "unmatched",
+                        "status": status,
+                        "duration_ms": round(duration_ms, 3),
+                        "mongo_calls": context["mongo_calls"],
+                        "mongo_ms": round(context["mongo_ms"], 3),
+                        "sampled": status < 400 and duration_ms < self.slow_ms,
+                    }
+                )
@@ -0,0 +1,471 @@
+"""
+In-memory storage backend with indexed lookups and optional snapshot persistence
+"""
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import List, Optional, Dict, Any, Tuple, AsyncIterator, Iterator
+from pathlib import Path
+import asyncio
+import json
+import os
+import uuid
+import logging
+from datetime import datetime
+
+from storage import StorageBackend, MAX_LIST_RECORDS, SINGLETON_COLLECTIONS
+from rate_limit import TokenBucketLimiter, DuplicateFilter
+
+logger = logging.getLogger(__name__)
+
+# Record collections and the fields each one keeps an equality index on
+RECORD_COLLECTIONS = {
+    "education": (),
+    "experience": (),
+    "projects": ("category",),
+    "certifications": (),
+    "awards": (),
+    "patents": (),
+    "contacts": (),
+}
+
+class MemoryCollection:
+    """Records keyed by id, kept in (created_at, id) order with field indexes"""
+
+    def __init__(self, indexed_fields: Tuple[str, ...] = ()):
+        self.records: Dict[str, Dict[str, Any]] = {}
+        # Ascending (created_at, id) keys; iterated in reverse for newest first
+        self.order: List[Tuple[datetime, str]] = []
+        # Per field and value, the matching records' keys in the same order
+        self.indexes: Dict[str, Dict[Any, List[Tuple[datetime, str]]]] = {field: {} for field in indexed_fields}
+
+    def _index(self, record: Dict[str, Any]):
+        key = (record["created_at"], record["id"])
+        for field, index in self.indexes.items():
+            insort(index.setdefault(record.get(field), []), key)
+
+    def _unindex(self, record: Dict[str, Any]):
+        key = (record["created_at"], record["id"])
+        for field, index in self.indexes.items():
+            keys = index.get(record.get(field))
+            if keys is not None:
+                position = bisect_left(keys, key)
+                if position < len(keys) and keys[position] == key:
+                    del keys[position]
+                if not keys:
+                    del index[record.get(field)]
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        return self.records.get(record_id)
+
+    def insert(self, record: Dict[str, Any]) -> bool:
+        """Store a copy of the record; returns False if its id already exists"""
+        if record["id"] in self.records:
+            return False
+        record = dict(record)
+        self.records[record["id"]] = record
+        insort(self.order, (record["created_at"], record["id"]))
+        self._index(record)
+        return True
+
+    def update(self, record_id: str, fields: Dict[str, Any]) -> bool:
+        """Apply fields to a record; returns True only if a value changed"""
+        record = self.records.get(record_id)
+        if record is None or all(record.get(k) == v for k, v in fields.items()):
+            return False
+        self._unindex(record)
+        record.update(fields)
+        self._index(record)
+        return True
+
+    def delete(self, record_id: str) -> bool:
+        record = self.records.pop(record_id, None)
+        if record is None:
+            return False
+        key = (record["created_at"], record_id)
+        del self.order[bisect_left(self.order, key)]
+        self._unindex(record)
+        return True
+
+    def ids(
+        self,
+        filter_query: Optional[Dict[str, Any]] = None,
+        before: Optional[Tuple[datetime, str]] = None
+    ) -> Iterator[str]:
+        """Yield matching ids newest first, starting strictly after a keyset position"""
+        filter_query = filter_query or {}
+
+        # Walk the smallest indexed equality match, check the rest per record
+        keys = self.order
+        for field, value in filter_query.items():
+            if field in self.indexes:
+                matches = self.indexes[field].get(value, [])
+                if keys is self.order or len(matches) < len(keys):
+                    keys = matches
+
+        end = bisect_left(keys, before) if before else len(keys)
+        for position in range(end - 1, -1, -1):
+            record_id = keys[position][1]
+            record = self.records[record_id]
+            if all(record.get(k) == v for k, v in filter_query.items()):
+                yield record_id
+
+
+class MemoryDatabase(StorageBackend):
+    """In-process storage backend implementing the Database interface.
+
+    Reads never leave the process. Returned records are shallow copies, so
+    callers may add or remove top-level keys freely. When a snapshot path is
+    given, data is loaded from it at startup and written back on close.
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = None):
+        super().__init__()
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._singletons: Dict[str, Optional[Dict[str, Any]]] = {
+            name: None for name in SINGLETON_COLLECTIONS
+        }
+        self._collections: Dict[str, MemoryCollection] = {
+            name: MemoryCollection(fields) for name, fields in RECORD_COLLECTIONS.items()
+        }
+        # Rate limiting state, keyed by its settings; never persisted
+        self._limiters: Dict[Tuple[float, int], TokenBucketLimiter] = {}
+        self._duplicate_filters: Dict[float, DuplicateFilter] = {}
+        if self.snapshot_path and self.snapshot_path.exists():
+            self.load_snapshot()
+
+    async def close(self):
+        """Persist a snapshot if configured"""
+        if self.snapshot_path:
+            self.save_snapshot()
+
+    async def ensure_indexes(self) -> Dict[str, List[str]]:
+        """Report the built-in indexes; nothing needs creating"""
+        existing = []
+        for name, collection in self._collections.items():
+            existing.append(f"{name}.id")
+            existing.extend(f"{name}.{field}" for field in collection.indexes)
+        return {"created": [], "existing": existing, "failed": []}
+
+    async def drop_database(self):
+        """Remove every document"""
+        for name in self._singletons:
+            self._singletons[name] = None
+        for name, fields in RECORD_COLLECTIONS.items():
+            self._collections[name] = MemoryCollection(fields)
+
+    # Snapshot persistence
+    def save_snapshot(self):
+        """Atomically write every collection to the snapshot file"""
+        data = {
+            "singletons": self._singletons,
+            "collections": {
+                name: list(collection.records.values())
+                for name, collection in self._collections.items()
+            },
+        }
+        tmp_path = self.snapshot_path.with_suffix(self.snapshot_path.suffix + ".tmp")
+        tmp_path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("w") as f:
+            json.dump(data, f, default=_encode_datetime)
+        os.replace(tmp_path, self.snapshot_path)
+        logger.info(f"Saved in-memory snapshot to {self.snapshot_path}")
+
+    def load_snapshot(self):
+        """Replace the in-memory data with the snapshot file's contents"""
+        with self.snapshot_path.open() as f:
+            data = json.load(f, object_hook=_decode_datetime)
+        for name, record in data.get("singletons", {}).items():
+            self._singletons[name] = record
+        for name, records in data.get("collections", {}).items():
+            collection = self._collections.setdefault(name, MemoryCollection())
+            for record in records:
+                collection.insert(record)
+        logger.info(f"Loaded in-memory snapshot from {self.snapshot_path}")
+
+    # Generic record helpers
+    def _list(self, collection: str, filter_query: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        records = self._collections[collection]
+        return [
+            dict(records.get(record_id))
+            for record_id in islice(records.ids(filter_query), MAX_LIST_RECORDS + 1)
+        ]
+
+    def _create(self, collection: str, data: Dict[str, Any]) -> Optional[str]:
+        data['created_at'] = datetime.utcnow()
+        data.setdefault('id', str(uuid.uuid4()))
+        if not self._collections[collection].insert(data):
+            logger.error(f"Error creating {collection} record: duplicate id {data['id']}")
+            return None
+        self._notify_change(collection, [data['id']])
+        return data['id']
+
+    def _update(self, collection: str, record_id: str, data: Dict[str, Any]) -> bool:
+        updated = self._collections[collection].update(record_id, data)
+        if updated:
+            self._notify_change(collection, [record_id])
+        return updated
+
+    def _delete(self, collection: str, record_id: str) -> bool:
+        deleted = self._collections[collection].delete(record_id)
+        if deleted:
+            self._notify_change(collection, [record_id])
+        return deleted
+
+    def _replace_singleton(self, collection: str, data: Dict[str, Any]) -> bool:
+        self._singletons[collection] = dict(data)
+        self._notify_change(collection)
+        return True
+
+    def _get_singleton(self, collection: str) -> Optional[Dict[str, Any]]:
+        record = self._singletons[collection]
+        return dict(record) if record is not None else None
+
+    # Pagination, streaming and bulk operations
+    async def get_page(
+        self,
+        collection: str,
+        limit: int,
+        after: Optional[Tuple[datetime, str]] = None,
+        filter_query: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, str]]]:
+        """Get one page of records and the keyset position of the next page"""
+        records = self._collections[collection]
+        page = []
+        for record_id in records.ids(filter_query, after):
+            page.append(dict(records.get(record_id)))
+            if len(page) > limit:
+                break
+
+        next_after = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_after = (page[-1]["created_at"], page[-1]["id"])
+        return page, next_after
+
+    async def get_records(self, collection: str, ids: List[str]) -> List[Dict[str, Any]]:
+        records = self._collections[collection]
+        return [dict(record) for record in map(records.get, ids) if record is not None]
+
+    async def iter_records(
+        self,
+        collection: str,
+        filter_query: Optional[Dict[str, Any]] = None,
+        batch_size: int = 100
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield records newest first, yielding to the event loop between batches"""
+        records = self._collections[collection]
+        for count, record_id in enumerate(list(records.ids(filter_query)), start=1):
+            record = records.get(record_id)
+            if record is not None:
+                yield dict(record)
+            if count % batch_size == 0:
+                await asyncio.sleep(0)
+
+    async def bulk_upsert(
+        self,
+        collection: str,
+        records: List[Dict[str, Any]],
+        chunk_size: int = 1000
+    ) -> Dict[str, int]:
+        """Upsert records keyed on id, preserving created_at of existing ones"""
+        counts = {"inserted": 0, "modified": 0, "matched": 0, "failed": 0}
+        target = self._collections[collection]
+        now = datetime.utcnow()
+        for record in records:
+            fields = {k: v for k, v in record.items() if k not in ('_id', 'created_at')}
+            fields.setdefault('id', str(uuid.uuid4()))
+            if target.get(fields['id']) is None:
+                target.insert({**fields, "created_at": record.get('created_at', now)})
+                counts["inserted"] += 1
+            else:
+                counts["matched"] += 1
+                if target.update(fields['id'], fields):
+                    counts["modified"] += 1
+        if counts["inserted"] or counts["modified"]:
+            self._notify_change(collection)
+        return counts
+
+    async def apply_batch(
+        self,
+        operations: List[Dict[str, Any]],
+        transaction: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Apply operations in order.
+
+        Nothing awaits between operations, so other requests never see a
+        partial batch and every batch is effectively a transaction.
+        """
+        results = []
+        # Collection -> ids written, or None for singletons
+        changed: Dict[str, Optional[List[str]]] = {}
+        for operation in operations:
+            collection, record_id = operation["collection"], operation.get("id")
+            if collection in SINGLETON_COLLECTIONS:
+                self._singletons[collection] = {**(self._singletons[collection] or {}), **operation["data"]}
+                status = "updated"
+            elif operation["op"] == "create":
+                record_id = operation["data"]["id"]
+                record = {**operation["data"], "created_at": datetime.utcnow()}
+                if not self._collections[collection].insert(record):
+                    results.append({"status": "error", "id": record_id, "error": "Duplicate id"})
+                    continue
+                status = "created"
+            elif self._collections[collection].get(record_id) is None:
+                results.append({"status": "not_found", "id": record_id})
+                continue
+            elif operation["op"] == "update":
+                self._collections[collection].update(record_id, operation["data"])
+                status = "updated"
+            else:
+                self._collections[collection].delete(record_id)
+                status = "deleted"
+            results.append({"status": status, "id": record_id})
+            if collection in SINGLETON_COLLECTIONS:
+                changed[collection] = None
+            else:
+                changed.setdefault(collection, []).append(record_id)
+        for collection, ids in changed.items():
+            self._notify_change(collection, ids)
+        return results
+
+    # Rate limiting
+    async def take_rate_limit_token(self, key: str, rate: float, burst: int) -> float:
+        limiter = self._limiters.setdefault((rate, burst), TokenBucketLimiter(rate, burst))
+        return limiter.take(key)
+
+    async def refund_rate_limit_token(self, key: str, burst: int):
+        for (_, limiter_burst), limiter in self._limiters.items():
+            if limiter_burst == burst:
+                limiter.refund(key)
+
+    async def register_content_hash(self, digest: str, window: float) -> bool:
+        duplicates = self._duplicate_filters.setdefault(window, DuplicateFilter(window))
+        return duplicates.register(digest)
+
+    async def release_content_hash(self, digest: str):
+        for duplicates in self._duplicate_filters.values():
+            duplicates.forget(digest)
+
+    # Personal Info operations
+    async def get_personal_info(self) -> Optional[Dict[str, Any]]:
+        return self._get_singleton("profiles")
+
+    async def update_personal_info(self, data: Dict[str, Any]) -> bool:
+        return self._replace_singleton("profiles", data)
+
+    # Education operations
+    async def get_all_education(self) -> List[Dict[str, Any]]:
+        return self._list("education")
+
+    async def create_education(self, data: Dict[str, Any]) -> Optional[str]:
+        return self._create("education", data)
+
+    async def update_education(self, education_id: str, data: Dict[str, Any]) -> bool:
+        return self._update("education", education_id, data)
+
+    async def delete_education(self, education_id: str) -> bool:
+        return self._delete("education", education_id)
+
+    # Experience operations
+    async def get_all_experience(self) -> List[Dict[str, Any]]:
+        return self._list("experience")
+
+    async def create_experience(self, data: Dict[str, Any]) -> Optional[str]:
+        return self._create("experience", data)
+
+    async def update_experience(self, experience_id: str, data: Dict[str, Any]) -> bool:
+        return self._update("experience", experience_id, data)
+
+    async def delete_experience(self, experience_id: str) -> bool:
+        return self._delete("experience", experience_id)
+
+    # Project operations
+    async def get_all_projects(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._list("projects", {"category": category} if category else None)
+
+    async def create_project(self, data: Dict[str, Any]) -> Optional[str]:
+        return self._create("projects", data)
+
+    async def update_project(self, project_id: str, data: Dict[str, Any]) -> bool:
+        return self._update("projects", project_id, data)
+
+    async def delete_project(self, project_id: str) -> bool:
+        return self._delete("projects", project_id)
+
+    # Skills operations
+    async def get_skills(self) -> Optional[Dict[str, Any]]:
+        return self._get_singleton("skills")
+
+    async def update_skills(self, data: Dict[str, Any]) -> bool:
+        return self._replace_singleton("skills", data)
+
+    # Certification operations
+    async def get_all_certifications(self) -> List[Dict[str, Any]]:
+        return self._list("certifications")
+
+    async def create_certification(self, data: Dict[str, Any]) -> Optional[str]:
+        return self._create("certifications", data)
+
+    async def update_certification(self, certification_id: str, data: Dict[str, Any]) -> bool:
+        return self._update("certifications", certification_id, data)
+
+    async def delete_certification(self, certification_id: str) -> bool:
+        return self._delete("certifications", certification_id)
+
+    # Award operations
+    async def get_all_awards(self) -> List[Dict[str, Any]]:
+        return self._list("awards")
+
+    async def create_award(self, data: Dict[str, Any]) -> Optional[str]:
+        return self._create("awards", data)
+
+    async def update_award(self, award_id: str, data: Dict[str, Any]) -> bool:
+        return self._update("awards", award_id, data)
+
+    async def delete_award(self, award_id: str) -> bool:
+        return self._delete("awards", award_id)
+
+    # Patent operations
+    async def get_all_patents(self) -> List[Dict[str, Any]]:
+        return self._list("patents")
+
+    async def create_patent(self, data: Dict[str, Any]) -> Optional[str]:
+        return self._create("patents", data)
+
+    async def update_patent(self, patent_id: str, data: Dict[str, Any]) -> bool:
+        return self._update("patents", patent_id, data)
+
+    async def delete_patent(self, patent_id: str) -> bool:
+        return self._delete("patents", patent_id)
+
+    # Contact operations
+    async def create_contact_submission(self, data: Dict[str, Any]) -> Optional[str]:
+        data['read'] = False
+        return self._create("contacts", data)
+
+    async def create_contact_submissions(self, records: List[Dict[str, Any]]) -> int:
+        contacts = self._collections["contacts"]
+        inserted = 0
+        for record in records:
+            record.setdefault('created_at', datetime.utcnow())
+            record.setdefault('id', str(uuid.uuid4()))
+            record.setdefault('read', False)
+            inserted += contacts.insert(record)
+        if records:
+            self._notify_change("contacts", [record['id'] for record in records])
+        return inserted
+
+    async def get_contact_submissions(self) -> List[Dict[str, Any]]:
+        return self._list("contacts")
+
+
+def _encode_datetime(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _decode_datetime(value: Dict[str, Any]) -> Any:
+    if len(value) == 1 and "$date" in value:
+        return datetime.fromisoformat(value["$date"])
+    return value
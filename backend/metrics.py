@@ -0,0 +1,242 @@
+"""
+In-process Prometheus metrics: request and storage latency histograms plus scrape-time gauges
+"""
+import functools
+import inspect
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Upper bounds in seconds, from sub-millisecond cache hits to slow queries
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[str, ...]
+Sample = Tuple[Dict[str, str], float]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with a fixed set of label names"""
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """Histogram with fixed buckets; observations cost one bisect and three adds"""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[Labels, list] = {}
+
+    def observe(self, labels: Labels, value: float):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{_format_labels(self.labelnames + ('le',), labels + (le,))} {cumulative}"
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {total}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Metrics recorded as they happen plus collectors read at scrape time"""
+
+    def __init__(self):
+        self.metrics: List[Any] = []
+        # Each collector returns (name, type, help, samples)
+        self.collectors: List[Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]):
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            for name, kind, help_text, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels.keys(), labels.values())} {value}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by method, route template and status",
+    ("method", "route", "status")
+))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by method, route template and status",
+    ("method", "route", "status")
+))
+STORAGE_LATENCY = REGISTRY.register(Histogram(
+    "storage_operation_duration_seconds", "Storage backend call latency by method and collection",
+    ("method", "collection")
+))
+STORAGE_ERRORS = REGISTRY.register(Counter(
+    "storage_operation_errors_total", "Storage backend calls that raised, by method and collection",
+    ("method", "collection")
+))
+
+
+class MetricsMiddleware:
+    """Counts and times every HTTP request under its route template"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the scope; unmatched paths
+            # share one label so arbitrary URLs cannot blow up cardinality
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", "unmatched"), status)
+            HTTP_REQUESTS.inc(labels)
+            HTTP_LATENCY.observe(labels, time.perf_counter() - start)
+
+
+# Collections of the named StorageBackend methods that do not take one as an argument
+METHOD_COLLECTIONS = {
+    "personal_info": "profiles",
+    "skills": "skills",
+    "education": "education",
+    "experience": "experience",
+    "projects": "projects",
+    "project": "projects",
+    "certifications": "certifications",
+    "certification": "certifications",
+    "awards": "awards",
+    "award": "awards",
+    "patents": "patents",
+    "patent": "patents",
+    "contact_submission": "contacts",
+    "contact_submissions": "contacts",
+    "rate_limit_token": "rate_limits",
+    "content_hash": "contact_hashes",
+}
+
+
+def _method_collection(name: str) -> str:
+    for prefix in ("get_all_", "get_", "create_", "update_", "delete_", "take_", "refund_", "register_", "release_"):
+        if name.startswith(prefix):
+            return METHOD_COLLECTIONS.get(name[len(prefix):], "-")
+    return "-"
+
+
+# Callbacks receiving (method, collection, start, duration) for every storage call
+_storage_observers: List[Callable[[str, str, float, float], None]] = []
+
+
+def add_storage_observer(observer: Callable[[str, str, float, float], None]):
+    """Register a callback run after every instrumented storage call"""
+    _storage_observers.append(observer)
+
+
+def _timed(method: Callable, name: str, default_collection: str, takes_collection: bool):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        collection = default_collection
+        if takes_collection:
+            collection = kwargs.get("collection", args[0] if args else "-")
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        except Exception:
+            STORAGE_ERRORS.inc((name, collection))
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            STORAGE_LATENCY.observe((name, collection), duration)
+            for observer in _storage_observers:
+                observer(name, collection, start, duration)
+    return wrapper
+
+
+def instrument_storage(db, skip: Tuple[str, ...] = ("close",)):
+    """Time every coroutine method of a storage backend instance.
+
+    Methods are wrapped on the instance, so other instances (benchmarks,
+    tools) stay uninstrumented.
+    """
+    for name, member in inspect.getmembers(type(db), inspect.iscoroutinefunction):
+        if name.startswith("_") or name in skip:
+            continue
+        parameters = list(inspect.signature(member).parameters)
+        takes_collection = len(parameters) > 1 and parameters[1] == "collection"
+        setattr(db, name, _timed(getattr(db, name), name, _method_collection(name), takes_collection))
+    return db
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
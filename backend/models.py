@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 from datetime import datetime
 import uuid
 
@@ -215,4 +215,39 @@ class ContactResponse(BaseModel):
 class ApiResponse(BaseModel):
     success: bool
     message: str
-    data: Optional[dict] = None
\ No newline at end of file
+    data: Optional[dict] = None
+
+# Batch Models
+class BatchOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    collection: str
+    id: Optional[str] = None
+    data: Optional[dict] = None
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=1000)
+    transaction: bool = False
+
+class BatchResult(BaseModel):
+    index: int
+    op: str
+    collection: str
+    status: str
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    success: bool
+    counts: Dict[str, int]
+    results: List[BatchResult]
+
+# Aggregated Portfolio Model
+class PortfolioData(BaseModel):
+    profile: Optional[PersonalInfo] = None
+    education: Optional[List[EducationRecord]] = None
+    experience: Optional[List[ExperienceRecord]] = None
+    projects: Optional[List[ProjectRecord]] = None
+    skills: Optional[SkillsData] = None
+    certifications: Optional[List[CertificationRecord]] = None
+    awards: Optional[List[AwardRecord]] = None
+    patents: Optional[List[PatentRecord]] = None
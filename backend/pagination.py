@@ -0,0 +1,72 @@
+"""
+Keyset pagination cursors and NDJSON streaming for list routes
+"""
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from responses import dumps
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def page_position(record: Dict[str, Any]) -> Tuple[datetime, str]:
+    """Keyset position of a record; records without created_at sort last"""
+    return record.get("created_at") or datetime.min, record["id"]
+
+
+def encode_cursor(position: Tuple[datetime, str]) -> str:
+    """Encode a (created_at, id) keyset position as an opaque token"""
+    created_at, record_id = position
+    payload = json.dumps({"t": created_at.isoformat(), "id": record_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, str]:
+    """Decode a cursor token, raising a 400 error when it is malformed"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), payload["id"]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def strip_id(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Remove the MongoDB _id field from a record"""
+    record.pop('_id', None)
+    return record
+
+
+async def _ndjson_lines(
+    records: AsyncIterator[Dict[str, Any]],
+    encode: Callable[[Any], bytes]
+) -> AsyncIterator[bytes]:
+    try:
+        async for record in records:
+            yield encode(strip_id(record)) + b"\n"
+    except Exception as e:
+        # The status line has already been sent, so the stream just ends early
+        logger.error(f"Error streaming records: {e}")
+
+
+def ndjson_response(
+    records: AsyncIterator[Dict[str, Any]],
+    encode: Callable[[Any], bytes] = dumps,
+    headers: Optional[Dict[str, str]] = None
+) -> StreamingResponse:
+    """Stream records as newline-delimited JSON without materializing them"""
+    return StreamingResponse(
+        _ndjson_lines(records, encode),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=headers
+    )
@@ -0,0 +1,157 @@
+"""
+Opt-in per-request profiling with a bounded buffer of recent profiles
+"""
+import cProfile
+import hmac
+import io
+import logging
+import os
+import pstats
+import random
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import parse_qs
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from metrics import add_storage_observer
+
+logger = logging.getLogger(__name__)
+
+# Requests are profiled when they send PROFILE_TOKEN in the header or query
+# parameter, or at random at PROFILE_SAMPLE_RATE
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+# Without a token, clients cannot trigger profiling and the admin endpoints are disabled
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN', '')
+PROFILE_BUFFER_SIZE = int(os.environ.get('PROFILE_BUFFER_SIZE', '50'))
+# Functions listed per profile, by cumulative time
+PROFILE_TOP_FUNCTIONS = int(os.environ.get('PROFILE_TOP_FUNCTIONS', '40'))
+
+_current: ContextVar[Optional[Dict[str, Any]]] = ContextVar("current_profile", default=None)
+
+
+def _record_storage_call(method: str, collection: str, start: float, duration: float):
+    profile = _current.get()
+    if profile is not None:
+        profile["storage_calls"].append({
+            "method": method,
+            "collection": collection,
+            "offset_ms": round((start - profile["_start"]) * 1000, 3),
+            "duration_ms": round(duration * 1000, 3),
+        })
+
+
+add_storage_observer(_record_storage_call)
+
+
+def token_matches(value: Optional[str]) -> bool:
+    """Check a trigger or admin token against PROFILE_TOKEN; always False when it is unset"""
+    return bool(PROFILE_TOKEN) and hmac.compare_digest(value or "", PROFILE_TOKEN)
+
+
+class ProfileBuffer:
+    """Ring buffer holding the most recent request profiles"""
+
+    def __init__(self, size: int = PROFILE_BUFFER_SIZE):
+        self._profiles: Deque[Dict[str, Any]] = deque(maxlen=size)
+
+    def add(self, profile: Dict[str, Any]):
+        self._profiles.append(profile)
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        """Newest first, without the call statistics"""
+        return [
+            {key: value for key, value in profile.items() if key not in ("cpu_profile", "storage_calls")}
+            for profile in reversed(self._profiles)
+        ]
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        for profile in self._profiles:
+            if profile["id"] == profile_id:
+                return profile
+        return None
+
+
+class ProfilerMiddleware:
+    """Profiles opted-in or sampled requests and keeps the results in a buffer.
+
+    cProfile can only trace one request at a time per thread and also sees
+    other requests interleaved on the event loop, so concurrent profiled
+    requests after the first record storage timings only.
+    """
+
+    def __init__(self, app: ASGIApp, buffer: ProfileBuffer, sample_rate: float = PROFILE_SAMPLE_RATE):
+        self.app = app
+        self.buffer = buffer
+        if sample_rate > 0 and not PROFILE_TOKEN:
+            # Sampled profiles could only be read through the token-protected endpoints
+            logger.warning("PROFILE_SAMPLE_RATE is set without PROFILE_TOKEN; request sampling is disabled")
+            sample_rate = 0.0
+        self.sample_rate = sample_rate
+        self._profiler_busy = False
+
+    def _wanted(self, scope: Scope) -> bool:
+        if token_matches(Headers(scope=scope).get(PROFILE_HEADER)):
+            return True
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        if token_matches((query.get(PROFILE_QUERY_PARAM) or [None])[0]):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile: Dict[str, Any] = {
+            "id": uuid.uuid4().hex[:12],
+            "method": scope["method"],
+            "path": scope["path"],
+            "query": scope.get("query_string", b"").decode("latin-1"),
+            "started_at": datetime.utcnow().isoformat(),
+            "status": None,
+            "storage_calls": [],
+            "_start": time.perf_counter(),
+        }
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                profile["status"] = message["status"]
+                message.setdefault("headers", []).append((b"x-profile-id", profile["id"].encode()))
+            await send(message)
+
+        profiler = None
+        if not self._profiler_busy:
+            self._profiler_busy = True
+            profiler = cProfile.Profile()
+        token = _current.set(profile)
+        try:
+            if profiler is not None:
+                profiler.enable()
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self._profiler_busy = False
+            _current.reset(token)
+            self._finish(profile, profiler)
+
+    def _finish(self, profile: Dict[str, Any], profiler: Optional[cProfile.Profile]):
+        start = profile.pop("_start")
+        profile["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        profile["storage_call_count"] = len(profile["storage_calls"])
+        profile["storage_ms"] = round(sum(call["duration_ms"] for call in profile["storage_calls"]), 3)
+        profile["cpu_profile"] = None
+        if profiler is not None:
+            output = io.StringIO()
+            stats = pstats.Stats(profiler, stream=output)
+            stats.sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+            profile["cpu_profile"] = output.getvalue()
+        self.buffer.add(profile)
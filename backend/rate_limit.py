@@ -0,0 +1,189 @@
+"""
+Token-bucket rate limiting and duplicate suppression for the contact form
+"""
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+# Submissions allowed in a burst per client IP and per email address,
+# refilled at one token every CONTACT_RATE_LIMIT_REFILL_SECONDS
+CONTACT_RATE_LIMIT_BURST = int(os.environ.get('CONTACT_RATE_LIMIT_BURST', '5'))
+CONTACT_RATE_LIMIT_REFILL_SECONDS = float(os.environ.get('CONTACT_RATE_LIMIT_REFILL_SECONDS', '60'))
+# Identical submissions are rejected for this long after the first one
+CONTACT_DEDUP_WINDOW_SECONDS = float(os.environ.get('CONTACT_DEDUP_WINDOW_SECONDS', '3600'))
+# "memory" keeps state per worker; "shared" keeps it in the storage backend
+RATE_LIMIT_STORE = os.environ.get('RATE_LIMIT_STORE', 'memory').lower()
+# Only trust X-Forwarded-For when running behind a known proxy
+RATE_LIMIT_TRUST_FORWARDED = os.environ.get('RATE_LIMIT_TRUST_FORWARDED', 'false').lower() == 'true'
+# Upper bound on tracked keys and hashes per worker
+RATE_LIMIT_MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', '100000'))
+
+
+class TokenBucketLimiter:
+    """In-process token buckets keyed by an arbitrary string.
+
+    Buckets idle long enough to have refilled are indistinguishable from new
+    ones, so the least recently used bucket is evicted when max_keys is hit.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def take(self, key: str, now: Optional[float] = None) -> float:
+        """Take a token, returning 0 or the seconds until one is available"""
+        now = time.monotonic() if now is None else now
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    def refund(self, key: str):
+        """Give back a token taken for a request that was not served"""
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            self._buckets[key] = (min(self.burst, bucket[0] + 1), bucket[1])
+
+
+class DuplicateFilter:
+    """In-process record of content hashes seen within a sliding window"""
+
+    def __init__(self, window: float, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.window = window
+        self.max_keys = max_keys
+        # Insertion order is expiry order since every entry gets the same window
+        self._expires: "OrderedDict[str, float]" = OrderedDict()
+
+    def register(self, digest: str, now: Optional[float] = None) -> bool:
+        """Record a hash, returning False when it was already seen in the window"""
+        now = time.monotonic() if now is None else now
+        while self._expires:
+            oldest, expires_at = next(iter(self._expires.items()))
+            if expires_at > now and len(self._expires) < self.max_keys:
+                break
+            del self._expires[oldest]
+        if digest in self._expires:
+            return False
+        self._expires[digest] = now + self.window
+        return True
+
+    def forget(self, digest: str):
+        """Drop a hash so the same content can be submitted again"""
+        self._expires.pop(digest, None)
+
+
+def content_hash(data: Dict[str, str]) -> str:
+    """Hash a submission's sender and text, ignoring case and whitespace changes"""
+    parts = [
+        re.sub(r"\s+", " ", str(data.get(field, ""))).strip().lower()
+        for field in ("email", "subject", "message")
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def client_ip(request: Request) -> str:
+    """Get the client address, from X-Forwarded-For when the proxy is trusted"""
+    if RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class ContactGuard:
+    """Rejects over-limit and duplicate contact submissions before they are stored.
+
+    limit() spends the sender's rate-limit tokens and record() reserves the
+    content hash, so concurrent duplicates cannot both get through. If the
+    submission then cannot be stored, release() refunds the tokens and drops
+    the hash, so the client's retry is not rejected as a duplicate.
+
+    In shared mode the buckets and hashes live in the storage backend, so the
+    limits hold across workers; otherwise each worker enforces them alone.
+    """
+
+    def __init__(
+        self,
+        db=None,
+        burst: int = CONTACT_RATE_LIMIT_BURST,
+        refill_seconds: float = CONTACT_RATE_LIMIT_REFILL_SECONDS,
+        dedup_window: float = CONTACT_DEDUP_WINDOW_SECONDS,
+        store: str = RATE_LIMIT_STORE
+    ):
+        if store not in ("memory", "shared"):
+            raise ValueError(f"Unknown RATE_LIMIT_STORE: {store}")
+        self.db = db
+        self.shared = store == "shared"
+        self.rate = 1 / refill_seconds
+        self.burst = burst
+        self.dedup_window = dedup_window
+        self.limiter = TokenBucketLimiter(self.rate, burst)
+        self.duplicates = DuplicateFilter(dedup_window)
+        self.rate_limited = 0
+        self.duplicated = 0
+
+    async def _take(self, key: str) -> float:
+        if self.shared:
+            return await self.db.take_rate_limit_token(key, self.rate, self.burst)
+        return self.limiter.take(key)
+
+    async def _register(self, digest: str) -> bool:
+        if self.shared:
+            return await self.db.register_content_hash(digest, self.dedup_window)
+        return self.duplicates.register(digest)
+
+    async def limit(self, request: Request, data: Dict[str, str]) -> List[str]:
+        """Take a token per client IP and per email, raising a 429 when either is exhausted.
+
+        Returns the keys tokens were taken from, for release().
+        """
+        taken = []
+        for key in (f"ip:{client_ip(request)}", f"email:{str(data.get('email', '')).lower()}"):
+            retry_after = await self._take(key)
+            if retry_after:
+                self.rate_limited += 1
+                await self.release(taken)
+                raise HTTPException(
+                    status_code=429,
+                    detail="Too many submissions, please try again later",
+                    headers={"Retry-After": str(max(1, round(retry_after)))}
+                )
+            taken.append(key)
+        return taken
+
+    async def record(self, digest: str):
+        """Reserve a content hash, raising a 409 when it was submitted within the window"""
+        if not await self._register(digest):
+            self.duplicated += 1
+            raise HTTPException(status_code=409, detail="This message has already been submitted")
+
+    async def release(self, keys: List[str], digest: Optional[str] = None):
+        """Undo limit() and record() for a submission that was not stored"""
+        for key in keys:
+            if self.shared:
+                await self.db.refund_rate_limit_token(key, self.burst)
+            else:
+                self.limiter.refund(key)
+        if digest is not None:
+            if self.shared:
+                await self.db.release_content_hash(digest)
+            else:
+                self.duplicates.forget(digest)
+
+    def stats(self) -> Dict[str, int]:
+        return {"rate_limited": self.rate_limited, "duplicates": self.duplicated}
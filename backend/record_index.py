@@ -0,0 +1,135 @@
+"""
+Base class for in-memory indexes that mirror collections of the storage backend
+"""
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+DocKey = Tuple[str, str]
+
+
+class RecordIndex(ABC):
+    """Keeps a copy of some collections' records and derived lookup structures.
+
+    Built once from the storage backend, then kept current by re-reading the
+    records each write names, or the whole collection when a write does not
+    say which records it touched (remote changes, imports, singletons), and
+    reindexing only the records that were added, changed or removed.
+    Subclasses maintain their structures in _index and _unindex.
+    """
+
+    def __init__(self, collections: Iterable[str]):
+        self.collections = list(collections)
+        self.db: Optional[StorageBackend] = None
+        self._records: Dict[DocKey, Dict[str, Any]] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        # Collection -> ids written since its refresh last started, or None to reload it all
+        self._pending: Dict[str, Optional[Set[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @abstractmethod
+    def _index(self, key: DocKey, record: Dict[str, Any]):
+        """Add a record to the derived lookup structures"""
+
+    @abstractmethod
+    def _unindex(self, key: DocKey, record: Dict[str, Any]):
+        """Remove a record previously passed to _index from the lookup structures"""
+
+    # Maintenance
+    def add(self, collection: str, record: Dict[str, Any]):
+        """Index a record, replacing any previous version of it"""
+        self.remove(collection, record["id"])
+        key = (collection, record["id"])
+        self._index(key, record)
+        self._records[key] = record
+
+    def remove(self, collection: str, record_id: str):
+        """Drop a record from the index if it is present"""
+        record = self._records.pop((collection, record_id), None)
+        if record is not None:
+            self._unindex((collection, record_id), record)
+
+    def sync(self, collection: str, records: Iterable[Dict[str, Any]]) -> int:
+        """Reindex a collection from a full read, touching only changed records"""
+        seen = set()
+        changed = 0
+        for record in records:
+            record.pop("_id", None)
+            if "id" not in record:
+                continue
+            seen.add(record["id"])
+            if self._records.get((collection, record["id"])) != record:
+                self.add(collection, record)
+                changed += 1
+        for name, record_id in [key for key in self._records if key[0] == collection]:
+            if record_id not in seen:
+                self.remove(collection, record_id)
+                changed += 1
+        return changed
+
+    async def load(self, db: StorageBackend, collection: str) -> int:
+        records = [record async for record in db.iter_records(collection)]
+        return self.sync(collection, records)
+
+    async def load_records(self, db: StorageBackend, collection: str, ids: Iterable[str]) -> int:
+        """Reindex only the given records, dropping those that no longer exist"""
+        ids = list(ids)
+        found = {record["id"]: record for record in await db.get_records(collection, ids)}
+        changed = 0
+        for record_id in ids:
+            record = found.get(record_id)
+            if record is None:
+                if (collection, record_id) in self._records:
+                    self.remove(collection, record_id)
+                    changed += 1
+                continue
+            record.pop("_id", None)
+            if self._records.get((collection, record_id)) != record:
+                self.add(collection, record)
+                changed += 1
+        return changed
+
+    async def build(self, db: StorageBackend):
+        """Index every mirrored collection and follow later writes"""
+        self.db = db
+        for collection in self.collections:
+            await self.load(db, collection)
+        db.add_change_listener(self.on_change)
+
+    def on_change(self, collection: str, ids: Optional[List[str]] = None):
+        """Change listener that schedules a refresh of the written records"""
+        if collection not in self.collections or self.db is None:
+            return
+        if ids is None or self._pending.get(collection, ()) is None:
+            self._pending[collection] = None
+        else:
+            self._pending.setdefault(collection, set()).update(ids)
+        # A running refresh picks up writes made while it reads
+        if collection not in self._refreshing:
+            self._refreshing[collection] = asyncio.get_running_loop().create_task(self._refresh(collection))
+
+    async def _refresh(self, collection: str):
+        try:
+            while collection in self._pending:
+                ids = self._pending.pop(collection)
+                try:
+                    if ids is None:
+                        await self.load(self.db, collection)
+                    else:
+                        await self.load_records(self.db, collection, ids)
+                except Exception as e:
+                    logger.error(f"Error refreshing {type(self).__name__} for {collection}: {e}")
+        finally:
+            del self._refreshing[collection]
+
+    async def wait_idle(self):
+        """Wait for scheduled refreshes, so answers include every finished write"""
+        while self._refreshing:
+            await asyncio.gather(*self._refreshing.values(), return_exceptions=True)
@@ -0,0 +1,64 @@
+"""
+Fast JSON encoding and response classes for the read routes
+"""
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as compact JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def model_encoder(model_type: Any) -> Callable[[Any], bytes]:
+    """Build an encoder that validates content against model_type once and dumps it.
+
+    Both steps run in pydantic-core, and validation fills model defaults for
+    documents stored before a field existed.
+    """
+    adapter = TypeAdapter(model_type)
+    return lambda content: adapter.dump_json(adapter.validate_python(content))
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with dumps() instead of the stdlib encoder"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class RawJSONResponse(Response):
+    """Response for a body that has already been encoded as JSON"""
+    media_type = "application/json"
+
+
+def inherited_headers(response: Response) -> Dict[str, str]:
+    """Headers a route set on its injected response, to copy onto a returned one"""
+    return {
+        name: value for name, value in response.headers.items()
+        if name != "content-length"
+    }
+
+
+def json_body_response(body: bytes, response: Optional[Response] = None) -> RawJSONResponse:
+    """Return pre-encoded JSON, keeping headers set on the injected response"""
+    headers = inherited_headers(response) if response is not None else None
+    return RawJSONResponse(content=body, headers=headers)
@@ -1,5 +1,8 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from pydantic import ValidationError
+from typing import Any, Dict, List, Optional, Tuple
+from collections import Counter
+import asyncio
 import logging
 
 from models import (
@@ -11,41 +14,211 @@ from models import (
     CertificationRecord, CertificationRecordCreate, CertificationRecordUpdate,
     AwardRecord, AwardRecordCreate, AwardRecordUpdate,
     PatentRecord, PatentRecordCreate, PatentRecordUpdate,
-    ContactSubmissionCreate, ContactResponse, ApiResponse
+    ContactSubmission, ContactSubmissionCreate, ContactResponse, ApiResponse,
+    BatchOperation, BatchRequest, BatchResponse,
+    PortfolioData
 )
 from database import Database
+from cache import PortfolioCache
+from http_cache import body_response, conditional_response, etag_memo
+from pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE,
+    encode_cursor, decode_cursor, ndjson_response, page_position
+)
+from responses import (
+    FastJSONResponse, dumps, model_encoder, inherited_headers
+)
+from rate_limit import ContactGuard, content_hash
+from storage import APPLIED_STATUSES, MAX_LIST_RECORDS
+from search import SEARCH_FIELDS
+from facets import technology_key
 
 logger = logging.getLogger(__name__)
 
 # Initialize database instance - will be set in main app
 db = None
 
+# Write-behind buffer for contact submissions; written directly when unset
+contact_writer = None
+
+# Rate limiter and duplicate filter for contact submissions, set with the database
+contact_guard = None
+
+# In-memory full-text index, built at startup
+search_index = None
+
+# In-memory category/technology facets over projects, built at startup
+project_facets = None
+
+# Read-through cache for the public GET routes, invalidated on every write
+cache = PortfolioCache()
+
 def get_db():
     """Get database instance"""
     return db
 
 def set_db(database):
     """Set database instance"""
-    global db
+    global db, contact_guard
     db = database
+    contact_guard = ContactGuard(database)
+    cache.invalidate()
+    etag_memo.clear()
+    database.add_change_listener(invalidate_cache)
+
+def set_contact_writer(writer):
+    """Set the write-behind buffer used by the contact form"""
+    global contact_writer
+    contact_writer = writer
+
+def set_search_index(index):
+    """Set the search index used by /search"""
+    global search_index
+    search_index = index
+
+def set_project_facets(facets):
+    """Set the project facets used by /projects/facets and technology filters"""
+    global project_facets
+    project_facets = facets
+
+# Pseudo-collection holding encoded /portfolio bodies, dropped on any write
+PORTFOLIO_CACHE = "portfolio"
+
+def invalidate_cache(collection: str, ids: Optional[List[str]] = None):
+    """Drop cached reads of a collection, and of the aggregated portfolio when it includes it"""
+    cache.invalidate(collection)
+    if collection in PORTFOLIO_COLLECTIONS:
+        cache.invalidate(PORTFOLIO_CACHE)
+
+# Response model of each collection's records, used to validate reads once
+RECORD_MODELS = {
+    "education": EducationRecord,
+    "experience": ExperienceRecord,
+    "projects": ProjectRecord,
+    "certifications": CertificationRecord,
+    "awards": AwardRecord,
+    "patents": PatentRecord,
+}
+
+# Encoders for whole responses and for single streamed records
+BODY_ENCODERS = {
+    "profiles": model_encoder(PersonalInfo),
+    "skills": model_encoder(SkillsData),
+    **{name: model_encoder(List[model]) for name, model in RECORD_MODELS.items()},
+}
+RECORD_ENCODERS = {name: model_encoder(model) for name, model in RECORD_MODELS.items()}
+
+async def cached_page(collection: str, key, loader) -> Optional[Tuple[bytes, Optional[str]]]:
+    """Get the JSON body for a cached read, validated and encoded once per content version.
+
+    Lists longer than MAX_LIST_RECORDS are cut, and the cursor of the page
+    after the cut is returned with the body. Only the encoded body and the
+    cursor are cached; the loaded records are dropped once encoded. Returns
+    None when the loader finds nothing.
+    """
+    async def render():
+        records = await loader()
+        if not records:
+            return None
+        next_cursor = None
+        if isinstance(records, list) and len(records) > MAX_LIST_RECORDS:
+            records = records[:MAX_LIST_RECORDS]
+            next_cursor = encode_cursor(page_position(records[-1]))
+        return BODY_ENCODERS[collection](records), next_cursor
+    return await cache.get_or_load(collection, key, render)
+
+async def cached_json(collection: str, key, loader, response: Optional[Response] = None) -> Optional[bytes]:
+    """Get the cached JSON body of a read (see cached_page).
+
+    When the list was cut, X-Next-Cursor on the response points at the rest.
+    """
+    page = await cached_page(collection, key, loader)
+    if page is None:
+        return None
+    body, next_cursor = page
+    if next_cursor and response is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return body
+
+async def list_records(
+    request: Request,
+    response: Response,
+    collection: str,
+    limit: Optional[int],
+    after: Optional[str],
+    stream: bool,
+    filter_query: Optional[dict] = None
+):
+    """Serve one keyset page of a collection, or stream all of it as NDJSON"""
+    if stream:
+        return ndjson_response(
+            db.iter_records(collection, filter_query),
+            RECORD_ENCODERS.get(collection, dumps),
+            inherited_headers(response)
+        )
+
+    records, next_after = await db.get_page(
+        collection,
+        limit or DEFAULT_PAGE_SIZE,
+        decode_cursor(after) if after else None,
+        filter_query
+    )
+    if next_after:
+        response.headers["X-Next-Cursor"] = encode_cursor(next_after)
+    return body_response(request, response, BODY_ENCODERS.get(collection, dumps)(records))
+
+async def _iterate(records: List[dict]):
+    for record in records:
+        yield dict(record)
+
+def list_indexed_records(
+    request: Request,
+    response: Response,
+    collection: str,
+    records: List[dict],
+    limit: Optional[int],
+    after: Optional[str],
+    stream: bool
+):
+    """Serve a page or NDJSON stream of records already sorted newest first"""
+    if stream:
+        return ndjson_response(
+            _iterate(records),
+            RECORD_ENCODERS.get(collection, dumps),
+            inherited_headers(response)
+        )
+
+    if after:
+        position = decode_cursor(after)
+        records = [
+            record for record in records
+            if page_position(record) < position
+        ]
+    limit = limit or DEFAULT_PAGE_SIZE
+    if len(records) > limit:
+        last = records[limit - 1]
+        response.headers["X-Next-Cursor"] = encode_cursor(page_position(last))
+    return body_response(request, response, BODY_ENCODERS.get(collection, dumps)(records[:limit]))
 
 # Create router
-router = APIRouter(prefix="/api")
+router = APIRouter(prefix="/api", default_response_class=FastJSONResponse)
 
 # Personal Profile Routes
 @router.get("/profile", response_model=PersonalInfo)
-async def get_profile():
+async def get_profile(request: Request, response: Response):
     """Get personal information"""
     try:
-        profile = await db.get_personal_info()
-        if not profile:
+        not_modified = conditional_response(request, response, db, ["profiles"])
+        if not_modified is not None:
+            return not_modified
+
+        body = await cached_json("profiles", None, db.get_personal_info)
+        if body is None:
             raise HTTPException(status_code=404, detail="Profile not found")
         
-        # Remove MongoDB _id field
-        if '_id' in profile:
-            del profile['_id']
-            
-        return PersonalInfo(**profile)
+        return body_response(request, response, body)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting profile: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -74,16 +247,28 @@ async def update_profile(profile_data: PersonalInfoUpdate):
 
 # Education Routes
 @router.get("/education", response_model=List[EducationRecord])
-async def get_education():
+async def get_education(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    stream: bool = Query(False)
+):
     """Get all education records"""
     try:
-        education_records = await db.get_all_education()
-        # Remove MongoDB _id field from each record
-        for record in education_records:
-            if '_id' in record:
-                del record['_id']
-        
-        return [EducationRecord(**record) for record in education_records]
+        not_modified = conditional_response(request, response, db, ["education"])
+        if not_modified is not None:
+            return not_modified
+
+        if limit or after or stream:
+            return await list_records(
+                request, response, "education", limit, after, stream
+            )
+
+        body = await cached_json("education", None, db.get_all_education, response)
+        return body_response(request, response, body or b"[]")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting education records: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -144,16 +329,28 @@ async def delete_education(education_id: str):
 
 # Experience Routes
 @router.get("/experience", response_model=List[ExperienceRecord])
-async def get_experience():
+async def get_experience(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    stream: bool = Query(False)
+):
     """Get all experience records"""
     try:
-        experience_records = await db.get_all_experience()
-        # Remove MongoDB _id field from each record
-        for record in experience_records:
-            if '_id' in record:
-                del record['_id']
-        
-        return [ExperienceRecord(**record) for record in experience_records]
+        not_modified = conditional_response(request, response, db, ["experience"])
+        if not_modified is not None:
+            return not_modified
+
+        if limit or after or stream:
+            return await list_records(
+                request, response, "experience", limit, after, stream
+            )
+
+        body = await cached_json("experience", None, db.get_all_experience, response)
+        return body_response(request, response, body or b"[]")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting experience records: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -213,17 +410,71 @@ async def delete_experience(experience_id: str):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 # Project Routes
+@router.get("/projects/facets")
+async def get_project_facets(request: Request, response: Response):
+    """Get project counts per category and per technology"""
+    if project_facets is None:
+        raise HTTPException(status_code=503, detail="Project facets are not ready")
+    try:
+        not_modified = conditional_response(request, response, db, ["projects"])
+        if not_modified is not None:
+            return not_modified
+
+        async def render():
+            await project_facets.wait_idle()
+            return dumps(project_facets.counts())
+
+        body = await cache.get_or_load("projects", ("facets",), render)
+        return body_response(request, response, body)
+    except Exception as e:
+        logger.error(f"Error getting project facets: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.get("/projects", response_model=List[ProjectRecord])
-async def get_projects(category: Optional[str] = Query(None)):
-    """Get all projects, optionally filtered by category"""
+async def get_projects(
+    request: Request,
+    response: Response,
+    category: Optional[str] = Query(None),
+    technology: Optional[List[str]] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    stream: bool = Query(False)
+):
+    """Get all projects, optionally filtered by category and by every given technology"""
     try:
-        projects = await db.get_all_projects(category)
-        # Remove MongoDB _id field from each record
-        for record in projects:
-            if '_id' in record:
-                del record['_id']
-        
-        return [ProjectRecord(**record) for record in projects]
+        not_modified = conditional_response(request, response, db, ["projects"])
+        if not_modified is not None:
+            return not_modified
+
+        if technology:
+            if project_facets is None:
+                raise HTTPException(status_code=503, detail="Project facets are not ready")
+            # Answered from the facet index instead of scanning technologies
+            await project_facets.wait_idle()
+            if limit or after or stream:
+                return list_indexed_records(
+                    request, response, "projects",
+                    project_facets.filter(technology, category),
+                    limit, after, stream
+                )
+
+            async def load():
+                return project_facets.filter(technology, category)[:MAX_LIST_RECORDS + 1]
+
+            key = ("technology", category, tuple(sorted({technology_key(name) for name in technology})))
+            body = await cached_json("projects", key, load, response)
+            return body_response(request, response, body or b"[]")
+
+        if limit or after or stream:
+            return await list_records(
+                request, response, "projects", limit, after, stream,
+                {"category": category} if category else None
+            )
+
+        body = await cached_json("projects", category, lambda: db.get_all_projects(category), response)
+        return body_response(request, response, body or b"[]")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting projects: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -284,18 +535,18 @@ async def delete_project(project_id: str):
 
 # Skills Routes
 @router.get("/skills", response_model=SkillsData)
-async def get_skills():
+async def get_skills(request: Request, response: Response):
     """Get skills data"""
     try:
-        skills = await db.get_skills()
-        if not skills:
+        not_modified = conditional_response(request, response, db, ["skills"])
+        if not_modified is not None:
+            return not_modified
+
+        body = await cached_json("skills", None, db.get_skills)
+        if body is None:
             raise HTTPException(status_code=404, detail="Skills data not found")
         
-        # Remove MongoDB _id field
-        if '_id' in skills:
-            del skills['_id']
-            
-        return SkillsData(**skills)
+        return body_response(request, response, body)
     except HTTPException:
         raise
     except Exception as e:
@@ -325,16 +576,28 @@ async def update_skills(skills_data: SkillsDataUpdate):
 
 # Certification Routes
 @router.get("/certifications", response_model=List[CertificationRecord])
-async def get_certifications():
+async def get_certifications(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    stream: bool = Query(False)
+):
     """Get all certifications"""
     try:
-        certifications = await db.get_all_certifications()
-        # Remove MongoDB _id field from each record
-        for record in certifications:
-            if '_id' in record:
-                del record['_id']
-        
-        return [CertificationRecord(**record) for record in certifications]
+        not_modified = conditional_response(request, response, db, ["certifications"])
+        if not_modified is not None:
+            return not_modified
+
+        if limit or after or stream:
+            return await list_records(
+                request, response, "certifications", limit, after, stream
+            )
+
+        body = await cached_json("certifications", None, db.get_all_certifications, response)
+        return body_response(request, response, body or b"[]")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting certifications: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -358,16 +621,28 @@ async def create_certification(certification_data: CertificationRecordCreate):
 
 # Award Routes
 @router.get("/awards", response_model=List[AwardRecord])
-async def get_awards():
+async def get_awards(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    stream: bool = Query(False)
+):
     """Get all awards"""
     try:
-        awards = await db.get_all_awards()
-        # Remove MongoDB _id field from each record
-        for record in awards:
-            if '_id' in record:
-                del record['_id']
-        
-        return [AwardRecord(**record) for record in awards]
+        not_modified = conditional_response(request, response, db, ["awards"])
+        if not_modified is not None:
+            return not_modified
+
+        if limit or after or stream:
+            return await list_records(
+                request, response, "awards", limit, after, stream
+            )
+
+        body = await cached_json("awards", None, db.get_all_awards, response)
+        return body_response(request, response, body or b"[]")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting awards: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -391,16 +666,28 @@ async def create_award(award_data: AwardRecordCreate):
 
 # Patent Routes
 @router.get("/patents", response_model=List[PatentRecord])
-async def get_patents():
+async def get_patents(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    stream: bool = Query(False)
+):
     """Get all patents"""
     try:
-        patents = await db.get_all_patents()
-        # Remove MongoDB _id field from each record
-        for record in patents:
-            if '_id' in record:
-                del record['_id']
-        
-        return [PatentRecord(**record) for record in patents]
+        not_modified = conditional_response(request, response, db, ["patents"])
+        if not_modified is not None:
+            return not_modified
+
+        if limit or after or stream:
+            return await list_records(
+                request, response, "patents", limit, after, stream
+            )
+
+        body = await cached_json("patents", None, db.get_all_patents, response)
+        return body_response(request, response, body or b"[]")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting patents: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -422,37 +709,240 @@ async def create_patent(patent_data: PatentRecordCreate):
         logger.error(f"Error creating patent record: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+# Batch Routes
+# Create and update models of each collection accepted by /batch; the
+# singleton profile and skills documents can only be updated
+BATCH_MODELS = {
+    "profiles": (None, PersonalInfoUpdate),
+    "skills": (None, SkillsDataUpdate),
+    "education": (EducationRecordCreate, EducationRecordUpdate),
+    "experience": (ExperienceRecordCreate, ExperienceRecordUpdate),
+    "projects": (ProjectRecordCreate, ProjectRecordUpdate),
+    "certifications": (CertificationRecordCreate, CertificationRecordUpdate),
+    "awards": (AwardRecordCreate, AwardRecordUpdate),
+    "patents": (PatentRecordCreate, PatentRecordUpdate),
+}
+
+def prepare_batch_operation(operation: BatchOperation) -> Dict[str, Any]:
+    """Validate one batch operation into the form StorageBackend.apply_batch takes.
+
+    Raises ValidationError for invalid data and ValueError for other problems.
+    """
+    if operation.collection not in BATCH_MODELS:
+        raise ValueError(f"Unknown collection '{operation.collection}'")
+    create_model, update_model = BATCH_MODELS[operation.collection]
+    singleton = create_model is None
+    if singleton and operation.op != "update":
+        raise ValueError(f"{operation.collection} only supports update")
+    if operation.op != "create" and not singleton and not operation.id:
+        raise ValueError(f"{operation.op} requires an id")
+
+    prepared = {"op": operation.op, "collection": operation.collection, "id": operation.id}
+    if operation.op == "create":
+        validated = create_model(**(operation.data or {}))
+        prepared["data"] = RECORD_MODELS[operation.collection](**validated.dict()).dict()
+    elif operation.op == "update":
+        validated = update_model(**(operation.data or {}))
+        prepared["data"] = {k: v for k, v in validated.dict().items() if v is not None}
+        if not prepared["data"]:
+            raise ValueError("No data provided for update")
+    return prepared
+
+@router.post("/batch", response_model=BatchResponse)
+async def batch_write(batch: BatchRequest):
+    """Apply create/update/delete operations across collections in grouped bulk writes.
+
+    Every operation is validated before anything is written; any invalid
+    operation rejects the whole batch with a 422 listing the problems.
+    """
+    operations = []
+    errors = []
+    for index, operation in enumerate(batch.operations):
+        try:
+            operations.append(prepare_batch_operation(operation))
+        except ValidationError as e:
+            errors.append({"index": index, "error": "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            )})
+        except ValueError as e:
+            errors.append({"index": index, "error": str(e)})
+    if errors:
+        raise HTTPException(status_code=422, detail={"message": "Invalid batch operations", "errors": errors})
+
+    try:
+        results = await db.apply_batch(operations, transaction=batch.transaction)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error applying batch: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    for index, (operation, result) in enumerate(zip(operations, results)):
+        result.update(index=index, op=operation["op"], collection=operation["collection"])
+    counts = Counter(result["status"] for result in results)
+    return BatchResponse(
+        success=all(result["status"] in APPLIED_STATUSES for result in results),
+        counts=dict(counts),
+        results=results
+    )
+
 # Contact Routes
 @router.post("/contact", response_model=ContactResponse)
-async def submit_contact_form(contact_data: ContactSubmissionCreate):
+async def submit_contact_form(contact_data: ContactSubmissionCreate, request: Request):
     """Submit contact form"""
     try:
         contact_dict = contact_data.dict()
-        
-        result = await db.create_contact_submission(contact_dict)
-        
-        if not result:
-            raise HTTPException(status_code=500, detail="Failed to submit contact form")
+        # Reject floods and resubmissions before they use any write capacity
+        keys = await contact_guard.limit(request, contact_dict)
+        digest = content_hash(contact_dict)
+        await contact_guard.record(digest)
+        contact_record = ContactSubmission(**contact_dict)
+        
+        try:
+            if contact_writer is not None:
+                try:
+                    contact_writer.submit(contact_record.dict())
+                except asyncio.QueueFull:
+                    raise HTTPException(
+                        status_code=503,
+                        detail="Too many submissions right now, please try again shortly",
+                        headers={"Retry-After": "5"}
+                    )
+            else:
+                result = await db.create_contact_submission(contact_record.dict())
+                
+                if not result:
+                    raise HTTPException(status_code=500, detail="Failed to submit contact form")
+        except Exception:
+            # Nothing was stored, so the client's retry must not count as a duplicate
+            await contact_guard.release(keys, digest)
+            raise
         
         return ContactResponse(
             success=True, 
             message="Thank you for your message! I'll get back to you soon."
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error submitting contact form: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.get("/contact/submissions", response_model=List[dict])
-async def get_contact_submissions():
-    """Get all contact submissions (admin only)"""
+async def get_contact_submissions(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None),
+    stream: bool = Query(False)
+):
+    """Get contact submissions newest first, one page at a time (admin only)"""
     try:
-        submissions = await db.get_contact_submissions()
-        # Remove MongoDB _id field from each record
-        for record in submissions:
-            if '_id' in record:
-                del record['_id']
-        
-        return submissions
+        not_modified = conditional_response(request, response, db, ["contacts"])
+        if not_modified is not None:
+            return not_modified
+
+        return await list_records(request, response, "contacts", limit, after, stream)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting contact submissions: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+# Aggregated Portfolio Route
+# Maps each portfolio section to its cached collection and database loader
+PORTFOLIO_SECTIONS = {
+    "profile": ("profiles", lambda: db.get_personal_info()),
+    "education": ("education", lambda: db.get_all_education()),
+    "experience": ("experience", lambda: db.get_all_experience()),
+    "projects": ("projects", lambda: db.get_all_projects(None)),
+    "skills": ("skills", lambda: db.get_skills()),
+    "certifications": ("certifications", lambda: db.get_all_certifications()),
+    "awards": ("awards", lambda: db.get_all_awards()),
+    "patents": ("patents", lambda: db.get_all_patents()),
+}
+PORTFOLIO_COLLECTIONS = {collection for collection, _ in PORTFOLIO_SECTIONS.values()}
+
+def parse_sections(sections: Optional[str]) -> List[str]:
+    """Parse a comma-separated sections parameter, defaulting to every section"""
+    if not sections:
+        return list(PORTFOLIO_SECTIONS)
+
+    requested = []
+    for name in sections.split(","):
+        name = name.strip()
+        if not name or name in requested:
+            continue
+        if name not in PORTFOLIO_SECTIONS:
+            raise HTTPException(status_code=400, detail=f"Unknown section: {name}")
+        requested.append(name)
+    return requested
+
+async def portfolio_json(requested: List[str]) -> Tuple[bytes, List[str]]:
+    """Get the aggregated portfolio body for the requested sections, and the sections cut at MAX_LIST_RECORDS"""
+    async def render():
+        # Splice the per-section bodies cached by the individual routes
+        pages = await asyncio.gather(*[
+            cached_page(PORTFOLIO_SECTIONS[name][0], None, PORTFOLIO_SECTIONS[name][1])
+            for name in requested
+        ])
+        parts, truncated = [], []
+        for name, page in zip(requested, pages):
+            empty = b"[]" if PORTFOLIO_SECTIONS[name][0] in RECORD_MODELS else b"null"
+            body, next_cursor = page or (empty, None)
+            parts.append(b'"' + name.encode() + b'":' + body)
+            if next_cursor:
+                truncated.append(name)
+        return b"{" + b",".join(parts) + b"}", truncated
+
+    return await cache.get_or_load(PORTFOLIO_CACHE, tuple(requested), render)
+
+@router.get("/portfolio", response_model=PortfolioData, response_model_exclude_unset=True)
+async def get_portfolio(
+    request: Request,
+    response: Response,
+    sections: Optional[str] = Query(None)
+):
+    """Get all portfolio sections, or a comma-separated subset, in one response"""
+    requested = parse_sections(sections)
+    try:
+        not_modified = conditional_response(
+            request, response, db,
+            [PORTFOLIO_SECTIONS[name][0] for name in requested]
+        )
+        if not_modified is not None:
+            return not_modified
+
+        body, truncated = await portfolio_json(requested)
+        if truncated:
+            # Cut sections can be read in full from their own paginated routes
+            response.headers["X-Truncated-Sections"] = ",".join(truncated)
+        return body_response(request, response, body)
+    except Exception as e:
+        logger.error(f"Error getting portfolio: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+# Search Routes
+@router.get("/search")
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Search projects, experience, patents and certifications, best matches first.
+
+    Every word must match a whole term or the start of one; types limits the
+    search to a comma-separated list of collections.
+    """
+    collections = None
+    if types:
+        collections = [name.strip() for name in types.split(",") if name.strip()]
+        unknown = [name for name in collections if name not in SEARCH_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown search type: {unknown[0]}")
+    if search_index is None:
+        raise HTTPException(status_code=503, detail="Search index is not ready")
+
+    await search_index.wait_idle()
+    total, results = search_index.search(q, limit, collections)
+    return {"query": q, "total": total, "results": results}
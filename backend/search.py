@@ -0,0 +1,145 @@
+"""
+In-memory inverted index behind the /api/search endpoint
+"""
+import logging
+import math
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from record_index import DocKey, RecordIndex
+from storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+# Searchable fields of each collection and their ranking weights
+SEARCH_FIELDS: Dict[str, Dict[str, float]] = {
+    "projects": {"title": 3.0, "technologies": 2.0, "description": 1.0, "achievements": 1.0},
+    "experience": {"position": 3.0, "company": 2.0, "achievements": 1.0},
+    "patents": {"title": 3.0, "description": 1.0},
+    "certifications": {"title": 3.0, "issuer": 2.0, "description": 1.0},
+}
+
+# Field shown as the title of each collection's results
+TITLE_FIELDS = {
+    "projects": "title",
+    "experience": "position",
+    "patents": "title",
+    "certifications": "title",
+}
+
+# Score multiplier for terms matched by prefix rather than exactly
+PREFIX_WEIGHT = 0.5
+
+# Keeps tokens like "c++", "c#" and "node.js" intact
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase search terms"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _field_text(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(item) for item in value)
+    return "" if value is None else str(value)
+
+
+class SearchIndex(RecordIndex):
+    """Weighted term postings over the searchable collections.
+
+    Queries never touch the database; see RecordIndex for how the postings
+    follow writes.
+    """
+
+    def __init__(self, fields: Dict[str, Dict[str, float]] = SEARCH_FIELDS):
+        super().__init__(fields)
+        self.fields = fields
+        # term -> {doc: weighted term frequency}
+        self._postings: Dict[str, Dict[DocKey, float]] = {}
+        # Sorted vocabulary for prefix lookups
+        self._terms: List[str] = []
+        self._doc_terms: Dict[DocKey, Dict[str, float]] = {}
+
+    def _index(self, key: DocKey, record: Dict[str, Any]):
+        weights: Counter = Counter()
+        for field, weight in self.fields[key[0]].items():
+            for term in tokenize(_field_text(record.get(field))):
+                weights[term] += weight
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._terms, term)
+            postings[key] = weight
+        self._doc_terms[key] = dict(weights)
+
+    def _unindex(self, key: DocKey, record: Dict[str, Any]):
+        for term in self._doc_terms.pop(key, {}):
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect_left(self._terms, term)]
+
+    async def build(self, db: StorageBackend):
+        await super().build(db)
+        logger.info(f"Search index built: {len(self._records)} records, {len(self._terms)} terms")
+
+    # Queries
+    def _matches(self, term: str) -> Dict[DocKey, float]:
+        """Postings for a query term, including prefix matches at reduced weight"""
+        matches: Dict[DocKey, float] = {}
+        start = bisect_left(self._terms, term)
+        total = max(len(self._records), 1)
+        for candidate in self._terms[start:]:
+            if not candidate.startswith(term):
+                break
+            postings = self._postings[candidate]
+            idf = math.log(1 + total / len(postings))
+            factor = idf if candidate == term else idf * PREFIX_WEIGHT
+            for key, weight in postings.items():
+                score = weight * factor
+                if score > matches.get(key, 0.0):
+                    matches[key] = score
+        return matches
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        collections: Optional[Iterable[str]] = None
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """Rank records containing every query term, exactly or as a prefix"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return 0, []
+        allowed = set(collections) if collections else None
+
+        scores: Optional[Dict[DocKey, float]] = None
+        for term in sorted(terms, key=len, reverse=True):
+            matches = self._matches(term)
+            if scores is None:
+                scores = {
+                    key: score for key, score in matches.items()
+                    if allowed is None or key[0] in allowed
+                }
+            else:
+                scores = {key: score + matches[key] for key, score in scores.items() if key in matches}
+            if not scores:
+                return 0, []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        results = []
+        for (collection, record_id), score in ranked[:limit]:
+            record = self._records[(collection, record_id)]
+            results.append({
+                "type": collection,
+                "id": record_id,
+                "title": record.get(TITLE_FIELDS[collection], ""),
+                "score": round(score, 4),
+                "record": record,
+            })
+        return len(ranked), results
@@ -1,22 +1,31 @@
-from fastapi import FastAPI, APIRouter
+from fastapi import FastAPI, APIRouter, Header, HTTPException, Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
-import os
+import asyncio
 import logging
+from typing import Optional
 from pathlib import Path
 
 # Import routes
-from routes import router as api_router
+from routes import (
+    router as api_router, set_db, set_contact_writer, set_search_index, set_project_facets
+)
+from change_sync import ChangeSync
+from contact_writer import ContactWriter
+from health import UNHEALTHY, HealthMonitor, status_value
+from search import SearchIndex
+from facets import ProjectFacets
+import routes
+from metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware, instrument_storage, render_metrics
+from profiling import PROFILE_TOKEN, ProfileBuffer, ProfilerMiddleware, token_matches
+from compression import CompressionMiddleware
+from log_config import AccessLogMiddleware, setup_logging
+from storage import create_database
+from warmup import warm_up
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ.get('DB_NAME', 'portfolio')]
-
 # Create the main app
 app = FastAPI(
     title="Portfolio API",
@@ -33,11 +42,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Compress responses for clients that accept gzip or brotli
+app.add_middleware(CompressionMiddleware)
+
+# Profile requests that opt in with X-Profile / ?profile= or are sampled
+profile_buffer = ProfileBuffer()
+app.add_middleware(ProfilerMiddleware, buffer=profile_buffer)
+
+# Outside the app's own middleware, so request latency includes compression
+app.add_middleware(MetricsMiddleware)
+
+# Outermost: request ids and sampled JSON access logs
+app.add_middleware(AccessLogMiddleware)
+
+# Configure logging; records are written by a background thread
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # Root endpoint
@@ -52,18 +71,152 @@ app.include_router(api_router)
 async def startup_event():
     """Startup event handler"""
     logger.info("Starting Portfolio API...")
-    logger.info("Connected to MongoDB")
+
+    # One storage backend (and MongoDB connection pool) per worker, shared by every route
+    app.state.db = instrument_storage(create_database())
+    set_db(app.state.db)
+    logger.info(f"Using {type(app.state.db).__name__} storage backend")
+
+    # Other workers' writes invalidate this worker's caches, indexes and ETags
+    app.state.change_sync = None
+    if getattr(app.state.db, "shared_across_processes", False):
+        app.state.change_sync = ChangeSync(app.state.db)
+        app.state.change_sync.start()
+
+    # Contact submissions are acknowledged first and written in batches
+    app.state.contact_writer = ContactWriter(app.state.db)
+    app.state.contact_writer.start()
+    set_contact_writer(app.state.contact_writer)
+
+    # Dependency probes run in the background; /health serves their latest result
+    app.state.health = HealthMonitor(app.state.db, writers={"contact_writer": app.state.contact_writer})
+    app.state.health.start()
+
+    # Serve liveness right away, without touching storage; report ready once
+    # storage answers, is prepared and responses are precomputed
+    app.state.ready = False
+    app.state.warmup = None
+    app.state.index_report = None
+    app.state.warmup_task = asyncio.create_task(warm_start())
+
+async def prepare_storage():
+    """Create missing indexes and build the in-memory search index and facets"""
+    app.state.index_report = await app.state.db.ensure_indexes()
+    for label in app.state.index_report["created"]:
+        logger.info(f"Created index {label}")
+
+    # Search reads from memory; writes keep the index current
+    search_index = SearchIndex()
+    await search_index.build(app.state.db)
+    app.state.search_index = search_index
+    set_search_index(search_index)
+    project_facets = ProjectFacets()
+    await project_facets.build(app.state.db)
+    app.state.project_facets = project_facets
+    set_project_facets(project_facets)
+
+async def warm_start():
+    """Ping storage, prepare it, open pooled connections and precompute every public response"""
+    report = await warm_up(app, app.state.db, prepare_storage)
+    app.state.warmup = report
+    app.state.ready = True
+    logger.info(f"Warm start finished in {report['seconds']}s; ready for traffic", extra={"warmup": report})
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Shutdown event handler"""
     logger.info("Shutting down Portfolio API...")
-    client.close()
+    app.state.ready = False
+    app.state.warmup_task.cancel()
+    await app.state.health.stop()
+    # Write every accepted submission before the connection pool goes away
+    await app.state.contact_writer.stop()
+    set_contact_writer(None)
+    if app.state.change_sync is not None:
+        await app.state.change_sync.stop()
+    await app.state.db.close()
 
-# Health check endpoint
+# Readiness: the latest background probe result, once the warm start has finished
 @app.get("/health")
-async def health_check():
-    return {"status": "healthy", "message": "Portfolio API is running"}
+async def health_check(response: Response):
+    if not getattr(app.state, "ready", False):
+        response.status_code = 503
+        return {"status": "starting", "message": "Portfolio API is warming up"}
+    result = app.state.health.result()
+    if result["status"] == UNHEALTHY:
+        response.status_code = 503
+    return result
+
+# Liveness: the process is up and serving requests
+@app.get("/health/live")
+async def liveness_check():
+    return {"status": "alive"}
+
+# Connection pool usage is exported with the other runtime gauges at /metrics
+def collect_runtime_metrics():
+    """Scrape-time gauges for the read cache, connection pool and contact pipeline"""
+    cache_stats = routes.cache.stats()
+    yield "portfolio_cache_hits_total", "counter", "Read cache hits", [({}, cache_stats["hits"])]
+    yield "portfolio_cache_misses_total", "counter", "Read cache misses", [({}, cache_stats["misses"])]
+    yield "portfolio_cache_hit_ratio", "gauge", "Read cache hit ratio since start", [({}, cache_stats["hit_ratio"])]
+    yield "portfolio_cache_entries", "gauge", "Cached entries per collection", [
+        ({"collection": name}, count) for name, count in cache_stats["entries"].items()
+    ]
+
+    db = getattr(app.state, "db", None)
+    for key, value in (db.pool_stats() if db else {}).items():
+        yield f"mongo_pool_{key}", "gauge", f"Connection pool {key.replace('_', ' ')}", [({}, value)]
+
+    writer = getattr(app.state, "contact_writer", None)
+    if writer is not None:
+        for key, value in writer.stats().items():
+            yield f"contact_writer_{key}", "gauge", f"Contact write buffer {key.replace('_', ' ')}", [({}, value)]
+    health = getattr(app.state, "health", None)
+    if health is not None:
+        result = health.result()
+        yield "health_status", "gauge", "Health by check: 0 healthy, 1 degraded, 2 unhealthy", [
+            ({"check": "overall"}, status_value(result["status"]))
+        ] + [
+            ({"check": name}, status_value(check["status"])) for name, check in result["checks"].items()
+        ]
+    sync = getattr(app.state, "change_sync", None)
+    if sync is not None:
+        stats = sync.stats()
+        yield "change_sync_remote_changes_total", "counter", "Writes by other workers applied locally", [
+            ({"mode": stats["mode"]}, stats["remote_changes"])
+        ]
+        yield "change_sync_errors_total", "counter", "Change stream and polling errors", [({}, stats["errors"])]
+    if routes.contact_guard is not None:
+        for key, value in routes.contact_guard.stats().items():
+            yield f"contact_{key}_total", "counter", f"Contact submissions rejected as {key.replace('_', ' ')}", [({}, value)]
+
+REGISTRY.add_collector(collect_runtime_metrics)
+
+def require_profile_token(token: Optional[str]):
+    # Captured profiles include request paths and query strings
+    if not PROFILE_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token_matches(token):
+        raise HTTPException(status_code=403, detail="Invalid profile token")
+
+# Recent request profiles
+@app.get("/admin/profiles")
+async def list_profiles(x_profile: Optional[str] = Header(None)):
+    require_profile_token(x_profile)
+    return profile_buffer.summaries()
+
+@app.get("/admin/profiles/{profile_id}")
+async def get_profile(profile_id: str, x_profile: Optional[str] = Header(None)):
+    require_profile_token(x_profile)
+    profile = profile_buffer.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+# Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
 
 # API documentation endpoint info
 @app.get("/docs-info")
@@ -0,0 +1,179 @@
+"""
+Export the public read API as prerendered static files.
+
+Every public GET route is rendered through the same Database methods and
+encoders the API uses and written as <out-dir>/api/<route>.json, with
+pre-compressed .gz and .br variants and a manifest.json of content hashes,
+so a reverse proxy or CDN can serve reads without the Python app.
+
+    python static_export.py --out-dir ./static
+
+Reruns are incremental: a route's files are only rewritten when its content
+hash differs from the manifest, and files of routes that no longer have
+content are removed.
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+# Load environment variables
+load_dotenv(backend_dir / '.env')
+
+import logging
+
+import routes
+from storage import create_database
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUT_DIR = backend_dir / "static"
+MANIFEST_NAME = "manifest.json"
+
+
+def variant_suffixes() -> list:
+    """File suffixes of the compressed variants this install can produce"""
+    return ["gz", "br"] if brotli is not None else ["gz"]
+
+
+def compressed_variants(body: bytes) -> Dict[str, bytes]:
+    """Compress a body with every available encoding, keyed by file suffix"""
+    # mtime=0 keeps the gzip output identical for identical content
+    variants = {"gz": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+    return variants
+
+
+def write_atomic(path: Path, data: bytes):
+    """Write a file through a temporary sibling so readers never see a partial file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def load_manifest(out_dir: Path) -> Dict[str, Any]:
+    """Load the manifest of a previous export, or an empty one"""
+    try:
+        return json.loads((out_dir / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return {"files": {}}
+
+
+async def render_routes() -> Dict[str, Optional[bytes]]:
+    """Render each public read route, keyed by its output path.
+
+    Sections without content map to None, matching the API's 404.
+    """
+    bodies: Dict[str, Optional[bytes]] = {}
+    for name, (collection, loader) in routes.PORTFOLIO_SECTIONS.items():
+        body = await routes.cached_json(collection, None, loader)
+        if body is None and collection in routes.RECORD_MODELS:
+            body = b"[]"
+        bodies[f"api/{name}.json"] = body
+    bodies["api/portfolio.json"], _ = await routes.portfolio_json(list(routes.PORTFOLIO_SECTIONS))
+    return bodies
+
+
+def export_files(out_dir: Path, bodies: Dict[str, Optional[bytes]], force: bool = False) -> Dict[str, list]:
+    """Write changed routes and their variants, then the manifest"""
+    manifest = load_manifest(out_dir)
+    previous = manifest.get("files", {})
+    entries: Dict[str, Any] = {}
+    report = {"written": [], "unchanged": [], "removed": []}
+
+    for relative, body in bodies.items():
+        path = out_dir / relative
+        if body is None:
+            for stale in [path] + [path.with_name(f"{path.name}.{s}") for s in ("gz", "br")]:
+                if stale.exists():
+                    stale.unlink()
+                    report["removed"].append(str(stale.relative_to(out_dir)))
+            continue
+
+        digest = hashlib.sha256(body).hexdigest()
+        entry = previous.get(relative)
+        if (
+            not force and entry and entry["sha256"] == digest
+            and sorted(entry.get("variants", {})) == sorted(variant_suffixes())
+            and path.exists()
+            and all(path.with_name(f"{path.name}.{s}").exists() for s in variant_suffixes())
+        ):
+            entries[relative] = entry
+            report["unchanged"].append(relative)
+            continue
+
+        write_atomic(path, body)
+        variants = {}
+        for suffix, data in compressed_variants(body).items():
+            write_atomic(path.with_name(f"{path.name}.{suffix}"), data)
+            variants[suffix] = len(data)
+        entries[relative] = {
+            "sha256": digest,
+            "etag": f'"{digest[:20]}"',
+            "size": len(body),
+            "variants": variants,
+        }
+        report["written"].append(relative)
+
+    manifest = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "files": entries,
+    }
+    write_atomic(out_dir / MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True).encode())
+    return report
+
+
+async def export_static(out_dir: Path = DEFAULT_OUT_DIR, force: bool = False) -> Dict[str, list]:
+    """Render every public read route and export the changed ones to out_dir"""
+    db = create_database()
+    routes.set_db(db)
+    try:
+        start = time.perf_counter()
+        bodies = await render_routes()
+        report = export_files(out_dir, bodies, force)
+        logger.info(
+            f"Exported {len(report['written'])} changed, {len(report['unchanged'])} unchanged, "
+            f"{len(report['removed'])} removed files to {out_dir} "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+        if brotli is None:
+            logger.warning("brotli is not installed; skipped .br variants")
+        return report
+    finally:
+        await db.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Export the read API as static JSON files")
+    parser.add_argument("--out-dir", type=Path, default=DEFAULT_OUT_DIR, help="Output directory")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rewrite every file even when its content hash is unchanged"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    asyncio.run(export_static(args.out_dir, args.force))
@@ -0,0 +1,308 @@
+"""
+Storage backend interface shared by the MongoDB and in-memory implementations
+"""
+from abc import ABC, abstractmethod
+from typing import List, Optional, Dict, Any, Callable, Tuple, AsyncIterator
+import os
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Newest first, with the application id as a tie-breaker for keyset pagination
+PAGE_SORT = [("created_at", -1), ("id", -1)]
+
+# Most records a full-list response holds; longer lists need keyset pages or a stream.
+# Full-list reads return one record more, so callers can tell the list was cut
+MAX_LIST_RECORDS = int(os.environ.get('MAX_LIST_RECORDS', '1000'))
+
+# Collections holding a single document rather than a list of records
+SINGLETON_COLLECTIONS = ["profiles", "skills"]
+
+# Batch result statuses of operations that were written
+APPLIED_STATUSES = ("created", "updated", "deleted")
+
+class StorageBackend(ABC):
+    """Async storage interface used by the routes, seeder and tooling.
+
+    Subclasses implement the collection operations; change notification and
+    the per-collection revisions used for HTTP validators live here.
+    """
+
+    # Whether other processes can write to the same data (and must be watched for changes)
+    shared_across_processes = False
+
+    def __init__(self):
+        self._change_listeners: List[Callable[[str, Optional[List[str]]], None]] = []
+        # Per-collection revision counters and last write times used to build HTTP validators
+        self.started_at = datetime.utcnow().replace(microsecond=0)
+        self._revisions: Dict[str, int] = {}
+        self._last_modified: Dict[str, datetime] = {}
+
+    # Change notifications
+    def add_change_listener(self, listener: Callable[[str, Optional[List[str]]], None]):
+        """Register a callback invoked after each write with the collection name and written ids (None if unknown)"""
+        self._change_listeners.append(listener)
+
+    def get_revision(self, collection: str) -> Tuple[int, datetime]:
+        """Get the revision counter and last write time of a collection"""
+        return (
+            self._revisions.get(collection, 0),
+            self._last_modified.get(collection, self.started_at)
+        )
+
+    def _notify_change(self, collection: str, ids: Optional[List[str]] = None):
+        """Bump the collection revision and notify listeners of the write"""
+        self._revisions[collection] = self._revisions.get(collection, 0) + 1
+        self._last_modified[collection] = datetime.utcnow().replace(microsecond=0)
+        for listener in self._change_listeners:
+            try:
+                listener(collection, ids)
+            except Exception as e:
+                logger.error(f"Error in change listener for {collection}: {e}")
+
+    def apply_remote_change(self, collection: str, ids: Optional[List[str]] = None):
+        """Handle a write made by another process: bump the revision and notify listeners.
+
+        Unlike a local write, this is never propagated back to other processes.
+        """
+        StorageBackend._notify_change(self, collection, ids)
+
+    async def ping(self) -> float:
+        """Round-trip to the underlying store, returning the latency in seconds"""
+        return 0.0
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool usage, if the backend has a pool"""
+        return {}
+
+    # Lifecycle
+    @abstractmethod
+    async def close(self):
+        """Release the backend's resources"""
+
+    @abstractmethod
+    async def ensure_indexes(self) -> Dict[str, List[str]]:
+        """Create missing indexes and report created/existing/failed ones"""
+
+    @abstractmethod
+    async def drop_database(self):
+        """Delete every collection (used by benchmarks against throwaway databases)"""
+
+    # Pagination, streaming and bulk operations
+    @abstractmethod
+    async def get_page(
+        self,
+        collection: str,
+        limit: int,
+        after: Optional[Tuple[datetime, str]] = None,
+        filter_query: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, str]]]:
+        """Get one page of records and the keyset position of the next page"""
+
+    @abstractmethod
+    async def get_records(self, collection: str, ids: List[str]) -> List[Dict[str, Any]]:
+        """Get the records with the given ids that exist, in no particular order"""
+
+    @abstractmethod
+    def iter_records(
+        self,
+        collection: str,
+        filter_query: Optional[Dict[str, Any]] = None,
+        batch_size: int = 100
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield records newest first without materializing the collection"""
+
+    @abstractmethod
+    async def bulk_upsert(
+        self,
+        collection: str,
+        records: List[Dict[str, Any]],
+        chunk_size: int = 1000
+    ) -> Dict[str, int]:
+        """Idempotently upsert records keyed on their application id"""
+
+    @abstractmethod
+    async def apply_batch(
+        self,
+        operations: List[Dict[str, Any]],
+        transaction: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Apply validated create/update/delete operations with one bulk write per collection.
+
+        Each operation has op, collection, id (update/delete of records) and
+        data (a complete record for creates, the fields to set for updates).
+        Returns one {status, id, error} result per operation, in order; status
+        is created, updated, deleted, not_found, error, skipped or rolled_back.
+        """
+        pass
+
+    # Rate limiting state shared by every worker using the backend
+    @abstractmethod
+    async def take_rate_limit_token(self, key: str, rate: float, burst: int) -> float:
+        """Take a token from a bucket, returning 0 or the seconds until one is available"""
+
+    @abstractmethod
+    async def refund_rate_limit_token(self, key: str, burst: int):
+        """Give a token back to a bucket, up to burst"""
+
+    @abstractmethod
+    async def register_content_hash(self, digest: str, window: float) -> bool:
+        """Record a content hash, returning False when it was seen within window seconds"""
+
+    @abstractmethod
+    async def release_content_hash(self, digest: str):
+        """Forget a content hash so the same content is accepted again"""
+
+    # Personal Info operations
+    @abstractmethod
+    async def get_personal_info(self) -> Optional[Dict[str, Any]]:
+        """Get personal information"""
+
+    @abstractmethod
+    async def update_personal_info(self, data: Dict[str, Any]) -> bool:
+        """Update personal information"""
+
+    # Education operations
+    @abstractmethod
+    async def get_all_education(self) -> List[Dict[str, Any]]:
+        """Get all education records"""
+
+    @abstractmethod
+    async def create_education(self, data: Dict[str, Any]) -> Optional[str]:
+        """Create new education record"""
+
+    @abstractmethod
+    async def update_education(self, education_id: str, data: Dict[str, Any]) -> bool:
+        """Update education record"""
+
+    @abstractmethod
+    async def delete_education(self, education_id: str) -> bool:
+        """Delete education record"""
+
+    # Experience operations
+    @abstractmethod
+    async def get_all_experience(self) -> List[Dict[str, Any]]:
+        """Get all experience records"""
+
+    @abstractmethod
+    async def create_experience(self, data: Dict[str, Any]) -> Optional[str]:
+        """Create new experience record"""
+
+    @abstractmethod
+    async def update_experience(self, experience_id: str, data: Dict[str, Any]) -> bool:
+        """Update experience record"""
+
+    @abstractmethod
+    async def delete_experience(self, experience_id: str) -> bool:
+        """Delete experience record"""
+
+    # Project operations
+    @abstractmethod
+    async def get_all_projects(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get all projects, optionally filtered by category"""
+
+    @abstractmethod
+    async def create_project(self, data: Dict[str, Any]) -> Optional[str]:
+        """Create new project record"""
+
+    @abstractmethod
+    async def update_project(self, project_id: str, data: Dict[str, Any]) -> bool:
+        """Update project record"""
+
+    @abstractmethod
+    async def delete_project(self, project_id: str) -> bool:
+        """Delete project record"""
+
+    # Skills operations
+    @abstractmethod
+    async def get_skills(self) -> Optional[Dict[str, Any]]:
+        """Get skills data"""
+
+    @abstractmethod
+    async def update_skills(self, data: Dict[str, Any]) -> bool:
+        """Update skills data"""
+
+    # Certification operations
+    @abstractmethod
+    async def get_all_certifications(self) -> List[Dict[str, Any]]:
+        """Get all certifications"""
+
+    @abstractmethod
+    async def create_certification(self, data: Dict[str, Any]) -> Optional[str]:
+        """Create new certification record"""
+
+    @abstractmethod
+    async def update_certification(self, certification_id: str, data: Dict[str, Any]) -> bool:
+        """Update certification record"""
+
+    @abstractmethod
+    async def delete_certification(self, certification_id: str) -> bool:
+        """Delete certification record"""
+
+    # Award operations
+    @abstractmethod
+    async def get_all_awards(self) -> List[Dict[str, Any]]:
+        """Get all awards"""
+
+    @abstractmethod
+    async def create_award(self, data: Dict[str, Any]) -> Optional[str]:
+        """Create new award record"""
+
+    @abstractmethod
+    async def update_award(self, award_id: str, data: Dict[str, Any]) -> bool:
+        """Update award record"""
+
+    @abstractmethod
+    async def delete_award(self, award_id: str) -> bool:
+        """Delete award record"""
+
+    # Patent operations
+    @abstractmethod
+    async def get_all_patents(self) -> List[Dict[str, Any]]:
+        """Get all patents"""
+
+    @abstractmethod
+    async def create_patent(self, data: Dict[str, Any]) -> Optional[str]:
+        """Create new patent record"""
+
+    @abstractmethod
+    async def update_patent(self, patent_id: str, data: Dict[str, Any]) -> bool:
+        """Update patent record"""
+
+    @abstractmethod
+    async def delete_patent(self, patent_id: str) -> bool:
+        """Delete patent record"""
+
+    # Contact operations
+    @abstractmethod
+    async def create_contact_submission(self, data: Dict[str, Any]) -> Optional[str]:
+        """Create new contact submission"""
+
+    @abstractmethod
+    async def create_contact_submissions(self, records: List[Dict[str, Any]]) -> int:
+        """Insert a batch of contact submissions, returning how many were stored.
+
+        Records whose id already exists are skipped, so a failed batch can be
+        retried; other errors are raised to the caller.
+        """
+
+    @abstractmethod
+    async def get_contact_submissions(self) -> List[Dict[str, Any]]:
+        """Get all contact submissions"""
+
+
+def create_database() -> StorageBackend:
+    """Create the storage backend selected by the STORAGE_BACKEND environment variable.
+
+    "mongo" (the default) uses MongoDB through Motor; "memory" keeps every
+    collection in process, optionally persisted to MEMORY_SNAPSHOT_PATH.
+    """
+    backend = os.environ.get('STORAGE_BACKEND', 'mongo').lower()
+    if backend == 'memory':
+        from memory_database import MemoryDatabase
+        return MemoryDatabase(os.environ.get('MEMORY_SNAPSHOT_PATH') or None)
+    if backend == 'mongo':
+        from database import Database
+        return Database()
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
@@ -0,0 +1,203 @@
+"""
+Deterministic synthetic data generator for load testing the portfolio collections
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Type, Union, get_args, get_origin
+
+from dotenv import load_dotenv
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.append(str(backend_dir))
+
+# Load environment variables
+load_dotenv(backend_dir / '.env')
+
+from pydantic import BaseModel
+from models import (
+    EducationRecord, ExperienceRecord, ProjectRecord,
+    CertificationRecord, AwardRecord, PatentRecord, ContactSubmission
+)
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Collection name -> record model the documents are generated from
+COLLECTION_MODELS: Dict[str, Type[BaseModel]] = {
+    "education": EducationRecord,
+    "experience": ExperienceRecord,
+    "projects": ProjectRecord,
+    "certifications": CertificationRecord,
+    "awards": AwardRecord,
+    "patents": PatentRecord,
+    "contacts": ContactSubmission,
+}
+
+BASE_TIME = datetime(2024, 1, 1)
+
+WORDS = (
+    "vision model pipeline data edge robust scalable realtime neural graph "
+    "detection tracking sensor cloud deploy latency accuracy dataset training "
+    "inference embedded stream platform analytics automation research"
+).split()
+
+# Field name -> vocabulary used for str and List[str] fields of that name
+VOCABULARIES: Dict[str, List[str]] = {
+    "technologies": [
+        "Python", "PyTorch", "TensorFlow", "OpenCV", "FastAPI", "React", "MongoDB",
+        "Docker", "Kubernetes", "AWS", "YOLO", "CUDA", "Raspberry Pi", "Arduino",
+        "scikit-learn", "Pandas", "Redis", "PostgreSQL", "Go", "Rust"
+    ],
+    "category": ["ai", "computer-vision", "web", "iot", "research", "data"],
+    "type": ["Internship", "Full-time", "Part-time", "Research", "Contract"],
+    "company": ["Acme Labs", "Globex", "Initech", "Umbrella AI", "Hooli", "Stark Industries"],
+    "institution": ["Mahindra University", "IIT Hyderabad", "IIIT Delhi", "BITS Pilani"],
+    "issuer": ["Coursera", "NVIDIA", "Google Cloud", "AWS", "DeepLearning.AI"],
+    "location": ["Hyderabad, Telangana", "Bengaluru, Karnataka", "Pune, Maharashtra", "Remote"],
+    "status": ["Current", "Completed"],
+}
+
+
+class SyntheticGenerator:
+    """Generates reproducible fake documents from the Pydantic record models"""
+
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+
+    def _text(self, rng: random.Random, words: int) -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+    def _value(self, rng: random.Random, name: str, annotation: Any, index: int) -> Any:
+        origin = get_origin(annotation)
+        if origin is Union:
+            args = [arg for arg in get_args(annotation) if arg is not type(None)]
+            if rng.random() < 0.3:
+                return None
+            return self._value(rng, name, args[0], index)
+        if origin in (list, List):
+            vocabulary = VOCABULARIES.get(name)
+            if vocabulary:
+                return rng.sample(vocabulary, rng.randint(2, min(6, len(vocabulary))))
+            return [self._text(rng, rng.randint(8, 20)) for _ in range(rng.randint(2, 6))]
+        if annotation is bool:
+            return rng.random() < 0.2
+        if annotation is datetime:
+            return BASE_TIME + timedelta(minutes=index)
+        if name in VOCABULARIES:
+            return rng.choice(VOCABULARIES[name])
+        if name == "email":
+            return f"user{index}@example.com"
+        if name.endswith("_url"):
+            return f"https://github.com/example/project-{index}"
+        if name in ("year", "date", "publish_date"):
+            return str(rng.randint(2012, 2025))
+        if name == "duration":
+            start = rng.randint(2015, 2024)
+            return f"Jan {start} – Jun {start + rng.randint(0, 2)}"
+        if name == "cgpa":
+            return f"{rng.uniform(6.0, 10.0):.2f}"
+        if name == "patent_number":
+            return f"IN{rng.randint(100000, 999999)}"
+        if name in ("description", "message", "bio"):
+            return self._text(rng, rng.randint(20, 60))
+        return self._text(rng, rng.randint(2, 5))
+
+    def records(self, collection: str, count: int) -> Iterator[Dict[str, Any]]:
+        """Yield count records for a collection; the same seed yields the same records"""
+        model = COLLECTION_MODELS[collection]
+        rng = random.Random(f"{self.seed}:{collection}")
+        for index in range(count):
+            record = {}
+            for name, field in model.model_fields.items():
+                if name == "id":
+                    record[name] = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+                else:
+                    record[name] = self._value(rng, name, field.annotation, index)
+            yield model(**record).model_dump()
+
+    def batches(self, collection: str, count: int, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Yield records in lists of at most batch_size"""
+        batch = []
+        for record in self.records(collection, count):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def write_ndjson(generator: SyntheticGenerator, collections: List[str], count: int, out_dir: Path) -> Dict[str, Path]:
+    """Write count records per collection to <out_dir>/<collection>.ndjson"""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for collection in collections:
+        path = out_dir / f"{collection}.ndjson"
+        with path.open("w") as f:
+            for record in generator.records(collection, count):
+                f.write(json.dumps(record, default=_json_default) + "\n")
+        logger.info(f"Wrote {count} {collection} records to {path}")
+        paths[collection] = path
+    return paths
+
+
+async def write_mongo(generator: SyntheticGenerator, collections: List[str], count: int, batch_size: int):
+    """Upsert count records per collection into the configured storage backend in batches"""
+    from storage import create_database
+
+    db = create_database()
+    try:
+        for collection in collections:
+            start = time.perf_counter()
+            for batch in generator.batches(collection, count, batch_size):
+                await db.bulk_upsert(collection, batch, chunk_size=batch_size)
+            logger.info(
+                f"Upserted {count} {collection} records in "
+                f"{(time.perf_counter() - start) * 1000:.1f} ms"
+            )
+    finally:
+        await db.close()
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Generate synthetic portfolio data")
+    parser.add_argument("--count", type=int, default=1000, help="Records per collection")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument(
+        "--collections",
+        default=",".join(COLLECTION_MODELS),
+        help="Comma-separated collections to generate"
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="Records per MongoDB batch")
+    parser.add_argument("--out-dir", type=Path, help="Write NDJSON files here instead of MongoDB")
+    args = parser.parse_args(argv)
+
+    args.collections = [name.strip() for name in args.collections.split(",") if name.strip()]
+    unknown = [name for name in args.collections if name not in COLLECTION_MODELS]
+    if unknown:
+        parser.error(f"Unknown collections: {', '.join(unknown)}")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    generator = SyntheticGenerator(args.seed)
+    if args.out_dir:
+        write_ndjson(generator, args.collections, args.count, args.out_dir)
+    else:
+        asyncio.run(write_mongo(generator, args.collections, args.count, args.batch_size))
@@ -0,0 +1,142 @@
+"""
+Warm start: connect to storage, prepare it and precompute the public responses before reporting ready
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from starlette.types import ASGIApp, Message
+
+logger = logging.getLogger(__name__)
+
+# Connections opened concurrently so the first requests do not pay for the handshakes
+WARMUP_CONNECTIONS = int(os.environ.get('WARMUP_CONNECTIONS', '4'))
+# Give up on a single warm-up request after this many seconds
+WARMUP_REQUEST_TIMEOUT = float(os.environ.get('WARMUP_REQUEST_TIMEOUT', '10'))
+
+# Public read routes, requested once per encoding to fill the read cache,
+# the encoded bodies and the compressed-response cache
+WARMUP_PATHS = [
+    "/api/portfolio",
+    "/api/profile",
+    "/api/education",
+    "/api/experience",
+    "/api/projects",
+    "/api/projects/facets",
+    "/api/skills",
+    "/api/certifications",
+    "/api/awards",
+    "/api/patents",
+]
+# What browsers typically send, gzip-only clients and uncompressed clients
+WARMUP_ENCODINGS = ["gzip, deflate, br", "gzip", "identity"]
+
+# Delay between storage pings and setup attempts while it is unreachable, doubled up to the maximum
+RETRY_DELAY = 0.5
+MAX_RETRY_DELAY = 10.0
+
+
+async def connect(db, connections: int = WARMUP_CONNECTIONS) -> float:
+    """Ping storage until it answers, then open a few pooled connections at once.
+
+    Returns the latency of the first successful ping in seconds.
+    """
+    delay = RETRY_DELAY
+    while True:
+        try:
+            latency = await db.ping()
+            break
+        except Exception as e:
+            logger.warning(f"Storage ping failed, retrying in {delay}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RETRY_DELAY)
+    # Concurrent pings each need their own connection
+    await asyncio.gather(*(db.ping() for _ in range(max(connections - 1, 0))), return_exceptions=True)
+    return latency
+
+
+async def _get(app: ASGIApp, path: str, accept_encoding: str) -> int:
+    """Send a GET through the full middleware stack and discard the body"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"warmup"),
+            (b"accept-encoding", accept_encoding.encode()),
+            (b"x-request-id", b"warmup"),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("warmup", 80),
+    }
+    status = 0
+    request_sent = False
+
+    async def receive() -> Message:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # The client never disconnects
+        await asyncio.Event().wait()
+
+    async def send(message: Message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await asyncio.wait_for(app(scope, receive, send), WARMUP_REQUEST_TIMEOUT)
+    return status
+
+
+async def warm_up(
+    app: ASGIApp,
+    db,
+    prepare: Optional[Callable[[], Awaitable[None]]] = None,
+    paths: List[str] = WARMUP_PATHS
+) -> Dict[str, Any]:
+    """Connect, run prepare, then request every public read route in every warm-up encoding.
+
+    prepare holds the setup that needs storage (indexes, in-memory indexes);
+    it is retried from a fresh connect until it succeeds, so it must be
+    safe to run more than once.
+
+    Going through the app rather than calling the loaders directly fills
+    exactly the entries real requests look up: cached reads, encoded bodies
+    and compressed bodies keyed by the same ETags, and it imports and runs
+    every lazily loaded code path once.
+    """
+    start = time.perf_counter()
+    delay = RETRY_DELAY
+    while True:
+        latency = await connect(db)
+        if prepare is None:
+            break
+        try:
+            await prepare()
+            break
+        except Exception as e:
+            logger.warning(f"Storage setup failed, retrying in {delay}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RETRY_DELAY)
+    report: Dict[str, Any] = {"ping_ms": round(latency * 1000, 3), "routes": {}}
+    report["prepare_seconds"] = round(time.perf_counter() - start, 3)
+    for path in paths:
+        statuses = []
+        for encoding in WARMUP_ENCODINGS:
+            try:
+                statuses.append(await _get(app, path, encoding))
+            except Exception as e:
+                logger.warning(f"Warm-up request for {path} failed: {e}")
+                statuses.append(0)
+        report["routes"][path] = statuses
+    report["seconds"] = round(time.perf_counter() - start, 3)
+    return report
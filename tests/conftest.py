@@ -0,0 +1,72 @@
+"""
+Shared fixtures: the API runs against the in-memory storage backend
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+backend_dir = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(backend_dir))
+
+os.environ["STORAGE_BACKEND"] = "memory"
+os.environ.pop("MEMORY_SNAPSHOT_PATH", None)
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx
+
+from memory_database import MemoryDatabase
+
+
+def project(title="Search engine", technologies=("Python",), category="web", **fields):
+    """Valid project create payload"""
+    return {
+        "title": title,
+        "duration": "2024",
+        "technologies": list(technologies),
+        "description": f"{title} description",
+        "achievements": [],
+        "category": category,
+        **fields,
+    }
+
+
+def contact(message="Hello, I would like to talk about a project", **fields):
+    """Valid contact form payload"""
+    return {
+        "name": "Ada",
+        "email": "ada@example.com",
+        "subject": "Hello there",
+        "message": message,
+        **fields,
+    }
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def db():
+    return MemoryDatabase()
+
+
+@pytest.fixture
+async def app():
+    """The API with a fresh in-memory backend, started and warmed up"""
+    from server import app
+
+    async with app.router.lifespan_context(app):
+        while not app.state.ready:
+            await asyncio.sleep(0.01)
+        yield app
+
+
+@pytest.fixture
+async def client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
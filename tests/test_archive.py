@@ -0,0 +1,75 @@
+"""
+Archive export and import through staging collections
+"""
+import gzip
+from datetime import datetime
+
+import pytest
+
+import archive
+import database
+
+from tests.conftest import project
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    """Every Database the archive opens shares one mock server"""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    client = mongomock_motor.AsyncMongoMockClient()
+    monkeypatch.setenv("MONGO_URL", "mongodb://localhost:27017")
+    monkeypatch.setattr(database, "AsyncIOMotorClient", lambda *args, **kwargs: client)
+    monkeypatch.setattr(database, "TRACK_SHARED_REVISIONS", False)
+    return client[database.Database().db_name]
+
+
+async def seed(mongo):
+    await mongo.projects.insert_many([
+        {**project(f"P{i}"), "id": f"p{i}", "created_at": datetime(2024, 1, 1 + i)} for i in range(3)
+    ])
+    await mongo.contacts.insert_one({"id": "c1", "message": "Hi", "created_at": datetime(2024, 2, 1)})
+
+
+async def documents(mongo, collection):
+    return await mongo[collection].find({}, {"_id": 0}).sort("id").to_list(None)
+
+
+async def test_round_trip_restores_every_collection(mongo, tmp_path):
+    await seed(mongo)
+    path = tmp_path / "portfolio.ndjson.gz"
+    counts = await archive.export_archive(path)
+    assert counts["projects"] == 3 and counts["contacts"] == 1
+    before = {name: await documents(mongo, name) for name in counts}
+
+    await mongo.projects.delete_many({})
+    await mongo.projects.insert_one({"id": "written-later"})
+    await mongo.contacts.update_one({"id": "c1"}, {"$set": {"message": "Changed"}})
+
+    assert await archive.import_archive(path, chunk_size=2) == counts
+    for name, records in before.items():
+        assert await documents(mongo, name) == records
+    assert (await mongo.projects.find_one({"id": "p0"}))["created_at"] == datetime(2024, 1, 1)
+    assert not [name for name in await mongo.list_collection_names() if name.endswith(database.STAGING_SUFFIX)]
+
+
+async def test_truncated_archives_leave_live_data_untouched(mongo, tmp_path):
+    await seed(mongo)
+    path = tmp_path / "portfolio.ndjson.gz"
+    await archive.export_archive(path)
+    lines = gzip.decompress(path.read_bytes()).splitlines(keepends=True)
+    path.write_bytes(gzip.compress(b"".join(lines[:-1])))
+
+    await mongo.projects.delete_one({"id": "p0"})
+    with pytest.raises(archive.ArchiveError, match="truncated"):
+        await archive.import_archive(path)
+    assert [p["id"] for p in await documents(mongo, "projects")] == ["p1", "p2"]
+    assert not [name for name in await mongo.list_collection_names() if name.endswith(database.STAGING_SUFFIX)]
+
+
+async def test_other_files_are_rejected(mongo, tmp_path):
+    path = tmp_path / "other.ndjson.gz"
+    path.write_bytes(gzip.compress(b'{"format": "something-else"}\n'))
+    with pytest.raises(archive.ArchiveError):
+        await archive.import_archive(path)
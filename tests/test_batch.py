@@ -0,0 +1,59 @@
+"""
+POST /api/batch
+"""
+import pytest
+
+import routes
+
+from tests.conftest import project
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_batch_applies_operations_in_order(client):
+    response = await client.post("/api/batch", json={"operations": [
+        {"op": "create", "collection": "projects", "data": project("Batched")},
+        {"op": "update", "collection": "skills", "data": {"languages": ["Python"]}},
+        {"op": "delete", "collection": "awards", "id": "missing"},
+    ]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"] is False
+    assert body["counts"] == {"created": 1, "updated": 1, "not_found": 1}
+    assert [r["status"] for r in body["results"]] == ["created", "updated", "not_found"]
+
+    created_id = body["results"][0]["id"]
+    projects = (await client.get("/api/projects")).json()
+    assert [p["id"] for p in projects] == [created_id]
+    await routes.search_index.wait_idle()
+    assert routes.search_index.search("batched")[0] == 1
+
+
+async def test_batch_update_and_delete(client):
+    created = await client.post("/api/batch", json={"operations": [
+        {"op": "create", "collection": "awards", "data": {"title": "A", "description": "d", "year": "2024"}},
+        {"op": "create", "collection": "awards", "data": {"title": "B", "description": "d", "year": "2024"}},
+    ]})
+    first, second = (r["id"] for r in created.json()["results"])
+    response = await client.post("/api/batch", json={"operations": [
+        {"op": "update", "collection": "awards", "id": first, "data": {"year": "2025"}},
+        {"op": "delete", "collection": "awards", "id": second},
+    ]})
+    assert response.json()["success"] is True
+    assert [(a["id"], a["year"]) for a in (await client.get("/api/awards")).json()] == [(first, "2025")]
+
+
+async def test_invalid_operations_reject_the_whole_batch(client):
+    response = await client.post("/api/batch", json={"operations": [
+        {"op": "create", "collection": "projects", "data": {"title": "No other fields"}},
+        {"op": "delete", "collection": "skills"},
+        {"op": "create", "collection": "contacts", "data": {}},
+    ]})
+    assert response.status_code == 422
+    errors = response.json()["detail"]["errors"]
+    assert [e["index"] for e in errors] == [0, 1, 2]
+    assert (await client.get("/api/projects")).json() == []
+
+
+async def test_empty_batch_is_rejected(client):
+    assert (await client.post("/api/batch", json={"operations": []})).status_code == 422
@@ -0,0 +1,76 @@
+"""
+Read-through cache and its invalidation on writes
+"""
+import asyncio
+
+import pytest
+
+import routes
+from cache import PortfolioCache
+
+from tests.conftest import project
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_misses_share_one_load():
+    cache = PortfolioCache()
+    loads = 0
+
+    async def loader():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        return b"[1]"
+
+    bodies = await asyncio.gather(*(cache.get_or_load("projects", None, loader) for _ in range(5)))
+    assert bodies == [b"[1]"] * 5
+    assert loads == 1
+    assert await cache.get_or_load("projects", None, loader) == b"[1]"
+    assert loads == 1
+
+
+async def test_load_racing_an_invalidation_is_not_stored():
+    cache = PortfolioCache()
+
+    async def stale():
+        cache.invalidate("projects")
+        return b"stale"
+
+    assert await cache.get_or_load("projects", None, stale) == b"stale"
+
+    async def fresh():
+        return b"fresh"
+
+    assert await cache.get_or_load("projects", None, fresh) == b"fresh"
+
+
+async def test_empty_results_are_not_cached():
+    cache = PortfolioCache()
+    assert await cache.get_or_load("projects", None, lambda: asyncio.sleep(0, None)) is None
+    assert cache.stats()["entries"]["projects"] == 0
+
+
+async def test_cached_json_stores_only_the_encoded_body(app):
+    await routes.get_db().create_project(project())
+    body = await routes.cached_json("projects", None, routes.get_db().get_all_projects)
+    assert isinstance(body, bytes)
+    assert routes.cache.stats()["entries"]["projects"] == 1
+
+
+async def test_writes_invalidate_cached_reads(client):
+    assert (await client.get("/api/projects")).json() == []
+    response = await client.post("/api/projects", json=project("Cached"))
+    assert response.status_code == 200
+    assert [p["title"] for p in (await client.get("/api/projects")).json()] == ["Cached"]
+    sections = (await client.get("/api/portfolio?sections=projects")).json()
+    assert [p["title"] for p in sections["projects"]] == ["Cached"]
+
+
+async def test_contact_writes_keep_the_cached_portfolio(client):
+    await client.get("/api/portfolio")
+    assert routes.cache.stats()["entries"][routes.PORTFOLIO_CACHE] == 1
+    await routes.get_db().create_contact_submission({"name": "A", "email": "a@example.com", "subject": "S", "message": "M"})
+    assert routes.cache.stats()["entries"][routes.PORTFOLIO_CACHE] == 1
+    await routes.get_db().create_award({"title": "A", "description": "d", "year": "2024"})
+    assert routes.cache.stats()["entries"][routes.PORTFOLIO_CACHE] == 0
@@ -0,0 +1,139 @@
+"""
+Cross-worker change sync: change stream events and shared revision polling
+"""
+import asyncio
+
+import pytest
+from pymongo.errors import OperationFailure
+
+import database
+from change_sync import ChangeSync
+
+from tests.conftest import project
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def mongo_client(monkeypatch):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    monkeypatch.setenv("MONGO_URL", "mongodb://localhost:27017")
+    return mongomock_motor.AsyncMongoMockClient()
+
+
+class Stream:
+    """Change stream over scripted events"""
+
+    def __init__(self, events):
+        self.events = events
+        self.resume_token = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def __aiter__(self):
+        for number, event in enumerate(self.events):
+            self.resume_token = {"_data": str(number)}
+            yield event
+
+
+def follow(db, *streams):
+    """Serve each stream in turn, then stop the watcher"""
+    opened = []
+    streams = list(streams)
+
+    def watch_changes(collections, resume_token=None, start_after=False, pre_images=False):
+        opened.append((resume_token, start_after))
+        if not streams:
+            raise asyncio.CancelledError
+        events = streams.pop(0)
+        if isinstance(events, Exception):
+            raise events
+        return Stream(events)
+
+    db.watch_changes = watch_changes
+    return opened
+
+
+def remote_changes(db):
+    applied = []
+    db.add_change_listener(lambda collection, ids: applied.append((collection, ids)))
+    return applied
+
+
+async def watch(sync):
+    with pytest.raises(asyncio.CancelledError):
+        await sync._watch()
+
+
+async def test_events_refresh_only_the_written_records(mongo_client):
+    db = database.Database(mongo_client)
+    sync = ChangeSync(db, mode="change_stream")
+    follow(db, [
+        {"operationType": "insert", "ns": {"coll": "projects"}, "fullDocument": {"id": "p1"}},
+        {"operationType": "delete", "ns": {"coll": "awards"}, "fullDocumentBeforeChange": {"id": "a1"}},
+        {"operationType": "delete", "ns": {"coll": "awards"}},
+        {"operationType": "rename", "ns": {"coll": "projects__import"}, "to": {"coll": "projects"}},
+        {"operationType": "insert", "ns": {"coll": "revisions"}, "fullDocument": {"id": "r"}},
+    ])
+    applied = remote_changes(db)
+    await watch(sync)
+    assert applied == [("projects", ["p1"]), ("awards", ["a1"]), ("awards", None), ("projects", None)]
+    assert sync.stats()["remote_changes"] == 4
+
+
+async def test_own_writes_are_skipped_and_stop_the_revision_bumps(mongo_client):
+    db = database.Database(mongo_client)
+    sync = ChangeSync(db, mode="change_stream")
+    follow(db, [])
+    await watch(sync)
+    assert db.track_own_writes and not db.track_shared_revisions
+
+    await db.create_project(project(id="p1"))
+    applied = remote_changes(db)
+    follow(db, [
+        {"operationType": "insert", "ns": {"coll": "projects"}, "fullDocument": {"id": "p1"}},
+        {"operationType": "update", "ns": {"coll": "projects"}, "fullDocument": {"id": "p1"}},
+    ])
+    await watch(sync)
+    # Only the first event matches the local write; the second came from another worker
+    assert applied == [("projects", ["p1"])]
+    assert await db.db[database.REVISIONS_COLLECTION].find_one({}) is None
+
+
+async def test_invalidate_refreshes_everything_and_restarts_after_it(mongo_client):
+    db = database.Database(mongo_client)
+    sync = ChangeSync(db, mode="change_stream", collections=["projects", "awards"])
+    opened = follow(db, [{"operationType": "invalidate"}])
+    applied = remote_changes(db)
+    await watch(sync)
+    assert applied == [("projects", None), ("awards", None)]
+    assert opened == [(None, False), ({"_data": "0"}, True)]
+
+
+async def test_auto_mode_polls_only_without_change_stream_support(mongo_client):
+    db = database.Database(mongo_client)
+    follow(db, OperationFailure("not a replica set", code=40573))
+    assert await ChangeSync(db, mode="auto")._watch() is None
+
+    sync = ChangeSync(db, mode="auto")
+    opened = follow(db, OperationFailure("not primary", code=10107), [])
+    await watch(sync)
+    assert len(opened) == 3 and sync.stats()["errors"] == 1
+
+
+async def test_polling_applies_writes_of_other_workers(mongo_client):
+    writer = database.Database(mongo_client)
+    reader = database.Database(mongo_client)
+    sync = ChangeSync(reader, mode="poll")
+    await sync._poll_once()
+    applied = remote_changes(reader)
+
+    await writer.create_project(project(id="p1"))
+    await asyncio.gather(*writer._pending_bumps)
+    await sync._poll_once()
+    assert applied == [("projects", None)]
+    assert sync.stats()["remote_changes"] == 1
@@ -0,0 +1,96 @@
+"""
+Accept-Encoding negotiation and compressed responses
+"""
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from compression import CompressionMiddleware, negotiate_encoding
+
+from tests.conftest import project
+
+pytestmark = pytest.mark.anyio
+
+BODY = b'{"items": [' + b",".join(b'"item"' for _ in range(200)) + b"]}"
+
+
+async def large(request):
+    return Response(BODY, media_type="application/json", headers={"ETag": '"v1"'})
+
+
+async def small(request):
+    return Response(b"{}", media_type="application/json")
+
+
+async def stream(request):
+    async def lines():
+        for _ in range(3):
+            yield BODY + b"\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@pytest.fixture
+async def compressed():
+    app = Starlette(routes=[Route("/large", large), Route("/small", small), Route("/stream", stream)])
+    middleware = CompressionMiddleware(app)
+    transport = httpx.ASGITransport(app=middleware)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client, middleware
+
+
+def test_negotiation_honours_quality_values():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("*") in ("br", "gzip")
+    assert negotiate_encoding("") is None
+
+
+async def test_gzip_responses_are_weak_and_vary(compressed):
+    client, middleware = compressed
+    for _ in range(2):
+        response = await client.get("/large", headers={"accept-encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == 'W/"v1"'
+        assert response.content == BODY
+    # The second response reused the compressed bytes of the same ETag
+    assert (middleware.hits, middleware.misses) == (1, 1)
+
+
+async def test_identity_when_not_accepted_or_too_small(compressed):
+    client, _ = compressed
+    response = await client.get("/large", headers={"accept-encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"v1"'
+    response = await client.get("/small", headers={"accept-encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+async def test_streams_are_compressed_incrementally(compressed):
+    client, _ = compressed
+    response = await client.get("/stream", headers={"accept-encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == (BODY + b"\n") * 3
+
+
+async def test_brotli_is_preferred_when_installed(compressed):
+    brotli = pytest.importorskip("brotli")
+    client, _ = compressed
+    async with client.stream("GET", "/large", headers={"accept-encoding": "gzip, br"}) as response:
+        raw = b"".join([chunk async for chunk in response.aiter_raw()])
+    assert response.headers["content-encoding"] == "br"
+    assert brotli.decompress(raw) == BODY
+
+
+async def test_api_responses_are_compressed(client):
+    for i in range(5):
+        await client.post("/api/projects", json=project(f"Project {i}"))
+    response = await client.get("/api/projects", headers={"accept-encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 5
+    etag = response.headers["etag"]
+    assert etag.startswith("W/")
+    response = await client.get("/api/projects", headers={"accept-encoding": "gzip", "if-none-match": etag})
+    assert response.status_code == 304
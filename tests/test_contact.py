@@ -0,0 +1,113 @@
+"""
+Contact form: rate limiting, duplicate rejection and the write-behind buffer
+"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import routes
+from contact_writer import ContactWriter
+from rate_limit import ContactGuard, content_hash
+
+from tests.conftest import contact
+
+pytestmark = pytest.mark.anyio
+
+
+def request_from(ip="10.0.0.1"):
+    return Request({"type": "http", "headers": [], "client": (ip, 1234)})
+
+
+async def test_guard_rate_limits_per_ip_and_email():
+    guard = ContactGuard(burst=2, refill_seconds=3600, store="memory")
+    for _ in range(2):
+        await guard.limit(request_from(), contact())
+    with pytest.raises(HTTPException) as error:
+        await guard.limit(request_from("10.0.0.2"), contact())
+    assert error.value.status_code == 429
+    assert int(error.value.headers["Retry-After"]) > 0
+    assert guard.stats()["rate_limited"] == 1
+
+
+async def test_guard_rejects_duplicates_until_released():
+    guard = ContactGuard(burst=5, refill_seconds=3600, store="memory")
+    keys = await guard.limit(request_from(), contact())
+    digest = content_hash(contact())
+    await guard.record(digest)
+    with pytest.raises(HTTPException) as error:
+        await guard.record(digest)
+    assert error.value.status_code == 409
+
+    await guard.release(keys, digest)
+    await guard.record(digest)
+    assert guard.limiter.take(keys[0]) == 0
+
+
+async def test_guard_shared_store_uses_the_backend(db):
+    guard = ContactGuard(db, burst=1, refill_seconds=3600, store="shared")
+    keys = await guard.limit(request_from(), contact())
+    await guard.record("digest")
+    await guard.release(keys, "digest")
+    await guard.limit(request_from(), contact())
+    await guard.record("digest")
+
+
+async def test_writer_flushes_in_batches(db):
+    writer = ContactWriter(db, batch_size=2, flush_interval=0.01)
+    writer.start()
+    for i in range(3):
+        writer.submit({"id": f"c{i}", "name": "A", "email": "a@example.com", "subject": "S", "message": "M"})
+    await writer.stop()
+    assert writer.stats()["written"] == 3
+    assert len(await db.get_contact_submissions()) == 3
+
+
+async def test_full_writer_queue_rejects(db):
+    writer = ContactWriter(db, max_queue=1)
+    writer.submit({"id": "c1"})
+    with pytest.raises(asyncio.QueueFull):
+        writer.submit({"id": "c2"})
+    assert writer.stats()["rejected"] == 1
+
+
+async def test_submission_is_stored(client):
+    response = await client.post("/api/contact", json=contact())
+    assert response.status_code == 200
+    await routes.contact_writer.stop()
+    assert len(await routes.get_db().get_contact_submissions()) == 1
+
+
+async def test_resubmission_is_a_409(client):
+    assert (await client.post("/api/contact", json=contact())).status_code == 200
+    assert (await client.post("/api/contact", json=contact())).status_code == 409
+    assert (await client.post("/api/contact", json=contact(message="A different message entirely"))).status_code == 200
+
+
+async def test_retry_after_a_full_queue_is_accepted(client, monkeypatch):
+    def full(record):
+        raise asyncio.QueueFull
+
+    monkeypatch.setattr(routes.contact_writer, "submit", full)
+    response = await client.post("/api/contact", json=contact())
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
+
+    monkeypatch.undo()
+    assert (await client.post("/api/contact", json=contact())).status_code == 200
+
+
+async def test_retry_after_a_failed_insert_is_accepted(client, monkeypatch):
+    monkeypatch.setattr(routes, "contact_writer", None)
+    db = routes.get_db()
+    create = db.create_contact_submission
+
+    async def failing(data):
+        return None
+
+    monkeypatch.setattr(db, "create_contact_submission", failing)
+    assert (await client.post("/api/contact", json=contact())).status_code == 500
+
+    monkeypatch.setattr(db, "create_contact_submission", create)
+    assert (await client.post("/api/contact", json=contact())).status_code == 200
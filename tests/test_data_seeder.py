@@ -0,0 +1,24 @@
+"""
+Bulk seeding and how it reports failed writes
+"""
+import pytest
+
+import data_seeder
+from memory_database import MemoryDatabase
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bulk_seeding_reports_each_section():
+    report = await data_seeder.seed_database_bulk()
+    assert report["projects"]["result"]["inserted"] == len(data_seeder.PORTFOLIO_DATA["projects"])
+    assert report["profiles"]["result"] is True
+
+
+async def test_failed_writes_fail_the_seeding(monkeypatch):
+    async def failing(self, collection, records, chunk_size=1000):
+        return {"inserted": 0, "modified": 0, "matched": 0, "failed": len(records)}
+
+    monkeypatch.setattr(MemoryDatabase, "bulk_upsert", failing)
+    with pytest.raises(data_seeder.SeedError, match="projects"):
+        await data_seeder.seed_database_bulk()
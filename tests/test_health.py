@@ -0,0 +1,106 @@
+"""
+Background health probes served at /health
+"""
+import asyncio
+import time
+
+import pytest
+
+import health
+from health import DEGRADED, HEALTHY, UNHEALTHY, HealthMonitor
+from memory_database import MemoryDatabase
+
+pytestmark = pytest.mark.anyio
+
+
+class Writer:
+    def __init__(self, queued=0, failed_flushes=0):
+        self.queued = queued
+        self.failed_flushes = failed_flushes
+
+    def stats(self):
+        return {"queued": self.queued, "in_flight": 0, "capacity": 100, "failed_flushes": self.failed_flushes}
+
+
+def pool(available=10, waiting=0, saturation=0.0, checkout_failures=0):
+    return {
+        "open": 10, "available": available, "waiting": waiting,
+        "saturation": saturation, "checkout_failures": checkout_failures,
+    }
+
+
+async def test_probes_combine_to_the_worst_status():
+    writer = Writer()
+    monitor = HealthMonitor(MemoryDatabase(), writers={"contact_writer": writer})
+    assert monitor.result()["status"] == UNHEALTHY
+
+    result = await monitor.probe()
+    assert result["status"] == HEALTHY
+    assert set(result["checks"]) == {"storage", "pool", "event_loop", "contact_writer"}
+
+    writer.queued = 60
+    assert (await monitor.probe())["checks"]["contact_writer"]["status"] == DEGRADED
+    writer.queued = 95
+    assert (await monitor.probe())["status"] == UNHEALTHY
+    assert monitor.result() is monitor._result
+
+
+async def test_failures_are_reported_as_increases_since_the_last_probe(monkeypatch):
+    db = MemoryDatabase()
+    stats = pool()
+    monkeypatch.setattr(db, "pool_stats", lambda: stats)
+    writer = Writer(failed_flushes=4)
+    monitor = HealthMonitor(db, writers={"contact_writer": writer})
+    assert (await monitor.probe())["status"] == HEALTHY
+
+    writer.failed_flushes = 5
+    stats.update(available=0, waiting=3, checkout_failures=2)
+    result = await monitor.probe()
+    assert result["checks"]["contact_writer"] == {
+        "status": DEGRADED, "depth": 0, "capacity": 100, "failed_flushes": 1,
+    }
+    assert result["checks"]["pool"]["status"] == UNHEALTHY
+    assert result["checks"]["pool"]["checkout_failures"] == 2
+    assert (await monitor.probe())["status"] == HEALTHY
+
+
+async def test_slow_or_failing_storage(monkeypatch):
+    monkeypatch.setattr(health, "HEALTH_PING_TIMEOUT", 0.01)
+    db = MemoryDatabase()
+    monitor = HealthMonitor(db)
+
+    async def hangs():
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(db, "ping", hangs)
+    assert "timed out" in (await monitor._check_storage())["error"]
+
+    async def refuses():
+        raise ConnectionError("refused")
+
+    monkeypatch.setattr(db, "ping", refuses)
+    assert await monitor._check_storage() == {"status": UNHEALTHY, "error": "refused"}
+
+
+async def test_stalled_probes_are_unhealthy():
+    monitor = HealthMonitor(MemoryDatabase(), interval=1)
+    await monitor.probe()
+    monitor._checked_at = time.monotonic() - 5
+    result = monitor.result()
+    assert result["status"] == UNHEALTHY
+    assert "stalled" in result["message"]
+
+
+async def test_unhealthy_results_fail_readiness(app, client, monkeypatch):
+    assert (await client.get("/health")).status_code == 200
+
+    async def refuses():
+        raise ConnectionError("refused")
+
+    monkeypatch.setattr(app.state.db, "ping", refuses)
+    await app.state.health.probe()
+    response = await client.get("/health")
+    assert response.status_code == 503
+    assert response.json()["checks"]["storage"]["error"] == "refused"
+    assert (await client.get("/health/live")).status_code == 200
+    assert 'health_status{check="storage"} 2' in (await client.get("/metrics")).text
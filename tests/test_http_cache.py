@@ -0,0 +1,89 @@
+"""
+ETag and Last-Modified validators on the read routes
+"""
+from datetime import timedelta
+
+import pytest
+
+import routes
+from http_cache import body_etag
+
+from tests.conftest import project
+
+pytestmark = pytest.mark.anyio
+
+IDENTITY = {"accept-encoding": "identity"}
+
+
+def age(db, seconds=5):
+    """Move the backend's start back, as if no write happened in the current second"""
+    db.started_at -= timedelta(seconds=seconds)
+
+
+async def test_etag_is_a_hash_of_the_body(client):
+    age(routes.get_db())
+    response = await client.get("/api/projects", headers=IDENTITY)
+    assert response.headers["etag"] == body_etag(response.content)
+    assert response.headers["cache-control"] == "no-cache"
+    assert "last-modified" in response.headers
+
+
+async def test_etag_is_the_same_for_a_new_backend_with_the_same_data(app, client):
+    await routes.get_db().create_project(project(id="p1"))
+    first = (await client.get("/api/projects", headers=IDENTITY)).headers["etag"]
+
+    # As another worker or a restart would see the same records
+    other = await routes.get_db().get_all_projects()
+    assert body_etag(routes.BODY_ENCODERS["projects"](other)) == first
+
+
+async def test_if_none_match_returns_304(client):
+    etag = (await client.get("/api/projects", headers=IDENTITY)).headers["etag"]
+    response = await client.get("/api/projects", headers={**IDENTITY, "if-none-match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    # Compressed responses carry a weak ETag that still validates
+    response = await client.get("/api/projects", headers={"if-none-match": f"W/{etag}"})
+    assert response.status_code == 304
+
+
+async def test_writes_change_the_etag(client):
+    etag = (await client.get("/api/projects", headers=IDENTITY)).headers["etag"]
+    await client.post("/api/projects", json=project())
+    response = await client.get("/api/projects", headers={**IDENTITY, "if-none-match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+async def test_if_modified_since(client):
+    age(routes.get_db())
+    last_modified = (await client.get("/api/projects")).headers["last-modified"]
+    response = await client.get("/api/projects", headers={"if-modified-since": last_modified})
+    assert response.status_code == 304
+    response = await client.get("/api/projects", headers={"if-modified-since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+    assert response.status_code == 200
+
+
+async def test_no_last_modified_within_the_second_of_a_write(client):
+    age(routes.get_db())
+    last_modified = (await client.get("/api/projects")).headers["last-modified"]
+    await client.post("/api/projects", json=project())
+    response = await client.get("/api/projects", headers={"if-modified-since": last_modified})
+    assert response.status_code == 200
+    assert "last-modified" not in response.headers
+
+
+async def test_if_none_match_is_answered_without_loading(client, monkeypatch):
+    etag = (await client.get("/api/projects", headers=IDENTITY)).headers["etag"]
+    routes.cache.invalidate()
+    monkeypatch.setattr(routes.get_db(), "get_all_projects", None)
+    response = await client.get("/api/projects", headers={**IDENTITY, "if-none-match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+    monkeypatch.undo()
+    await client.post("/api/projects", json=project())
+    response = await client.get("/api/projects", headers={**IDENTITY, "if-none-match": etag})
+    assert response.status_code == 200
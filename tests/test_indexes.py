@@ -0,0 +1,33 @@
+"""
+MongoDB index bootstrap
+"""
+import pytest
+
+from indexes import INDEX_SPECS, ensure_indexes
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def mongo():
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    return mongomock_motor.AsyncMongoMockClient()["portfolio"]
+
+
+async def test_indexes_are_created_once(mongo):
+    report = await ensure_indexes(mongo)
+    expected = sum(len(indexes) for indexes in INDEX_SPECS.values())
+    assert len(report["created"]) == expected and report["failed"] == []
+    assert "projects.category_created_at" in report["created"]
+    assert "id_unique" in await mongo.projects.index_information()
+
+    report = await ensure_indexes(mongo)
+    assert report["created"] == [] and len(report["existing"]) == expected
+
+
+async def test_failed_indexes_are_reported(mongo):
+    # An existing duplicate id keeps the unique index from being built
+    await mongo.awards.insert_many([{"id": "a"}, {"id": "a"}])
+    report = await ensure_indexes(mongo)
+    assert report["failed"] == ["awards.id_unique"]
+    assert "awards.created_at_id" in report["created"]
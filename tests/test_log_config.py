@@ -0,0 +1,97 @@
+"""
+JSON log lines, the logging queue handler and sampled access logs
+"""
+import json
+import logging
+import queue
+import sys
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from log_config import AccessLogMiddleware, JsonFormatter, RequestContextFilter, _PreparingQueueHandler
+from memory_database import MemoryDatabase
+from metrics import instrument_storage
+
+pytestmark = pytest.mark.anyio
+
+db = instrument_storage(MemoryDatabase())
+app = FastAPI()
+
+
+@app.get("/ok")
+async def ok():
+    await db.get_all_awards()
+    await db.get_all_patents()
+    logging.getLogger("app").info("handled")
+    return PlainTextResponse("ok")
+
+
+@app.get("/items/{item_id}")
+async def missing(item_id: str):
+    return PlainTextResponse("missing", status_code=404)
+
+
+@pytest.fixture
+async def client():
+    transport = httpx.ASGITransport(app=AccessLogMiddleware(app, sample_rate=0, slow_ms=10_000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+def access_lines(caplog):
+    return [record for record in caplog.records if record.name == "access"]
+
+
+def test_json_lines_carry_extra_fields_and_tracebacks():
+    logger = logging.getLogger("json-test")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logger.makeRecord("json-test", logging.ERROR, __file__, 1, "failed %s", ("once",), None, extra={"job": 7})
+        record.exc_text = logging.Formatter().formatException(sys.exc_info())
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "failed once"
+    assert entry["level"] == "ERROR" and entry["logger"] == "json-test"
+    assert entry["job"] == 7
+    assert "ValueError: boom" in entry["exc"]
+
+
+def test_queued_records_are_rendered_before_crossing_threads():
+    log_queue = queue.SimpleQueue()
+    handler = _PreparingQueueHandler(log_queue)
+    try:
+        raise KeyError("missing")
+    except KeyError:
+        record = logging.getLogger("queue-test").makeRecord(
+            "queue-test", logging.ERROR, __file__, 1, "value %d", (3,), sys.exc_info()
+        )
+    handler.handle(record)
+    queued = log_queue.get_nowait()
+    assert (queued.msg, queued.args, queued.exc_info) == ("value 3", None, None)
+    assert "KeyError" in queued.exc_text
+
+
+async def test_errors_are_always_logged_with_their_route(client, caplog):
+    caplog.set_level(logging.INFO)
+    response = await client.get("/items/42", headers={"x-request-id": "req-1"})
+    assert response.headers["x-request-id"] == "req-1"
+    [line] = access_lines(caplog)
+    assert (line.status, line.route, line.request_id, line.sampled) == (404, "/items/{item_id}", "req-1", False)
+
+
+async def test_successes_are_sampled_and_count_storage_calls(client, caplog):
+    caplog.set_level(logging.INFO)
+    caplog.handler.addFilter(RequestContextFilter())
+    response = await client.get("/ok")
+    assert access_lines(caplog) == []
+    # Records logged while handling the request carry its id
+    [handled] = [record for record in caplog.records if record.name == "app"]
+    assert handled.request_id == response.headers["x-request-id"]
+
+    client._transport.app.sample_rate = 1
+    await client.get("/ok")
+    [line] = access_lines(caplog)
+    assert line.mongo_calls == 2 and line.sampled is True
@@ -0,0 +1,64 @@
+"""
+Prometheus metrics at /metrics
+"""
+import pytest
+
+from memory_database import MemoryDatabase
+from metrics import (
+    CONTENT_TYPE, STORAGE_ERRORS, STORAGE_LATENCY, Counter, Histogram, instrument_storage
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def test_histograms_render_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(("/a",), value)
+    assert histogram.render() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a",le="1.0"} 2',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a"} 5.55',
+        'latency_seconds_count{route="/a"} 3',
+    ]
+
+
+def test_label_values_are_escaped():
+    counter = Counter("events_total", "Events", ("name",))
+    counter.inc(('a "quoted"\nvalue',))
+    assert counter.render()[-1] == r'events_total{name="a \"quoted\"\nvalue"} 1.0'
+
+
+async def test_requests_are_labelled_by_route_template(client):
+    await client.delete("/api/projects/unknown-id")
+    await client.get("/no/such/path")
+    response = await client.get("/metrics")
+    assert response.headers["content-type"] == CONTENT_TYPE
+    body = response.text
+    assert 'http_requests_total{method="DELETE",route="/api/projects/{project_id}",status="404"}' in body
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"}' in body
+    assert "unknown-id" not in body and "/no/such/path" not in body
+    assert "portfolio_cache_hits_total" in body
+
+
+async def test_storage_calls_are_timed_per_collection():
+    db = instrument_storage(MemoryDatabase())
+    await db.get_all_awards()
+    await db.get_page("patents", 1)
+    with pytest.raises(KeyError):
+        await db.get_records("unknown", ["x"])
+    assert STORAGE_ERRORS._values[("get_records", "unknown")] >= 1
+    body = "\n".join(STORAGE_LATENCY.render())
+    assert 'storage_operation_duration_seconds_count{method="get_all_awards",collection="awards"}' in body
+    assert 'storage_operation_duration_seconds_count{method="get_page",collection="patents"}' in body
+
+
+async def test_pool_usage_is_exported_as_metrics(app, client, monkeypatch):
+    monkeypatch.setattr(app.state.db, "pool_stats", lambda: {"checked_out": 3, "saturation": 0.03})
+    body = (await client.get("/metrics")).text
+    assert "mongo_pool_checked_out 3" in body
+    assert "mongo_pool_saturation 0.03" in body
+    assert (await client.get("/pool-stats")).status_code == 404
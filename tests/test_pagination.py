@@ -0,0 +1,94 @@
+"""
+Keyset cursors, pages and NDJSON streams on the list routes
+"""
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import Response
+from starlette.requests import Request
+
+import memory_database
+import routes
+from pagination import decode_cursor, encode_cursor
+
+pytestmark = pytest.mark.anyio
+
+
+def test_cursor_round_trip():
+    position = (datetime(2024, 5, 1, 12, 30, 15, 250000), "abc")
+    assert decode_cursor(encode_cursor(position)) == position
+
+
+async def test_malformed_cursor_is_a_400(client):
+    response = await client.get("/api/awards?after=not-a-cursor")
+    assert response.status_code == 400
+
+
+async def seed_awards(count):
+    await routes.get_db().bulk_upsert("awards", [
+        {"id": f"a{i:02}", "title": f"Award {i}", "description": "d", "year": "2024",
+         "created_at": datetime(2024, 1, 1 + i)}
+        for i in range(count)
+    ])
+
+
+async def test_pages_follow_the_next_cursor(client):
+    await seed_awards(5)
+    ids, url = [], "/api/awards?limit=2"
+    while url:
+        response = await client.get(url)
+        ids.extend(award["id"] for award in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        url = f"/api/awards?limit=2&after={cursor}" if cursor else None
+    assert ids == ["a04", "a03", "a02", "a01", "a00"]
+
+
+async def test_capped_lists_point_at_the_rest(client, monkeypatch):
+    monkeypatch.setattr(routes, "MAX_LIST_RECORDS", 3)
+    monkeypatch.setattr(memory_database, "MAX_LIST_RECORDS", 3)
+    await seed_awards(3)
+    response = await client.get("/api/awards")
+    assert len(response.json()) == 3 and "x-next-cursor" not in response.headers
+    assert "x-truncated-sections" not in (await client.get("/api/portfolio")).headers
+
+    await seed_awards(5)
+    response = await client.get("/api/awards")
+    assert [award["id"] for award in response.json()] == ["a04", "a03", "a02"]
+    rest = await client.get(f"/api/awards?limit=10&after={response.headers['x-next-cursor']}")
+    assert [award["id"] for award in rest.json()] == ["a01", "a00"]
+    assert (await client.get("/api/portfolio")).headers["x-truncated-sections"] == "awards"
+
+
+async def test_stream_returns_every_record_as_ndjson(client):
+    await seed_awards(3)
+    response = await client.get("/api/awards?stream=true")
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [award["id"] for award in lines] == ["a02", "a01", "a00"]
+
+
+async def test_contact_submissions_are_always_paginated(client):
+    await routes.get_db().create_contact_submissions([
+        {"id": f"c{i}", "name": "A", "email": "a@example.com", "subject": "S", "message": "M"}
+        for i in range(3)
+    ])
+    response = await client.get("/api/contact/submissions?limit=2")
+    assert len(response.json()) == 2
+    assert "x-next-cursor" in response.headers
+
+
+def test_indexed_pages_order_records_without_created_at_last():
+    records = [
+        {"id": "b", "title": "B", "description": "d", "year": "2024", "created_at": datetime(2024, 1, 2)},
+        {"id": "a", "title": "A", "description": "d", "year": "2024", "created_at": datetime(2024, 1, 1)},
+        {"id": "z", "title": "Z", "description": "d", "year": "2024"},
+    ]
+    request = Request({"type": "http", "headers": []})
+    response = Response()
+    page = routes.list_indexed_records(request, response, "awards", records, 2, None, False)
+    assert [award["id"] for award in json.loads(page.body)] == ["b", "a"]
+
+    after = response.headers["x-next-cursor"]
+    page = routes.list_indexed_records(request, Response(), "awards", records, 2, after, False)
+    assert [award["id"] for award in json.loads(page.body)] == ["z"]
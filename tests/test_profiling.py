@@ -0,0 +1,45 @@
+"""
+Client-triggered profiling and the /admin/profiles endpoints
+"""
+import pytest
+
+import profiling
+import server
+from profiling import ProfileBuffer, ProfilerMiddleware
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def token(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", "secret")
+    monkeypatch.setattr(server, "PROFILE_TOKEN", "secret")
+    return "secret"
+
+
+async def test_profiling_is_disabled_without_a_token(client):
+    response = await client.get("/api/projects", headers={"x-profile": "anything"})
+    assert "x-profile-id" not in response.headers
+    assert (await client.get("/admin/profiles", headers={"x-profile": "anything"})).status_code == 404
+
+
+async def test_only_the_token_triggers_profiling(client, token):
+    response = await client.get("/api/projects", headers={"x-profile": "wrong"})
+    assert "x-profile-id" not in response.headers
+
+    response = await client.get("/api/projects", headers={"x-profile": token})
+    profile_id = response.headers["x-profile-id"]
+    profile = await client.get(f"/admin/profiles/{profile_id}", headers={"x-profile": token})
+    assert profile.json()["path"] == "/api/projects"
+
+
+async def test_admin_endpoints_check_the_token(client, token):
+    assert (await client.get("/admin/profiles")).status_code == 403
+    assert (await client.get("/admin/profiles", headers={"x-profile": "wrong"})).status_code == 403
+    assert (await client.get("/admin/profiles", headers={"x-profile": token})).status_code == 200
+
+
+def test_sampling_needs_a_token(monkeypatch):
+    assert ProfilerMiddleware(None, ProfileBuffer(), sample_rate=0.5).sample_rate == 0
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", "secret")
+    assert ProfilerMiddleware(None, ProfileBuffer(), sample_rate=0.5).sample_rate == 0.5
@@ -0,0 +1,92 @@
+"""
+In-memory search index and project facets, and how they follow writes
+"""
+from datetime import datetime
+
+import pytest
+
+import routes
+from facets import ProjectFacets
+from search import SearchIndex
+
+from tests.conftest import project
+
+pytestmark = pytest.mark.anyio
+
+
+async def build(db):
+    search, facets = SearchIndex(), ProjectFacets()
+    await search.build(db)
+    await facets.build(db)
+    return search, facets
+
+
+async def test_search_ranks_exact_and_prefix_matches(db):
+    await db.create_project(project("Graph database", id="p1", technologies=["Rust"]))
+    await db.create_project(project("Weather app", id="p2", description="graphs of rain"))
+    search, _ = await build(db)
+
+    total, results = search.search("graph")
+    assert total == 2
+    assert [r["id"] for r in results] == ["p1", "p2"]
+    assert search.search("graph rust")[1][0]["id"] == "p1"
+    assert search.search("graph", collections=["experience"]) == (0, [])
+
+
+async def test_indexes_follow_writes_by_id(db, monkeypatch):
+    search, facets = await build(db)
+    # Writes that name their records never re-read the whole collection
+    monkeypatch.setattr(db, "iter_records", None)
+
+    await db.create_project(project("Compiler", id="p1", technologies=["OCaml"], category="tools"))
+    await search.wait_idle()
+    await facets.wait_idle()
+    assert search.search("compiler")[0] == 1
+    assert facets.counts()["categories"] == [{"value": "tools", "count": 1}]
+
+    await db.update_project("p1", {"title": "Interpreter", "description": "Bytecode"})
+    await search.wait_idle()
+    assert search.search("compiler")[0] == 0
+    assert search.search("interpreter")[0] == 1
+
+    await db.delete_project("p1")
+    await search.wait_idle()
+    await facets.wait_idle()
+    assert len(search) == 0
+    assert len(facets) == 0
+
+
+async def test_remote_changes_resync_the_collection(db):
+    search, _ = await build(db)
+    # Written by another worker: stored without a local notification
+    db._collections["projects"].insert({**project("Hidden", id="p1"), "created_at": datetime.utcnow()})
+    assert search.search("hidden")[0] == 0
+    db.apply_remote_change("projects")
+    await search.wait_idle()
+    assert search.search("hidden")[0] == 1
+
+
+async def test_facets_count_and_filter(db):
+    await db.create_project(project("A", id="a", technologies=["Python", "React"], category="web"))
+    await db.create_project(project("B", id="b", technologies=["python"], category="ml"))
+    _, facets = await build(db)
+
+    technologies = {f["value"].lower(): f["count"] for f in facets.counts()["technologies"]}
+    assert technologies == {"python": 2, "react": 1}
+    assert [p["id"] for p in facets.filter(["PYTHON"])] == ["b", "a"]
+    assert [p["id"] for p in facets.filter(["python"], "web")] == ["a"]
+
+
+async def test_search_and_facet_routes(client):
+    await client.post("/api/projects", json=project("Route search", technologies=["Go"]))
+    await routes.search_index.wait_idle()
+
+    results = (await client.get("/api/search", params={"q": "route"})).json()
+    assert results["total"] == 1
+    assert results["results"][0]["title"] == "Route search"
+    assert (await client.get("/api/search", params={"q": "route", "types": "nope"})).status_code == 400
+
+    filtered = (await client.get("/api/projects", params={"technology": "go"})).json()
+    assert [p["title"] for p in filtered] == ["Route search"]
+    facets = (await client.get("/api/projects/facets")).json()
+    assert facets["categories"] == [{"value": "web", "count": 1}]
@@ -0,0 +1,45 @@
+"""
+Prerendered static export of the read API
+"""
+import gzip
+import json
+
+import pytest
+
+import routes
+from http_cache import body_etag
+from static_export import MANIFEST_NAME, export_files, render_routes
+
+from tests.conftest import project
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_export_matches_the_api(app, client, tmp_path):
+    await routes.get_db().create_project(project("Exported"))
+    report = export_files(tmp_path, await render_routes())
+    assert "api/projects.json" in report["written"]
+    # No profile was seeded, so the route is a 404 and has no file
+    assert not (tmp_path / "api/profile.json").exists()
+
+    response = await client.get("/api/projects", headers={"accept-encoding": "identity"})
+    path = tmp_path / "api/projects.json"
+    assert path.read_bytes() == response.content
+    assert gzip.decompress((tmp_path / "api/projects.json.gz").read_bytes()) == response.content
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert manifest["files"]["api/projects.json"]["etag"] == response.headers["etag"]
+
+
+def test_reruns_rewrite_only_changed_routes(tmp_path):
+    bodies = {"api/awards.json": b"[]", "api/patents.json": b"[1]"}
+    export_files(tmp_path, bodies)
+    report = export_files(tmp_path, {**bodies, "api/awards.json": b"[2]"})
+    assert report["written"] == ["api/awards.json"]
+    assert report["unchanged"] == ["api/patents.json"]
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert manifest["files"]["api/awards.json"]["etag"] == body_etag(b"[2]")
+
+    report = export_files(tmp_path, {**bodies, "api/patents.json": None})
+    assert "api/patents.json" in report["removed"]
+    assert not (tmp_path / "api/patents.json").exists()
+    assert not (tmp_path / "api/patents.json.gz").exists()
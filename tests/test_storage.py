@@ -0,0 +1,161 @@
+"""
+Storage backend behaviour the routes rely on, checked on MemoryDatabase and,
+when mongomock-motor is installed, on the MongoDB Database for parity
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+import database
+import memory_database
+from memory_database import MemoryDatabase
+
+from tests.conftest import project
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(params=["memory", "mongo"])
+def storage(request, monkeypatch):
+    if request.param == "memory":
+        return MemoryDatabase()
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    monkeypatch.setenv("MONGO_URL", "mongodb://localhost:27017")
+    monkeypatch.setattr(database, "AsyncIOMotorClient", mongomock_motor.AsyncMongoMockClient)
+    monkeypatch.setattr(database, "TRACK_SHARED_REVISIONS", False)
+    return database.Database()
+
+
+def notifications(db):
+    seen = []
+    db.add_change_listener(lambda collection, ids: seen.append((collection, ids)))
+    return seen
+
+
+async def test_create_update_delete(storage):
+    seen = notifications(storage)
+    await storage.create_project(project("First", id="p1"))
+    assert await storage.update_project("p1", {"title": "Renamed"})
+    assert [p["title"] for p in await storage.get_all_projects()] == ["Renamed"]
+    assert await storage.delete_project("p1")
+    assert await storage.get_all_projects() == []
+    assert seen == [("projects", ["p1"])] * 3
+
+
+async def test_writes_that_change_nothing_do_not_notify(storage):
+    await storage.create_project(project("First", id="p1"))
+    seen = notifications(storage)
+    assert not await storage.update_project("missing", {"title": "Renamed"})
+    assert not await storage.update_project("p1", {"title": "First"})
+    assert not await storage.delete_project("missing")
+    assert seen == []
+
+
+async def test_lists_are_newest_first_and_filter_by_category(storage):
+    for i, category in enumerate(["web", "ml", "web"]):
+        await storage.create_project(project(f"P{i}", id=f"p{i}", category=category))
+    assert [p["id"] for p in await storage.get_all_projects()] == ["p2", "p1", "p0"]
+    assert [p["id"] for p in await storage.get_all_projects("web")] == ["p2", "p0"]
+
+
+async def test_category_reads_walk_only_the_category(db):
+    for i, category in enumerate(["web", "ml", "web", "ml", "web"]):
+        await db.create_project(project(f"P{i}", id=f"p{i}", category=category))
+    await db.update_project("p4", {"category": "ml"})
+    await db.delete_project("p2")
+    projects = db._collections["projects"]
+    assert [key[1] for key in projects.indexes["category"]["web"]] == ["p0"]
+    assert [key[1] for key in projects.indexes["category"]["ml"]] == ["p1", "p3", "p4"]
+
+    page, after = await db.get_page("projects", 2, None, {"category": "ml"})
+    assert [p["id"] for p in page] == ["p4", "p3"]
+    page, after = await db.get_page("projects", 2, after, {"category": "ml"})
+    assert [p["id"] for p in page] == ["p1"] and after is None
+
+
+async def test_lists_are_capped(storage, monkeypatch):
+    monkeypatch.setattr(database, "MAX_LIST_RECORDS", 2)
+    monkeypatch.setattr(memory_database, "MAX_LIST_RECORDS", 2)
+    for i in range(4):
+        await storage.create_award({"id": f"a{i}", "title": f"A{i}", "description": "d", "year": "2024"})
+    # One past the cap, so callers can tell the list was cut
+    assert [a["id"] for a in await storage.get_all_awards()] == ["a3", "a2", "a1"]
+
+
+async def test_keyset_pages_cover_every_record_once(storage):
+    created_at = datetime(2024, 1, 1)
+    # Equal timestamps are ordered by id
+    await storage.bulk_upsert("patents", [
+        {"id": f"x{i}", "title": f"T{i}", "created_at": created_at + timedelta(days=i // 2)}
+        for i in range(5)
+    ])
+    ids, after = [], None
+    while True:
+        page, after = await storage.get_page("patents", 2, after)
+        ids.extend(record["id"] for record in page)
+        if after is None:
+            break
+    assert ids == ["x4", "x3", "x2", "x1", "x0"]
+    assert [r["id"] async for r in storage.iter_records("patents")] == ids
+
+
+async def test_bulk_upsert_keeps_created_at(storage):
+    first = datetime(2024, 1, 1)
+    await storage.bulk_upsert("awards", [{"id": "a", "title": "Old", "created_at": first}])
+    counts = await storage.bulk_upsert("awards", [{"id": "a", "title": "New"}, {"id": "b", "title": "B"}])
+    assert counts["inserted"] == 1 and counts["modified"] == 1
+    records = {r["id"]: r async for r in storage.iter_records("awards")}
+    assert records["a"]["title"] == "New"
+    assert records["a"]["created_at"].replace(microsecond=0) == first
+
+
+async def test_bulk_upsert_counts_failed_records(storage):
+    counts = await storage.bulk_upsert("awards", [{"id": "a", "title": "A"}])
+    assert counts["failed"] == 0
+    if isinstance(storage, database.Database):
+        await storage.db.awards.create_index("title", unique=True)
+        counts = await storage.bulk_upsert("awards", [{"id": "b", "title": "A"}, {"id": "c", "title": "C"}])
+        assert counts["inserted"] == 1 and counts["failed"] == 1
+
+
+async def test_get_records_skips_missing_ids(storage):
+    await storage.create_project(project(id="p1"))
+    records = await storage.get_records("projects", ["p1", "missing"])
+    assert [r["id"] for r in records] == ["p1"]
+
+
+async def test_apply_batch_reports_each_operation(storage):
+    seen = notifications(storage)
+    await storage.create_project(project(id="p1"))
+    seen.clear()
+    results = await storage.apply_batch([
+        {"op": "create", "collection": "projects", "id": None, "data": project("New", id="p2")},
+        {"op": "update", "collection": "projects", "id": "p1", "data": {"title": "Updated"}},
+        {"op": "delete", "collection": "projects", "id": "missing", "data": None},
+        {"op": "update", "collection": "skills", "id": None, "data": {"languages": ["Python"]}},
+    ])
+    assert [r["status"] for r in results] == ["created", "updated", "not_found", "updated"]
+    assert sorted(seen, key=str) == [("projects", ["p2", "p1"]), ("skills", None)]
+    assert (await storage.get_skills())["languages"] == ["Python"]
+
+
+async def test_contact_submissions_batch(storage):
+    inserted = await storage.create_contact_submissions([
+        {"id": "c1", "name": "A", "email": "a@example.com", "subject": "S", "message": "M"},
+        {"id": "c2", "name": "B", "email": "b@example.com", "subject": "S", "message": "M"},
+    ])
+    assert inserted == 2
+    assert {c["id"] for c in await storage.get_contact_submissions()} == {"c1", "c2"}
+    assert all(c["read"] is False for c in await storage.get_contact_submissions())
+
+
+async def test_content_hashes_and_rate_limits(db):
+    assert await db.register_content_hash("h", 60)
+    assert not await db.register_content_hash("h", 60)
+    await db.release_content_hash("h")
+    assert await db.register_content_hash("h", 60)
+
+    assert await db.take_rate_limit_token("k", 0.001, 1) == 0
+    assert await db.take_rate_limit_token("k", 0.001, 1) > 0
+    await db.refund_rate_limit_token("k", 1)
+    assert await db.take_rate_limit_token("k", 0.001, 1) == 0
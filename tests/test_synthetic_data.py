@@ -0,0 +1,33 @@
+"""
+Deterministic synthetic data for load tests
+"""
+import json
+
+import pytest
+
+from synthetic_data import COLLECTION_MODELS, SyntheticGenerator, write_ndjson
+
+
+@pytest.mark.parametrize("collection", list(COLLECTION_MODELS))
+def test_records_are_valid_and_reproducible(collection):
+    first = list(SyntheticGenerator(seed=7).records(collection, 5))
+    assert first == list(SyntheticGenerator(seed=7).records(collection, 5))
+    assert first != list(SyntheticGenerator(seed=8).records(collection, 5))
+    for record in first:
+        COLLECTION_MODELS[collection](**record)
+    assert len({record["id"] for record in first}) == 5
+
+
+def test_batches_split_the_same_records():
+    generator = SyntheticGenerator()
+    batches = list(generator.batches("projects", 5, 2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [r for batch in batches for r in batch] == list(generator.records("projects", 5))
+
+
+def test_ndjson_files_hold_one_record_per_line(tmp_path):
+    paths = write_ndjson(SyntheticGenerator(), ["awards"], 3, tmp_path)
+    lines = paths["awards"].read_text().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [
+        r["id"] for r in SyntheticGenerator().records("awards", 3)
+    ]
@@ -0,0 +1,62 @@
+"""
+Warm start, readiness gating and liveness
+"""
+import asyncio
+
+import httpx
+import pytest
+
+import routes
+import warmup
+from memory_database import MemoryDatabase
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(warmup, "RETRY_DELAY", 0.01)
+
+
+async def test_health_reports_starting_until_storage_answers(monkeypatch):
+    from server import app
+
+    storage_up = asyncio.Event()
+    ping = MemoryDatabase.ping
+
+    async def unreachable(self):
+        if not storage_up.is_set():
+            raise ConnectionError("storage is down")
+        return await ping(self)
+
+    monkeypatch.setattr(MemoryDatabase, "ping", unreachable)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/health")
+            assert response.status_code == 503
+            assert response.json()["status"] == "starting"
+            assert (await client.get("/health/live")).json() == {"status": "alive"}
+
+            storage_up.set()
+            await asyncio.wait_for(app.state.warmup_task, 5)
+            response = await client.get("/health")
+            assert response.status_code == 200
+            assert response.json()["status"] != "starting"
+            assert app.state.warmup["routes"]["/api/projects"] == [200, 200, 200]
+
+
+async def test_failed_setup_is_retried_before_warming_the_caches(app):
+    attempts = 0
+
+    async def prepare():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("indexes not ready")
+
+    routes.cache.invalidate()
+    report = await warmup.warm_up(app, app.state.db, prepare, paths=["/api/awards", "/api/profile"])
+    assert attempts == 2
+    assert report["routes"] == {"/api/awards": [200, 200, 200], "/api/profile": [404, 404, 404]}
+    assert routes.cache.stats()["misses"] > 0